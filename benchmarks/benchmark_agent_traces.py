@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Benchmark collecting documents from Bedrock Agent trace streams
+
+Compares the original str(trace) scan in nda_api_handler with the structured
+AgentTraceProcessor on recorded invoke_agent streams, timing the stream
+processing and counting what each would log. Fixtures are JSON files in
+benchmarks/fixtures/agent_traces with the requested document types and the
+stream events (chunk bytes stored as text).
+
+Usage:
+    python3 benchmarks/benchmark_agent_traces.py
+    python3 benchmarks/benchmark_agent_traces.py recorded-stream.json --iterations 500
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda'))
+
+from agent_traces import AgentTraceProcessor
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'agent_traces')
+
+
+def load_stream(path: str) -> tuple:
+    """(document types, stream events) from a fixture, with chunk text turned back into bytes"""
+    with open(path) as f:
+        fixture = json.load(f)
+
+    events = fixture['events']
+    for event in events:
+        if 'chunk' in event:
+            event['chunk']['bytes'] = event['chunk']['bytes'].encode('utf-8')
+
+    return fixture['document_types'], events
+
+
+def legacy_collect(events: list, expected_doc_count: int) -> list:
+    """The original per-event scan: str(trace) on every trace, keys logged at each level"""
+    documents = []
+
+    for event in events:
+        print(f"Event keys: {event.keys()}")
+
+        if 'chunk' in event:
+            chunk = event['chunk']
+            if 'bytes' in chunk:
+                chunk_text = chunk['bytes'].decode('utf-8')
+                print(f"Chunk text: {chunk_text[:200]}")
+
+        elif 'trace' in event:
+            trace = event['trace']
+            print(f"Trace keys: {trace.keys()}")
+
+            trace_str = str(trace)
+            if 'download_url' in trace_str:
+                print("Found download_url in trace")
+                if 'trace' in trace:
+                    print(f"Inner trace keys: {trace['trace'].keys()}")
+                    if 'orchestrationTrace' in trace.get('trace', {}):
+                        orch = trace['trace']['orchestrationTrace']
+                        print(f"Orchestration trace keys: {orch.keys()}")
+                        if 'observation' in orch:
+                            obs = orch['observation']
+                            print(f"Observation keys: {obs.keys()}")
+                            if 'actionGroupInvocationOutput' in obs:
+                                output = obs['actionGroupInvocationOutput']
+                                print(f"Action output keys: {output.keys()}")
+                                if 'text' in output:
+                                    print(f"Action output text: {output['text'][:500]}")
+                                    try:
+                                        doc_data = json.loads(output['text'])
+                                        if doc_data.get('success'):
+                                            s3_key = doc_data.get('s3_key', '')
+                                            doc_type = 'nda' if 'nda' in s3_key.lower() else 'msa'
+                                            documents.append({
+                                                'type': doc_type,
+                                                'download_url': doc_data.get('download_url'),
+                                                's3_key': s3_key
+                                            })
+                                            if expected_doc_count and len(documents) >= expected_doc_count:
+                                                return documents
+                                    except Exception as e:
+                                        print(f"Failed to parse document data: {e}")
+
+    return documents
+
+
+def structured_collect(events: list, expected_doc_count: int) -> list:
+    """The AgentTraceProcessor loop used by nda_api_handler.invoke_agent"""
+    traces = AgentTraceProcessor(expected_doc_count)
+
+    for event in events:
+        if 'chunk' in event:
+            event['chunk']['bytes'].decode('utf-8')
+        elif 'trace' in event:
+            traces.process(event['trace'])
+            if traces.complete:
+                break
+
+    return traces.documents
+
+
+def time_collector(collect, events: list, expected_doc_count: int, iterations: int) -> tuple:
+    """Run one collector repeatedly; returns (documents, timings in ms, bytes logged per run)"""
+    timings = []
+    documents = None
+    log = io.StringIO()
+
+    for _ in range(iterations):
+        log.seek(0)
+        log.truncate()
+        with contextlib.redirect_stdout(log):
+            start = time.perf_counter()
+            documents = collect(events, expected_doc_count)
+            timings.append((time.perf_counter() - start) * 1000)
+
+    return documents, timings, len(log.getvalue())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark agent trace processing')
+    parser.add_argument('streams', nargs='*', help='Recorded stream fixtures (default: bundled fixtures)')
+    parser.add_argument('--iterations', type=int, default=200, help='Runs per stream per collector (default: 200)')
+
+    args = parser.parse_args()
+
+    paths = args.streams or sorted(glob.glob(os.path.join(FIXTURE_DIR, '*.json')))
+    if not paths:
+        print("❌ No streams to benchmark", file=sys.stderr)
+        sys.exit(1)
+
+    collectors = {'legacy': legacy_collect, 'structured': structured_collect}
+    totals = {name: [] for name in collectors}
+    logged = {name: 0 for name in collectors}
+    incomplete = 0
+
+    for path in paths:
+        document_types, events = load_stream(path)
+        size = sum(len(json.dumps(event, default=str)) for event in events)
+
+        print(f"\n{os.path.basename(path)} ({len(events)} events, {size / 1024:.0f} KB, expecting {document_types})")
+
+        results = {}
+        for name, collect in collectors.items():
+            results[name], timings, log_bytes = time_collector(collect, events, len(document_types), args.iterations)
+            totals[name].extend(timings)
+            logged[name] += log_bytes
+            print(f"  {name:<12} median {statistics.median(timings):7.3f} ms   "
+                  f"logged {log_bytes / 1024:6.1f} KB   documents {[doc['type'] for doc in results[name]]}")
+
+        if len(results['structured']) != len(document_types):
+            incomplete += 1
+            print(f"  ✗ Structured processor found {len(results['structured'])} of {len(document_types)} documents")
+        elif results['structured'] == results['legacy']:
+            print("  ✓ Identical documents")
+        else:
+            print("  ✓ All documents found (legacy scan differs: it only reads single-document results)")
+
+    baseline = statistics.median(totals['legacy'])
+    fast = statistics.median(totals['structured'])
+
+    print(f"\n{'='*60}")
+    print("SUMMARY")
+    print(f"{'='*60}")
+    print(f"Streams: {len(paths)}, {args.iterations} iterations each")
+    print(f"Legacy median: {baseline:.3f} ms ({logged['legacy'] / 1024:.1f} KB logged per pass)")
+    print(f"Structured median: {fast:.3f} ms ({logged['structured'] / 1024:.1f} KB logged per pass)")
+    print(f"Speedup: {baseline / fast:.1f}x")
+    print(f"Documents: {'all streams complete' if not incomplete else f'{incomplete} stream(s) incomplete'}")
+    print(f"{'='*60}\n")
+
+    sys.exit(1 if incomplete else 0)
+
+
+if __name__ == '__main__':
+    main()
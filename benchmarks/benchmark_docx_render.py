@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark DOCX rendering engines on the NDA and MSA templates
+
+Compares latency and peak memory of the python-docx path, the cached render
+plan and the streaming OOXML renderer. Each engine runs in its own process so
+peak RSS (which includes lxml/libxml2 allocations) is measured in isolation.
+
+Usage:
+    python3 benchmarks/benchmark_docx_render.py nda-template.docx msa-template.docx
+    python3 benchmarks/benchmark_docx_render.py --bucket jamie2-knowledge-base-xxxxx
+"""
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda'))
+
+ENGINES = ['python-docx', 'plan', 'stream']
+
+TEMPLATE_KEYS = {
+    'nda': 'templates/Non-Disclosure Agreement Template v01 JC OFFLINE.docx',
+    'msa': 'templates/Master Services Agreement Template v02 JC - OFFLINE.docx',
+}
+
+# Covers the placeholders of both templates
+SAMPLE_REPLACEMENTS = {
+    '[Date]': '06 November 2025',
+    '[Recipient Name]': 'Example Scotland Ltd',
+    '[Recipient]': 'Example Scotland Ltd',
+    '[Client Name]': 'Example Scotland Ltd',
+    '[Client]': 'Example Scotland Ltd',
+    '[Company Type]': 'Private Limited Company',
+    '[Jurisdiction]': 'Scotland',
+    '[Company Number]': 'SC123456',
+    '[Registered Address]': '123 High Street, Edinburgh, EH1 1AA',
+    '[Name]': 'Patrick Godden',
+    '[Title]': 'Director',
+}
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_worker(engine: str, template_path: str, iterations: int) -> dict:
+    """Render one template repeatedly with one engine and report timings"""
+    import contextlib
+    import io
+
+    import docx_template
+    from docx_stream import render_stream
+
+    renderers = {
+        'python-docx': docx_template.render_with_python_docx,
+        'plan': lambda content, replacements: docx_template.get_render_plan(
+            content, replacements.keys()).render(content, replacements),
+        'stream': render_stream,
+    }
+    render = renderers[engine]
+
+    with open(template_path, 'rb') as f:
+        template_content = f.read()
+
+    baseline_mb = peak_rss_mb()
+    timings = []
+
+    # Renderers log each replacement; keep benchmark output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(iterations):
+            start = time.perf_counter()
+            render(template_content, SAMPLE_REPLACEMENTS)
+            timings.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'engine': engine,
+        'first_ms': timings[0],
+        'median_ms': statistics.median(timings),
+        'p95_ms': sorted(timings)[int(0.95 * (len(timings) - 1))],
+        'peak_rss_mb': peak_rss_mb(),
+        'render_rss_mb': peak_rss_mb() - baseline_mb,
+    }
+
+
+def benchmark_template(label: str, template_path: str, iterations: int) -> None:
+    """Run every engine against one template in separate processes and print a table"""
+    size_kb = os.path.getsize(template_path) / 1024
+    print(f"\n{label}: {template_path} ({size_kb:.0f} KB, {iterations} iterations)")
+    print(f"{'engine':<12} {'first ms':>10} {'median ms':>10} {'p95 ms':>10} {'peak MB':>10} {'render MB':>10}")
+
+    for engine in ENGINES:
+        output = subprocess.run(
+            [sys.executable, __file__, '--worker', engine, template_path, '--iterations', str(iterations)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{engine:<12} {result['first_ms']:>10.1f} {result['median_ms']:>10.1f} {result['p95_ms']:>10.1f} "
+              f"{result['peak_rss_mb']:>10.1f} {result['render_rss_mb']:>10.1f}")
+
+
+def download_templates(bucket: str, directory: str) -> list:
+    """Fetch the NDA and MSA templates from the knowledge base bucket"""
+    import boto3
+
+    s3 = boto3.client('s3')
+    paths = []
+    for label, key in TEMPLATE_KEYS.items():
+        path = os.path.join(directory, f'{label}.docx')
+        s3.download_file(bucket, key, path)
+        paths.append((label.upper(), path))
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark DOCX rendering engines')
+    parser.add_argument('templates', nargs='*', help='Local template .docx files')
+    parser.add_argument('--bucket', help='Download the NDA and MSA templates from this S3 bucket')
+    parser.add_argument('--iterations', type=int, default=20, help='Renders per engine (default: 20)')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.templates[0], args.iterations)))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        if args.bucket:
+            templates = download_templates(args.bucket, directory)
+        elif args.templates:
+            templates = [(os.path.basename(path), path) for path in args.templates]
+        else:
+            parser.print_help()
+            sys.exit(1)
+
+        for label, path in templates:
+            benchmark_template(label, path, args.iterations)
+
+
+if __name__ == '__main__':
+    main()
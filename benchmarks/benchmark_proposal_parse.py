@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark proposal Markdown parsing on a large synthetic proposal
+
+Compares the original parse_proposal (whole text split up front, two scans
+of the slide's content for every table row) with the line-at-a-time
+ProposalParser, checking both produce the same slides. The synthetic
+proposal has hundreds of slides mixing bullets, subheadings and tables,
+including a few long tables where the original is quadratic.
+
+Usage:
+    python3 benchmarks/benchmark_proposal_parse.py
+    python3 benchmarks/benchmark_proposal_parse.py --lines 50000 --iterations 5
+    python3 benchmarks/benchmark_proposal_parse.py proposal.txt
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda'))
+
+from proposal_pptx import parse_proposal
+
+
+def legacy_parse_proposal(text):
+    """The original parser, for comparison"""
+    slides = []
+    current_slide = None
+
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+
+        if line.startswith('# '):
+            if current_slide:
+                slides.append(current_slide)
+            current_slide = {'type': 'title', 'title': line[2:], 'content': []}
+        elif line.startswith('## '):
+            if current_slide:
+                slides.append(current_slide)
+            current_slide = {'type': 'section', 'title': line[3:], 'content': []}
+        elif line.startswith('### '):
+            if current_slide:
+                slides.append(current_slide)
+            current_slide = {'type': 'content', 'title': line[4:], 'content': []}
+        elif line.startswith('#### '):
+            if current_slide:
+                current_slide['content'].append({'type': 'subheading', 'text': line[5:]})
+        elif line.startswith('- ') or line.startswith('* '):
+            if current_slide:
+                current_slide['content'].append({'type': 'bullet', 'text': line[2:]})
+        elif line.startswith('|'):
+            if current_slide:
+                if not any(item.get('type') == 'table' for item in current_slide['content']):
+                    current_slide['content'].append({'type': 'table', 'rows': []})
+                for item in current_slide['content']:
+                    if item.get('type') == 'table':
+                        row = [cell.strip() for cell in line.split('|')[1:-1]]
+                        if not all(cell.startswith('-') for cell in row):
+                            item['rows'].append(row)
+                        break
+        else:
+            if current_slide and line:
+                current_slide['content'].append({'type': 'text', 'text': line})
+
+    if current_slide:
+        slides.append(current_slide)
+
+    return slides
+
+
+def synthetic_proposal(target_lines: int) -> str:
+    """
+    A generated proposal of about target_lines lines
+
+    Each slide has at most one table, so the original parser's habit of
+    merging every table on a slide into the first one doesn't affect parity.
+    """
+    lines = ['# Cloud Platform Modernisation Proposal', 'Prepared for Example Retail Group', '']
+    slide = 0
+
+    while len(lines) < target_lines:
+        slide += 1
+        if slide % 10 == 1:
+            lines += [f'## Workstream {slide // 10 + 1}', '']
+
+        lines += [f'### {slide}. Delivery Area {slide}', '']
+        lines += [f'Context paragraph {i} for area {slide}, covering scope and assumptions.' for i in range(3)]
+        lines += ['']
+        lines += [f'- **Outcome {i}**: measurable improvement in area {slide}' for i in range(8)]
+        lines += ['', '#### Plan', '']
+        lines += [f'* Step {i}: activity and owner' for i in range(4)]
+
+        # Every 50th slide carries a long rate card; the rest a short table
+        rows = 400 if slide % 50 == 0 else 12
+        lines += ['', '| Item | Role | Days | Rate | Cost |', '|------|------|------|------|------|']
+        lines += [f'| {i} | Engineer | {i % 20 + 1} | £750 | £{(i % 20 + 1) * 750:,} |' for i in range(rows)]
+        lines += ['', f'Summary for area {slide}.', '']
+
+    return '\n'.join(lines[:target_lines])
+
+
+def time_parser(parse, text: str, iterations: int) -> tuple:
+    """Parse the text repeatedly; returns (slides, timings in ms)"""
+    timings = []
+    slides = None
+
+    for _ in range(iterations):
+        start = time.perf_counter()
+        slides = parse(text)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return slides, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark proposal parsing')
+    parser.add_argument('proposal', nargs='?', help='Proposal text file (default: synthetic proposal)')
+    parser.add_argument('--lines', type=int, default=10000, help='Synthetic proposal length (default: 10000)')
+    parser.add_argument('--iterations', type=int, default=20, help='Parses per parser (default: 20)')
+
+    args = parser.parse_args()
+
+    if args.proposal:
+        with open(args.proposal) as f:
+            text = f.read()
+    else:
+        text = synthetic_proposal(args.lines)
+
+    print(f"Proposal: {text.count(chr(10)) + 1} lines, {len(text) / 1024:.0f} KB")
+
+    legacy_slides, legacy_timings = time_parser(legacy_parse_proposal, text, args.iterations)
+    slides, timings = time_parser(parse_proposal, text, args.iterations)
+
+    baseline = statistics.median(legacy_timings)
+    fast = statistics.median(timings)
+    identical = slides == legacy_slides
+
+    print(f"\n{'='*60}")
+    print("SUMMARY")
+    print(f"{'='*60}")
+    print(f"Slides: {len(slides)} ({sum(len(slide['content']) for slide in slides)} items)")
+    print(f"Original median: {baseline:.2f} ms")
+    print(f"Streaming median: {fast:.2f} ms")
+    print(f"Speedup: {baseline / fast:.1f}x")
+    print(f"Parity: {'identical slides' if identical else 'slides differ'}")
+    print(f"{'='*60}\n")
+
+    sys.exit(0 if identical else 1)
+
+
+if __name__ == '__main__':
+    main()
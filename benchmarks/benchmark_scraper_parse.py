@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark Companies House page parsing on saved overview pages
+
+Compares the original BeautifulSoup (html.parser) extraction with the
+single-pass lxml extractor, checking both produce the same company details.
+Fixtures are saved pages in benchmarks/fixtures/companies_house; each page's
+company number is read from its tab links.
+
+Usage:
+    python3 benchmarks/benchmark_scraper_parse.py
+    python3 benchmarks/benchmark_scraper_parse.py saved-page.html --iterations 500
+"""
+
+import argparse
+import glob
+import os
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda'))
+
+import companies_house_scraper
+from companies_house_scraper import CompaniesHouseScraper
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'companies_house')
+
+PARSERS = ['html.parser', 'lxml']
+
+
+def company_number_for(content: bytes) -> str:
+    """Company number from the page's tab links (/company/<number>/...)"""
+    match = re.search(rb'/company/([A-Z0-9]+)', content)
+    return match.group(1).decode() if match else ''
+
+
+def time_parser(scraper: CompaniesHouseScraper, parser: str, content: bytes, company_number: str,
+                iterations: int) -> tuple:
+    """Parse one page repeatedly with one parser; returns (result, timings in ms)"""
+    companies_house_scraper.PAGE_PARSER = parser
+    timings = []
+    result = None
+
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = scraper.parse_company_page(content, company_number)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return result, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Companies House page parsers')
+    parser.add_argument('pages', nargs='*', help='Saved overview pages (default: bundled fixtures)')
+    parser.add_argument('--iterations', type=int, default=200, help='Parses per page per parser (default: 200)')
+
+    args = parser.parse_args()
+
+    pages = args.pages or sorted(glob.glob(os.path.join(FIXTURE_DIR, '*.html')))
+    if not pages:
+        print("❌ No pages to benchmark", file=sys.stderr)
+        sys.exit(1)
+
+    scraper = CompaniesHouseScraper()
+    totals = {name: [] for name in PARSERS}
+    mismatches = 0
+
+    for path in pages:
+        with open(path, 'rb') as f:
+            content = f.read()
+        company_number = company_number_for(content)
+
+        print(f"\n{os.path.basename(path)} ({len(content) / 1024:.1f} KB, {company_number})")
+
+        results = {}
+        for name in PARSERS:
+            results[name], timings = time_parser(scraper, name, content, company_number, args.iterations)
+            totals[name].extend(timings)
+            print(f"  {name:<12} median {statistics.median(timings):7.3f} ms   "
+                  f"p95 {sorted(timings)[int(len(timings) * 0.95) - 1]:7.3f} ms")
+
+        if results['lxml'] == results['html.parser']:
+            print(f"  ✓ Identical output: {results['lxml']['company_name']} | "
+                  f"{results['lxml']['registered_office_address']} | {results['lxml']['company_status']}")
+        else:
+            mismatches += 1
+            print("  ✗ Output differs:")
+            for key in results['html.parser']:
+                if results['html.parser'][key] != results['lxml'].get(key):
+                    print(f"    {key}: {results['html.parser'][key]!r} != {results['lxml'].get(key)!r}")
+
+    baseline = statistics.median(totals['html.parser'])
+    fast = statistics.median(totals['lxml'])
+
+    print(f"\n{'='*60}")
+    print("SUMMARY")
+    print(f"{'='*60}")
+    print(f"Pages: {len(pages)}, {args.iterations} iterations each")
+    print(f"html.parser median: {baseline:.3f} ms")
+    print(f"lxml median: {fast:.3f} ms")
+    print(f"Speedup: {baseline / fast:.1f}x")
+    print(f"Parity: {'all pages identical' if not mismatches else f'{mismatches} page(s) differ'}")
+    print(f"{'='*60}\n")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Company Register Index Builder for Jamie 2.0
+Builds the local company index used by the contract generator from the
+Companies House "Free Company Data Product" bulk snapshot
+(https://download.companieshouse.gov.uk/en_output.html)
+
+Usage:
+    python3 build-company-index.py BasicCompanyDataAsOneFile-2025-01-01.zip
+    python3 build-company-index.py BasicCompanyData-*.zip --upload-bucket jamie2-knowledge-base-0t76l52f
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lambda'))
+
+from company_index import CompanyIndex, build_index
+
+DEFAULT_INDEX_KEY = 'indexes/company_index.sqlite'
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Build a local company index from the Companies House bulk snapshot'
+    )
+    parser.add_argument('inputs', nargs='+', help='Snapshot zip or CSV file(s)')
+    parser.add_argument('-o', '--output', default='company_index.sqlite', help='Index file (default: company_index.sqlite)')
+    parser.add_argument('--snapshot-date', help='Snapshot date YYYY-MM-DD (default: from the file name)')
+    parser.add_argument('--no-fuzzy', action='store_true', help='Skip the trigram index (smaller, exact/prefix search only)')
+    parser.add_argument('--upload-bucket', help='Upload the index to this S3 bucket')
+    parser.add_argument('--key', default=DEFAULT_INDEX_KEY, help=f'S3 key for the upload (default: {DEFAULT_INDEX_KEY})')
+    parser.add_argument('--profile', help='AWS profile for the upload')
+    parser.add_argument('--check', metavar='QUERY', help='Look up a company number or name in the built index')
+
+    args = parser.parse_args()
+
+    for path in args.inputs:
+        if not os.path.exists(path):
+            print(f"❌ File not found: {path}", file=sys.stderr)
+            sys.exit(1)
+
+    print(f"Building company index from {len(args.inputs)} file(s)...\n")
+    summary = build_index(args.inputs, args.output, snapshot_date=args.snapshot_date, fuzzy=not args.no_fuzzy)
+
+    size_mb = os.path.getsize(args.output) / (1024 * 1024)
+    print(f"\n{'='*60}")
+    print("SUMMARY")
+    print(f"{'='*60}")
+    print(f"Companies indexed: {summary['company_count']}")
+    print(f"Snapshot date: {summary['snapshot_date']}")
+    print(f"Index size: {size_mb:.1f} MB")
+    print(f"Elapsed: {summary['elapsed']:.1f}s")
+    print(f"Output: {args.output}")
+    print(f"{'='*60}\n")
+
+    if args.check:
+        index = CompanyIndex(args.output)
+        start = time.perf_counter()
+        company = index.get(args.check)
+        results = [] if company else index.search(args.check, limit=5)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        print(f"Lookup '{args.check}' ({elapsed_ms:.2f} ms):")
+        if company:
+            print(f"  {company['company_name']} ({company['company_number']}) - {company['company_status']}")
+            print(f"  {company['registered_office_address']}")
+        for result in results:
+            print(f"  [{result['match']}] {result['company_name']} ({result['company_number']}) - {result['company_status']}")
+        if not company and not results:
+            print("  No match")
+        print()
+
+    if args.upload_bucket:
+        import boto3
+
+        session = boto3.Session(profile_name=args.profile) if args.profile else boto3.Session()
+        print(f"Uploading to s3://{args.upload_bucket}/{args.key}...")
+        session.client('s3').upload_file(
+            args.output, args.upload_bucket, args.key,
+            ExtraArgs={'ServerSideEncryption': 'aws:kms'}  # Required by bucket policy
+        )
+        print("✓ Uploaded. Set COMPANY_INDEX_KEY on the contract generator Lambda to use it.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Bulk Contract Generation for Jamie 2.0
+Generates NDAs/MSAs for every company in a CSV or JSONL file (event attendee
+lists, partner programmes) and writes a JSONL manifest of download links
+
+Input rows need a company (name or number), signatory_name and signatory_title,
+and may set their own document_types (e.g. "nda,msa").
+
+Usage:
+    python3 bulk-generate-contracts.py attendees.csv --bucket jamie2-knowledge-base-xxxxx
+    python3 bulk-generate-contracts.py attendees.csv --bucket jamie2-knowledge-base-xxxxx --types nda,msa --resume
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lambda'))
+
+import boto3
+
+import bulk_contracts
+import contract_generator
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generate contracts for a list of companies'
+    )
+    parser.add_argument('input', help='CSV (with header) or JSONL of companies and signatories')
+    parser.add_argument('-o', '--output', help='Manifest JSONL file (default: <input>.manifest.jsonl)')
+    parser.add_argument('--bucket', default=os.environ.get('KNOWLEDGE_BASE_BUCKET'),
+                        help='Knowledge base bucket with the templates (default: $KNOWLEDGE_BASE_BUCKET)')
+    parser.add_argument('--types', default='nda', help='Document types for rows without their own (default: nda)')
+    parser.add_argument('--profile', help='AWS profile to use')
+    parser.add_argument('--api-key', default=os.environ.get('COMPANIES_HOUSE_API_KEY'),
+                        help='Companies House API key (default: $COMPANIES_HOUSE_API_KEY; scraper only without one)')
+    parser.add_argument('--lookups', type=int, default=bulk_contracts.DEFAULT_RESOLVE_CONCURRENCY,
+                        help=f'Concurrent company lookups (default: {bulk_contracts.DEFAULT_RESOLVE_CONCURRENCY})')
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 2,
+                        help='Render worker processes (default: CPU count; 0 renders in threads)')
+    parser.add_argument('--uploads', type=int, default=bulk_contracts.DEFAULT_UPLOAD_CONCURRENCY,
+                        help=f'Concurrent S3 uploads (default: {bulk_contracts.DEFAULT_UPLOAD_CONCURRENCY})')
+    parser.add_argument('--expires-in', type=int, default=bulk_contracts.BULK_URL_EXPIRY_SECONDS,
+                        help='Download link lifetime in seconds (default: 24 hours; at most 1 hour '
+                             'with temporary credentials such as SSO profiles)')
+    parser.add_argument('--resume', action='store_true', help='Skip rows already done in the manifest; retry failed ones')
+
+    args = parser.parse_args()
+
+    if not args.bucket:
+        print("❌ A bucket is required (--bucket or KNOWLEDGE_BASE_BUCKET)", file=sys.stderr)
+        sys.exit(1)
+
+    output = args.output or f"{os.path.splitext(args.input)[0]}.manifest.jsonl"
+
+    # Point the generation engine at this bucket, profile and API key
+    session = boto3.Session(profile_name=args.profile) if args.profile else boto3.Session()
+    contract_generator.s3 = session.client('s3')
+    contract_generator.KNOWLEDGE_BASE_BUCKET = args.bucket
+    contract_generator.COMPANIES_HOUSE_API_KEY = args.api_key or ''
+
+    credentials = session.get_credentials()
+    expires_in = bulk_contracts.url_expiry(args.expires_in, bool(credentials and credentials.token))
+
+    with open(args.input, encoding='utf-8-sig') as f:
+        jobs = bulk_contracts.read_jobs(f, contract_generator.parse_document_types(args.types))
+
+    manifest_lines = []
+    if args.resume and os.path.exists(output):
+        with open(output) as f:
+            manifest_lines = [line for line in f if line.strip()]
+
+    done = bulk_contracts.completed_job_ids(manifest_lines)
+    todo = [job for job in jobs if job['job_id'] not in done]
+
+    if done:
+        print(f"Resuming: {len(jobs) - len(todo)} of {len(jobs)} rows already done")
+    print(f"Generating contracts for {len(todo)} rows...\n")
+
+    # Keep only successful entries; failed rows are about to be retried
+    with open(output, 'w') as out:
+        for line in manifest_lines:
+            if (bulk_contracts.parse_manifest_line(line) or {}).get('job_id') in done:
+                out.write(line)
+
+    with open(output, 'a') as out:
+        def write_entry(entry):
+            out.write(json.dumps(entry) + '\n')
+            out.flush()
+
+            status = '✓' if entry['success'] else f"✗ {entry['error']}"
+            print(f"  Row {entry['row']}: {entry['company']} {status}", flush=True)
+
+        summary = bulk_contracts.run_bulk(
+            todo,
+            write_entry,
+            resolve_concurrency=args.lookups,
+            render_processes=args.processes,
+            upload_concurrency=args.uploads,
+            expires_in=expires_in
+        )
+
+    print(f"\n{'='*60}")
+    print("SUMMARY")
+    print(f"{'='*60}")
+    print(f"Rows: {len(jobs)} ({len(jobs) - len(todo)} already done)")
+    print(f"Succeeded: {summary['succeeded']}")
+    print(f"Failed: {summary['failed']}")
+    print(f"Elapsed: {summary['elapsed']}s")
+    print(f"Manifest: {output}")
+    print(f"{'='*60}\n")
+
+    if summary['failed']:
+        print("Re-run with --resume to retry the failed rows.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Bulk Companies House Enrichment for Jamie 2.0
+Looks up a list of prospect company numbers concurrently (under the API rate
+limit) and streams the parsed company details to a JSONL file
+
+Usage:
+    python3 enrich-companies.py prospects.csv -o companies.jsonl
+    python3 enrich-companies.py numbers.txt -o companies.jsonl --resume
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+import time
+
+try:
+    import aiohttp  # noqa: F401 (used by companies_house_async)
+except ImportError:
+    print("❌ aiohttp is required for bulk enrichment. Install with: pip3 install aiohttp", file=sys.stderr)
+    sys.exit(1)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lambda'))
+
+from companies_house_async import DEFAULT_CONCURRENCY, AsyncCompaniesHouseClient
+
+
+def read_company_numbers(path: str, column: str) -> list:
+    """
+    Read company numbers from a CSV (using the given column) or a plain list, one per line
+    """
+    with open(path, newline='') as f:
+        header = [name.strip() for name in next(csv.reader([f.readline()]), [])]
+
+        if column in header:
+            index = header.index(column)
+            numbers = [row[index] for row in csv.reader(f) if len(row) > index]
+        else:
+            f.seek(0)
+            numbers = [line for line in f]
+
+    numbers = [number.strip() for number in numbers]
+    return [number for number in numbers if number]
+
+
+def read_completed(path: str) -> set:
+    """Company numbers already written to an existing output file"""
+    completed = set()
+    if not os.path.exists(path):
+        return completed
+
+    with open(path) as f:
+        for line in f:
+            try:
+                completed.add(json.loads(line)['company_number'])
+            except (ValueError, KeyError):
+                continue
+    return completed
+
+
+async def enrich(numbers: list, output_file: str, api_key: str, concurrency: int,
+                 include_raw: bool, append: bool) -> None:
+    """Look up every company number and stream results to JSONL"""
+    total = len(numbers)
+    succeeded = failed = 0
+    start = time.time()
+
+    async with AsyncCompaniesHouseClient(api_key, concurrency=concurrency) as client:
+        with open(output_file, 'a' if append else 'w') as out:
+            async for result in client.get_many(numbers):
+                if result['success']:
+                    succeeded += 1
+                    if not include_raw:
+                        result['company'].pop('raw_data', None)
+                else:
+                    failed += 1
+
+                out.write(json.dumps(result) + '\n')
+                out.flush()
+
+                done = succeeded + failed
+                if done % 100 == 0 or done == total:
+                    elapsed = time.time() - start
+                    print(f"  {done}/{total} companies ({done / elapsed:.1f}/s), {failed} failed", flush=True)
+
+    elapsed = time.time() - start
+    print(f"\n{'='*60}")
+    print("SUMMARY")
+    print(f"{'='*60}")
+    print(f"Companies looked up: {total}")
+    print(f"Succeeded: {succeeded}")
+    print(f"Failed: {failed}")
+    print(f"Elapsed: {elapsed:.1f}s")
+    print(f"Output: {output_file}")
+    print(f"{'='*60}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Bulk-enrich prospect companies from Companies House'
+    )
+    parser.add_argument('input', help='CSV with a company number column, or one company number per line')
+    parser.add_argument('-o', '--output', required=True, help='Output JSONL file')
+    parser.add_argument('--column', default='company_number', help='CSV column with company numbers (default: company_number)')
+    parser.add_argument('--api-key', default=os.environ.get('COMPANIES_HOUSE_API_KEY'),
+                        help='Companies House API key (default: $COMPANIES_HOUSE_API_KEY)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f'Maximum requests in flight (default: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--include-raw', action='store_true', help='Include the raw API response for each company')
+    parser.add_argument('--resume', action='store_true', help='Skip companies already in the output file and append')
+
+    args = parser.parse_args()
+
+    if not args.api_key:
+        print("❌ A Companies House API key is required (--api-key or COMPANIES_HOUSE_API_KEY)", file=sys.stderr)
+        sys.exit(1)
+
+    numbers = read_company_numbers(args.input, args.column)
+    # Drop duplicates, keeping input order
+    numbers = list(dict.fromkeys(numbers))
+
+    if args.resume:
+        completed = read_completed(args.output)
+        numbers = [number for number in numbers if number not in completed]
+        print(f"Resuming: {len(completed)} already done")
+
+    print(f"Enriching {len(numbers)} companies with concurrency {args.concurrency}...\n")
+
+    asyncio.run(enrich(
+        numbers=numbers,
+        output_file=args.output,
+        api_key=args.api_key,
+        concurrency=args.concurrency,
+        include_raw=args.include_raw,
+        append=args.resume
+    ))
+
+
+if __name__ == '__main__':
+    main()
@@ -7,64 +7,158 @@ Usage:
     python3 jamie-cli.py --file prompt.txt
     python3 jamie-cli.py --interactive
     python3 jamie-cli.py "Your prompt" --format pptx -o output.pptx
+    python3 jamie-cli.py --batch prompts.jsonl --concurrency 4
 """
 
 import boto3
 import json
+import re
+import statistics
 import sys
 import argparse
-import subprocess
 import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
+from botocore.config import Config
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lambda'))
+
 # Configuration
 AWS_PROFILE = 'AdministratorAccess-380414079195'
 AWS_REGION = 'eu-west-2'
 AGENT_ID = 'LUZWQYYBP4'
 AGENT_ALIAS_ID = '65PC3XRFMX'  # Note: Update if you changed the alias in console
 
-
-def invoke_jamie(prompt: str, output_file: str = None, verbose: bool = False):
-    """Invoke Jamie 2.0 with a prompt"""
-
-    # Initialize client
-    session = boto3.Session(profile_name=AWS_PROFILE, region_name=AWS_REGION)
-    client = session.client('bedrock-agent-runtime')
-
-    session_id = f'jamie-{int(datetime.now().timestamp())}'
+# Batch mode: prompts in flight at once (Bedrock throttles well before this gets large)
+DEFAULT_BATCH_CONCURRENCY = 4
+
+PPTX_INSTRUCTION = "\n\nIMPORTANT: Create this as a PowerPoint presentation following the template structure."
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client(max_connections: int = 10):
+    """
+    Bedrock Agent Runtime client, created once and reused for every prompt
+
+    The first call sizes the connection pool (batch mode passes its
+    concurrency); throttled calls are retried with adaptive backoff.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            session = boto3.Session(profile_name=AWS_PROFILE, region_name=AWS_REGION)
+            _client = session.client('bedrock-agent-runtime', config=Config(
+                max_pool_connections=max_connections,
+                retries={'max_attempts': 5, 'mode': 'adaptive'},
+                read_timeout=300
+            ))
+        return _client
+
+
+def new_session_id() -> str:
+    """Unique agent session id (timestamps alone collide when prompts run concurrently)"""
+    return f'jamie-{int(datetime.now().timestamp())}-{uuid.uuid4().hex[:8]}'
+
+
+def run_prompt(prompt: str, session_id: str = None, on_text=None, on_trace=None,
+               session_state: dict = None) -> dict:
+    """
+    Send one prompt to Jamie and collect the streamed response
+
+    Args:
+        prompt: Prompt text
+        session_id: Agent session (a new one if not given)
+        on_text: Called with each response chunk as it arrives
+        on_trace: Called with each trace event (traces are only requested when given)
+        session_state: Bedrock Agent session state (e.g. promptSessionAttributes) for this turn
+
+    Returns:
+        {'response', 'session_id', 'latency', 'first_chunk'} (seconds)
+
+    Raises:
+        botocore errors from the agent
+    """
+    session_id = session_id or new_session_id()
+    start = time.perf_counter()
+    first_chunk = None
+
+    request = {
+        'agentId': AGENT_ID,
+        'agentAliasId': AGENT_ALIAS_ID,
+        'sessionId': session_id,
+        'inputText': prompt,
+        'enableTrace': on_trace is not None
+    }
+    if session_state:
+        request['sessionState'] = session_state
+
+    response = get_client().invoke_agent(**request)
+
+    # Process streaming response
+    full_response = ""
+    for event in response['completion']:
+        if 'chunk' in event:
+            chunk = event['chunk']
+            if 'bytes' in chunk:
+                text = chunk['bytes'].decode('utf-8')
+                if first_chunk is None:
+                    first_chunk = time.perf_counter() - start
+                full_response += text
+                if on_text:
+                    on_text(text)
+        elif 'trace' in event and on_trace:
+            on_trace(event['trace'])
+
+    return {
+        'response': full_response,
+        'session_id': session_id,
+        'latency': time.perf_counter() - start,
+        'first_chunk': first_chunk
+    }
+
+
+def invoke_jamie(prompt: str, output_file: str = None, verbose: bool = False, on_text=None):
+    """
+    Invoke Jamie 2.0 with a prompt
+
+    on_text, if given, is also called with each response chunk as it arrives
+    (e.g. StreamingPresentation.feed to build slides while the response streams).
+    """
+
+    session_id = new_session_id()
 
     if verbose:
         print(f"🤖 Invoking Jamie 2.0...")
         print(f"📝 Session ID: {session_id}")
         print("=" * 80)
 
+    def show_text(text):
+        if verbose:
+            print(text, end='', flush=True)
+        if on_text:
+            on_text(text)
+
+    def show_trace(trace_event):
+        trace = trace_event['trace']
+        if 'orchestrationTrace' in trace:
+            orch = trace['orchestrationTrace']
+            if 'observation' in orch:
+                print(f"\n\n[🔍 Jamie is searching proposals...]\n", flush=True)
+
     try:
-        # Invoke the agent
-        response = client.invoke_agent(
-            agentId=AGENT_ID,
-            agentAliasId=AGENT_ALIAS_ID,
-            sessionId=session_id,
-            inputText=prompt
+        result = run_prompt(
+            prompt,
+            session_id,
+            on_text=show_text if verbose or on_text else None,
+            on_trace=show_trace if verbose else None
         )
-
-        # Process streaming response
-        event_stream = response['completion']
-        full_response = ""
-
-        for event in event_stream:
-            if 'chunk' in event:
-                chunk = event['chunk']
-                if 'bytes' in chunk:
-                    text = chunk['bytes'].decode('utf-8')
-                    full_response += text
-                    if verbose:
-                        print(text, end='', flush=True)
-            elif 'trace' in event and verbose:
-                trace = event['trace']['trace']
-                if 'orchestrationTrace' in trace:
-                    orch = trace['orchestrationTrace']
-                    if 'observation' in orch:
-                        print(f"\n\n[🔍 Jamie is searching proposals...]\n", flush=True)
+        full_response = result['response']
 
         if verbose:
             print("\n" + "=" * 80)
@@ -83,15 +177,286 @@ def invoke_jamie(prompt: str, output_file: str = None, verbose: bool = False):
         sys.exit(1)
 
 
+# Follow-ups that rework the previous answer rather than asking for something new:
+# a rework verb ("shorten ..."), or an edit verb aimed at the answer ("make it ...",
+# "remove section 2"). Edit verbs alone start plenty of new requests ("Make a proposal").
+REFINEMENT_PATTERN = re.compile(
+    r'^(please\s+)?(shorten|lengthen|expand|rewrite|rephrase|reword|summari[sz]e|simplify|tighten|condense|trim)\b'
+    r'|^(please\s+)?(make|change|update|add\s+to|remove|drop|replace|reorder|move|split|merge|fix|tweak|adjust|'
+    r'turn|convert)\s+(it|that|this|them|those|(the\s+)?(section|paragraph|bullet|slide)\s+\d+)\b'
+    r'|\b(previous|last)\s+answer\b',
+    re.IGNORECASE
+)
+
+
+def is_refinement(prompt: str) -> bool:
+    """Whether a prompt asks to rework the previous answer ("shorten section 3")"""
+    return bool(REFINEMENT_PATTERN.search(prompt.strip()))
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Cache key for a prompt: case and whitespace don't matter"""
+    return ' '.join(prompt.lower().split())
+
+
+class Conversation:
+    """
+    One agent session for a whole interactive run, with a client-side cache
+
+    The agent keeps the session's history, so follow-ups build on earlier
+    answers. Locally we keep every answer (asking the same thing again is
+    answered from the cache) and the knowledge base documents retrieved so
+    far. Refinements of the last answer are sent with prompt session
+    attributes telling the agent to rework it from the conversation and the
+    sources already retrieved, instead of searching again. Refinements are
+    never cached, and they make the cached answers stale, so the cache is
+    cleared after each one.
+    """
+
+    def __init__(self):
+        self.session_id = new_session_id()
+        self.answers = {}  # normalised prompt -> response
+        self.sources = {}  # S3 URI -> excerpt of each retrieved document
+        self.last_response = None  # Last answer shown, possibly from the cache
+        self.agent_response = None  # Last answer the agent gave in the session
+        self.stats = {'turns': 0, 'cache_hits': 0, 'refinements': 0, 'retrievals': 0}
+
+    def ask(self, prompt: str, on_text=None, on_retrieval=None) -> dict:
+        """
+        Answer a prompt from the cache or the agent session
+
+        Args:
+            prompt: Prompt text
+            on_text: Called with each response chunk as it arrives
+            on_retrieval: Called when the agent searches the knowledge base
+
+        Returns:
+            run_prompt result plus 'cached', 'refinement' and 'retrievals' (this turn)
+        """
+        self.stats['turns'] += 1
+        key = normalize_prompt(prompt)
+        session_state = self.session_state(prompt)
+
+        if not session_state and key in self.answers:
+            self.stats['cache_hits'] += 1
+            self.last_response = self.answers[key]
+            if on_text:
+                on_text(self.last_response)
+            return {'response': self.last_response, 'session_id': self.session_id, 'latency': 0.0,
+                    'first_chunk': None, 'cached': True, 'refinement': False, 'retrievals': 0}
+
+        if session_state:
+            self.stats['refinements'] += 1
+
+        retrievals_before = self.stats['retrievals']
+
+        def collect_sources(trace_event):
+            observation = trace_event.get('trace', {}).get('orchestrationTrace', {}).get('observation', {})
+            lookup = observation.get('knowledgeBaseLookupOutput')
+            if lookup is None:
+                return
+
+            self.stats['retrievals'] += 1
+            for reference in lookup.get('retrievedReferences', []):
+                uri = reference.get('location', {}).get('s3Location', {}).get('uri')
+                if uri:
+                    self.sources[uri] = reference.get('content', {}).get('text', '')[:300]
+            if on_retrieval:
+                on_retrieval()
+
+        result = run_prompt(prompt, self.session_id, on_text=on_text, on_trace=collect_sources,
+                            session_state=session_state)
+
+        if session_state:
+            self.answers.clear()
+        else:
+            self.answers[key] = result['response']
+        self.last_response = self.agent_response = result['response']
+
+        result.update(cached=False, refinement=bool(session_state),
+                      retrievals=self.stats['retrievals'] - retrievals_before)
+        return result
+
+    def session_state(self, prompt: str) -> dict:
+        """Prompt session attributes for a refinement of the last answer, or None"""
+        if not self.last_response or not is_refinement(prompt):
+            return None
+
+        attributes = {
+            'request_type': 'Refinement of your previous answer in this conversation',
+            'instructions': ('Revise your previous answer as asked, using the conversation so far and the '
+                             'documents already retrieved. Only search the knowledge base again if the '
+                             'request needs information those documents do not contain.'),
+            'retrieved_documents': ', '.join(list(self.sources)[:20]) or 'none'
+        }
+
+        # The answer on screen came from the cache, so it isn't the agent's last answer
+        if self.last_response != self.agent_response:
+            attributes['instructions'] = attributes['instructions'].replace(
+                'your previous answer', 'the answer in answer_to_revise (an earlier answer of yours)')
+            attributes['answer_to_revise'] = self.last_response
+
+        return {'promptSessionAttributes': attributes}
+
+
+def read_batch_prompts(path: str) -> list:
+    """
+    Prompts for batch mode: JSONL ({"prompt": ..., "name": optional}) or
+    plain text with one prompt per line (blank lines and # comments skipped)
+
+    Returns:
+        List of {'index', 'name', 'prompt'}
+    """
+    prompts = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+
+            if path.endswith('.jsonl'):
+                row = json.loads(line)
+                prompt, name = row['prompt'], row.get('name')
+            else:
+                prompt, name = line, None
+
+            index = len(prompts) + 1
+            slug = re.sub(r'[^a-z0-9]+', '-', (name or prompt[:40]).lower()).strip('-')
+            prompts.append({'index': index, 'name': f"{index:03d}-{slug}", 'prompt': prompt})
+
+    return prompts
+
+
+def batch_mode(path: str, output_dir: str, concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+               output_format: str = 'txt', quiet: bool = False, template: str = None) -> dict:
+    """
+    Run a file of prompts concurrently, writing each response to its own file
+
+    Every prompt gets its own agent session; at most `concurrency` run at once
+    over a single shared client. results.jsonl in the output directory records
+    each prompt's output file, latency and any error.
+
+    Returns:
+        Summary with counts, wall time and latency percentiles
+    """
+    prompts = read_batch_prompts(path)
+    os.makedirs(output_dir, exist_ok=True)
+    get_client(max_connections=max(10, concurrency))
+
+    if not quiet:
+        print(f"🤖 Running {len(prompts)} prompts, {concurrency} at a time -> {output_dir}/")
+
+    if output_format == 'pptx':
+        from proposal_pptx import StreamingPresentation
+
+    def run_one(item):
+        prompt = item['prompt'] + (PPTX_INSTRUCTION if output_format == 'pptx' else '')
+        text_file = os.path.join(output_dir, f"{item['name']}.txt")
+        entry = {'index': item['index'], 'name': item['name'], 'prompt': item['prompt']}
+
+        # Decks are built slide by slide as each response streams in
+        deck = StreamingPresentation(template) if output_format == 'pptx' else None
+
+        try:
+            result = run_prompt(prompt, on_text=deck.feed if deck else None)
+        except Exception as e:
+            return dict(entry, success=False, error=str(e))
+
+        with open(text_file, 'w') as f:
+            f.write(result['response'])
+
+        entry.update(
+            success=True,
+            output=text_file,
+            session_id=result['session_id'],
+            latency=round(result['latency'], 2),
+            first_chunk=round(result['first_chunk'], 2) if result['first_chunk'] is not None else None
+        )
+
+        if deck:
+            pptx_file = os.path.join(output_dir, f"{item['name']}.pptx")
+            try:
+                entry['slides'] = deck.finish(pptx_file)
+                entry['output'] = pptx_file
+            except Exception as e:
+                entry['error'] = f"PowerPoint conversion failed: {e}"
+
+        return entry
+
+    start = time.perf_counter()
+    results = []
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor, \
+            open(os.path.join(output_dir, 'results.jsonl'), 'w') as results_file:
+        futures = [executor.submit(run_one, item) for item in prompts]
+
+        for future in as_completed(futures):
+            entry = future.result()
+            results.append(entry)
+            results_file.write(json.dumps(entry) + '\n')
+            results_file.flush()
+
+            if not quiet:
+                if entry['success']:
+                    print(f"  ✅ [{len(results)}/{len(prompts)}] {entry['name']} ({entry['latency']}s)", flush=True)
+                else:
+                    print(f"  ❌ [{len(results)}/{len(prompts)}] {entry['name']}: {entry['error']}", flush=True)
+
+    wall_time = time.perf_counter() - start
+    latencies = sorted(entry['latency'] for entry in results if entry['success'])
+    first_chunks = [entry['first_chunk'] for entry in results if entry.get('first_chunk') is not None]
+
+    return {
+        'prompts': len(prompts),
+        'succeeded': len(latencies),
+        'failed': len(prompts) - len(latencies),
+        'wall_time': wall_time,
+        'throughput': len(latencies) / wall_time * 60 if wall_time else 0,
+        'latency_p50': statistics.median(latencies) if latencies else None,
+        'latency_p95': latencies[max(0, int(len(latencies) * 0.95) - 1)] if latencies else None,
+        'latency_max': latencies[-1] if latencies else None,
+        'first_chunk_p50': statistics.median(first_chunks) if first_chunks else None,
+        'results_file': os.path.join(output_dir, 'results.jsonl')
+    }
+
+
+def print_batch_summary(summary: dict):
+    """Print batch counts, throughput and latency"""
+    def seconds(value):
+        return f"{value:.1f}s" if value is not None else 'n/a'
+
+    print(f"\n{'='*60}")
+    print("SUMMARY")
+    print(f"{'='*60}")
+    print(f"Prompts: {summary['prompts']}")
+    print(f"Succeeded: {summary['succeeded']}")
+    print(f"Failed: {summary['failed']}")
+    print(f"Wall time: {summary['wall_time']:.1f}s")
+    print(f"Throughput: {summary['throughput']:.1f} proposals/min")
+    print(f"Latency: p50 {seconds(summary['latency_p50'])}, p95 {seconds(summary['latency_p95'])}, "
+          f"max {seconds(summary['latency_max'])}")
+    print(f"First chunk: p50 {seconds(summary['first_chunk_p50'])}")
+    print(f"Results: {summary['results_file']}")
+    print(f"{'='*60}\n")
+
+
 def interactive_mode():
-    """Run Jamie in interactive mode"""
+    """Run Jamie in interactive mode (one conversation, see Conversation)"""
     print("🤖 Jamie 2.0 Interactive Mode")
     print("=" * 80)
     print("Type your prompts below. Type 'exit' or 'quit' to exit.")
     print("Type 'save' to save the last response to a file.")
+    print("Type 'sources' to list retrieved documents, 'new' to start a fresh conversation.")
     print("=" * 80)
 
-    last_response = None
+    conversation = Conversation()
+    print(f"📝 Session ID: {conversation.session_id}")
+
+    def show_text(text):
+        print(text, end='', flush=True)
+
+    def show_retrieval():
+        print(f"\n\n[🔍 Jamie is searching proposals...]\n", flush=True)
 
     while True:
         try:
@@ -101,18 +466,43 @@ def interactive_mode():
                 print("👋 Goodbye!")
                 break
 
-            if prompt.lower() == 'save' and last_response:
+            if prompt.lower() == 'save' and conversation.last_response:
                 filename = input("📁 Filename: ").strip()
                 with open(filename, 'w') as f:
-                    f.write(last_response)
+                    f.write(conversation.last_response)
                 print(f"✅ Saved to: {filename}")
                 continue
 
+            if prompt.lower() == 'sources':
+                for uri in conversation.sources:
+                    print(f"  📄 {uri}")
+                if not conversation.sources:
+                    print("  No documents retrieved yet")
+                continue
+
+            if prompt.lower() == 'new':
+                conversation = Conversation()
+                print(f"🆕 New conversation: {conversation.session_id}")
+                continue
+
             if not prompt:
                 continue
 
             print("\n🤖 Jamie:")
-            last_response = invoke_jamie(prompt, verbose=True)
+            try:
+                result = conversation.ask(prompt, on_text=show_text, on_retrieval=show_retrieval)
+            except Exception as e:
+                print(f"\n❌ Error: {str(e)}", file=sys.stderr)
+                continue
+
+            if result['cached']:
+                note = "answered from this conversation's cache"
+            else:
+                note = f"{result['latency']:.1f}s"
+                if result['refinement']:
+                    note += ", refinement"
+                note += f", {result['retrievals']} knowledge base search(es)"
+            print(f"\n\n[⏱ {note}; {len(conversation.sources)} document(s) retrieved so far]")
 
         except KeyboardInterrupt:
             print("\n\n👋 Goodbye!")
@@ -135,6 +525,9 @@ Examples:
 
   # Interactive mode
   python3 jamie-cli.py --interactive
+
+  # Batch: one prompt per line (or JSONL with "prompt" and optional "name")
+  python3 jamie-cli.py --batch quarter-start.jsonl --concurrency 4 --output-dir drafts/
         """
     )
 
@@ -144,9 +537,21 @@ Examples:
     parser.add_argument('-i', '--interactive', action='store_true', help='Interactive mode')
     parser.add_argument('-q', '--quiet', action='store_true', help='Quiet mode (no verbose output)')
     parser.add_argument('--format', choices=['txt', 'pptx'], default='txt', help='Output format (txt or pptx)')
+    parser.add_argument('--template', help='Corporate .pptx template for PowerPoint output (default: $PPTX_TEMPLATE)')
+    parser.add_argument('-b', '--batch', help='Run every prompt in a file (one per line, or JSONL) concurrently')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_BATCH_CONCURRENCY,
+                        help=f'Prompts in flight at once in batch mode (default: {DEFAULT_BATCH_CONCURRENCY})')
+    parser.add_argument('--output-dir', help='Batch output directory (default: batch-<timestamp>)')
 
     args = parser.parse_args()
 
+    # Batch mode
+    if args.batch:
+        output_dir = args.output_dir or f"batch-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+        summary = batch_mode(args.batch, output_dir, args.concurrency, args.format, args.quiet, args.template)
+        print_batch_summary(summary)
+        sys.exit(1 if summary['failed'] else 0)
+
     # Interactive mode
     if args.interactive:
         interactive_mode()
@@ -164,24 +569,18 @@ Examples:
 
     # Check if output ends with .pptx (PowerPoint requested)
     if args.output and args.output.endswith('.pptx'):
-        # Add instruction to Jamie's prompt to create presentation
-        enhanced_prompt = f"{prompt}\n\nIMPORTANT: Create this as a PowerPoint presentation following the template structure."
+        from proposal_pptx import StreamingPresentation
 
-        # Generate to temp text file first
-        temp_output = args.output.replace('.pptx', '.txt')
-        response = invoke_jamie(enhanced_prompt, temp_output, verbose=not args.quiet)
+        # Add instruction to Jamie's prompt to create presentation
+        enhanced_prompt = f"{prompt}{PPTX_INSTRUCTION}"
 
-        # Convert to PowerPoint
-        converter_script = os.path.join(os.path.dirname(__file__), 'proposal-to-pptx.py')
+        # Slides are built in-process as the response streams, so only the last one is left at the end
+        deck = StreamingPresentation(args.template)
+        invoke_jamie(enhanced_prompt, verbose=not args.quiet, on_text=deck.feed)
+        slide_count = deck.finish(args.output)
 
         if not args.quiet:
-            print(f"\n🎨 Converting to PowerPoint...")
-
-        subprocess.run([sys.executable, converter_script, temp_output, args.output], check=True)
-
-        # Clean up temp file
-        if os.path.exists(temp_output):
-            os.remove(temp_output)
+            print(f"🎨 PowerPoint saved to: {args.output} ({slide_count} slides)")
     else:
         # Regular text output
         response = invoke_jamie(prompt, args.output, verbose=not args.quiet)
@@ -0,0 +1,127 @@
+"""
+Bedrock Agent Trace Processing
+Collects generated documents from an invoke_agent stream by looking only at
+action group outputs (orchestrationTrace.observation.actionGroupInvocationOutput),
+instead of stringifying every trace. Each action output is parsed once.
+"""
+
+import json
+import os
+from typing import Dict, List, Optional
+
+# DEBUG logs every stream event and action output; anything else only logs documents found
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+
+
+def log_debug(message: str) -> None:
+    """Print only when LOG_LEVEL is DEBUG"""
+    if LOG_LEVEL == 'DEBUG':
+        print(message)
+
+
+def action_group_output(trace_event: Dict) -> Optional[str]:
+    """
+    Text of the action group output in a streamed trace event, if it has one
+
+    Args:
+        trace_event: The 'trace' part of an invoke_agent stream event
+
+    Returns:
+        The action's response body text, or None for any other kind of trace
+    """
+    orchestration = trace_event.get('trace', {}).get('orchestrationTrace')
+    if not orchestration:
+        return None
+
+    observation = orchestration.get('observation')
+    if not observation:
+        return None
+
+    output = observation.get('actionGroupInvocationOutput')
+    if not output:
+        return None
+
+    return output.get('text')
+
+
+class AgentTraceProcessor:
+    """
+    Collects document results from an agent's trace events as they stream in
+
+    Usage:
+        traces = AgentTraceProcessor(expected_doc_count=2)
+        for event in response['completion']:
+            if 'trace' in event:
+                traces.process(event['trace'])
+                if traces.complete:
+                    break
+    """
+
+    def __init__(self, expected_doc_count: Optional[int] = None):
+        """
+        Args:
+            expected_doc_count: Documents expected, if known; complete once collected
+        """
+        self.expected_doc_count = expected_doc_count
+        self.documents: List[Dict] = []
+        self.company_details: Optional[Dict] = None
+        self.outputs_parsed = 0
+
+    @property
+    def complete(self) -> bool:
+        """Whether every expected document has been collected"""
+        return bool(self.expected_doc_count) and len(self.documents) >= self.expected_doc_count
+
+    def process(self, trace_event: Dict) -> List[Dict]:
+        """
+        Inspect one trace event
+
+        Returns:
+            Documents found in this event (usually none)
+        """
+        text = action_group_output(trace_event)
+        if text is None:
+            return []
+
+        self.outputs_parsed += 1
+        log_debug(f"Action output text: {text[:500]}")
+
+        try:
+            result = json.loads(text)
+        except ValueError as e:
+            print(f"Failed to parse action output: {e}")
+            return []
+
+        if not isinstance(result, dict) or not result.get('success'):
+            return []
+
+        found = documents_from_result(result)
+        if found:
+            self.documents.extend(found)
+            print(f"Collected {len(self.documents)}/{self.expected_doc_count} documents")
+
+            # Company details from the first document
+            if not self.company_details:
+                self.company_details = result.get('company_details', {})
+
+        return found
+
+
+def documents_from_result(result: Dict) -> List[Dict]:
+    """
+    Documents in a contract generator result: a single-document result, or a
+    combined result (NDA + MSA) with a 'documents' list
+    """
+    if 'documents' in result:
+        return [
+            {'type': doc['type'], 'download_url': doc.get('download_url'), 's3_key': doc.get('s3_key', '')}
+            for doc in result['documents']
+        ]
+
+    if not result.get('download_url'):
+        return []
+
+    s3_key = result.get('s3_key', '')
+    doc_type = result.get('document_type') or ('nda' if 'nda' in s3_key.lower() else 'msa')
+
+    return [{'type': doc_type, 'download_url': result['download_url'], 's3_key': s3_key}]
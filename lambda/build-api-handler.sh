@@ -12,7 +12,7 @@ rm -f nda_api_handler.zip
 
 # Create deployment package (no dependencies needed - only boto3 which is built-in)
 echo "Creating deployment package..."
-zip nda_api_handler.zip nda_api_handler.py
+zip nda_api_handler.zip nda_api_handler.py agent_traces.py job_store.py
 
 # Move to terraform directory
 mv nda_api_handler.zip ../terraform/
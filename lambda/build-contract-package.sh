@@ -0,0 +1,61 @@
+#!/bin/bash
+# Build Lambda deployment package with dependencies for the contract generator (NDA + MSA, proposal decks)
+
+set -e
+
+echo "Building Lambda deployment package for the contract generator (NDA + MSA)..."
+
+# Clean previous build
+rm -rf package
+rm -f contract_generator.zip
+
+# Create package directory
+mkdir -p package
+
+# Install dependencies
+echo "Installing dependencies..."
+pip3 install \
+  --target ./package \
+  --platform manylinux2014_x86_64 \
+  --python-version 3.12 \
+  --only-binary=:all: \
+  python-docx==1.1.2 \
+  requests==2.31.0 \
+  lxml==5.3.0 \
+  beautifulsoup4==4.12.3 \
+  python-pptx==1.0.2
+
+# Copy Lambda function code
+echo "Copying Lambda function code..."
+cp contract_generator.py package/
+cp bulk_contracts.py package/
+cp nda_generator.py package/
+cp msa_generator.py package/
+cp companies_house.py package/
+cp companies_house_cache.py package/
+cp companies_house_scraper.py package/
+cp company_provider.py package/
+cp company_index.py package/
+cp company_matching.py package/
+cp docx_template.py package/
+cp docx_stream.py package/
+cp presentation_generator.py package/
+cp proposal_pptx.py package/
+
+# Create deployment package
+echo "Creating deployment package..."
+cd package
+zip -r ../contract_generator.zip . -x "*.pyc" -x "*__pycache__*"
+cd ..
+
+# Move to terraform directory
+mv contract_generator.zip ../terraform/
+
+echo "✓ Lambda deployment package created: ../terraform/contract_generator.zip"
+echo "✓ Package includes dependencies: python-docx, requests, lxml, beautifulsoup4, python-pptx"
+
+# Clean up
+rm -rf package
+
+echo ""
+echo "Next step: Run 'terraform apply' to deploy the updated Lambda function"
@@ -0,0 +1,394 @@
+"""
+Bulk Contract Generation
+Generates contracts for a whole list of companies (event attendees, partner
+programmes) in one job instead of one agent conversation per company.
+
+Companies are resolved concurrently (under the shared Companies House rate
+limit), documents are rendered in a process pool and uploaded in parallel, and
+each finished row is appended to a JSONL manifest of presigned URLs. Rows
+already in the manifest are skipped, so an interrupted run can be resumed.
+
+URLs signed with temporary credentials (a Lambda execution role, an SSO
+profile) stop working when the credentials expire, so their lifetime is
+capped; the manifest keeps each document's s3_key for re-presigning.
+"""
+
+import csv
+import hashlib
+import io
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+import contract_generator
+from contract_generator import DOCUMENT_TYPES, build_render_context, parse_document_types, render_document
+
+# Presigned URLs in a bulk manifest are shared with sales ops, so last longer than interactive ones
+BULK_URL_EXPIRY_SECONDS = int(os.environ.get('BULK_URL_EXPIRY_SECONDS', str(24 * 3600)))
+
+# Longest URL lifetime when signing with temporary credentials; a presigned URL
+# dies with the session that signed it, whatever its ExpiresIn says
+TEMPORARY_CREDENTIALS_URL_EXPIRY_SECONDS = 3600
+
+# In Lambda the manifest is saved every this many rows or seconds, whichever comes
+# first, so a crash or hard timeout only loses the rows since the last save
+MANIFEST_FLUSH_ROWS = 25
+MANIFEST_FLUSH_SECONDS = 10
+
+DEFAULT_RESOLVE_CONCURRENCY = 8
+DEFAULT_UPLOAD_CONCURRENCY = 8
+
+# Stop starting new rows when a Lambda has less than this left, so the manifest can be saved
+LAMBDA_TIME_MARGIN_MS = 20000
+
+# Column names accepted for each field, first match wins
+COLUMN_ALIASES = {
+    'company': ['company', 'company_identifier', 'company_number', 'company_name'],
+    'signatory_name': ['signatory_name', 'signatory', 'name'],
+    'signatory_title': ['signatory_title', 'title'],
+    'document_types': ['document_types', 'documents'],
+}
+
+BULK_OUTPUT_PREFIX = 'generated-bulk/'
+
+# Template bytes for render worker processes, set once per process by _init_render_worker
+_worker_templates: Dict[str, bytes] = {}
+
+
+def read_jobs(lines: Iterable[str], default_document_types: List[str]) -> List[Dict]:
+    """
+    Parse bulk input: JSONL (one object per line) or CSV with a header row
+
+    Returns:
+        Jobs with 'job_id', 'row', 'company', 'signatory_name', 'signatory_title'
+        and 'document_types'. job_id is derived from the row's content, so it
+        is stable across runs and identifies rows that are already done.
+    """
+    lines = [line for line in lines if line.strip()]
+    if not lines:
+        return []
+
+    if lines[0].lstrip().startswith('{'):
+        rows = [json.loads(line) for line in lines]
+    else:
+        reader = csv.DictReader(io.StringIO(''.join(line if line.endswith('\n') else line + '\n' for line in lines)))
+        rows = [{key.strip().lower(): value for key, value in row.items() if key} for row in reader]
+
+    jobs = []
+    for number, row in enumerate(rows, start=1):
+        fields = {}
+        for field, aliases in COLUMN_ALIASES.items():
+            fields[field] = next((row[alias] for alias in aliases if row.get(alias)), None)
+
+        document_types = parse_document_types(fields['document_types'] or default_document_types)
+        company = (fields['company'] or '').strip()
+        signatory_name = (fields['signatory_name'] or '').strip()
+        signatory_title = (fields['signatory_title'] or '').strip()
+
+        identity = json.dumps([company.lower(), signatory_name, signatory_title, document_types])
+        jobs.append({
+            'job_id': hashlib.sha256(identity.encode('utf-8')).hexdigest()[:16],
+            'row': number,
+            'company': company,
+            'signatory_name': signatory_name,
+            'signatory_title': signatory_title,
+            'document_types': document_types,
+        })
+
+    return jobs
+
+
+def completed_job_ids(manifest_lines: Iterable[str]) -> set:
+    """Job ids recorded as successful in an existing manifest"""
+    return {entry['job_id'] for entry in map(parse_manifest_line, manifest_lines)
+            if entry and entry.get('success')}
+
+
+def parse_manifest_line(line: str) -> Optional[Dict]:
+    """A manifest entry, or None for a line that doesn't parse (e.g. cut short by a killed run)"""
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return None
+    return entry if isinstance(entry, dict) and 'job_id' in entry else None
+
+
+def url_expiry(expires_in: int, temporary_credentials: bool) -> int:
+    """
+    Presigned URL lifetime to use, capped for temporary credentials
+
+    Args:
+        expires_in: Requested lifetime in seconds
+        temporary_credentials: Whether the signing credentials have a session token
+    """
+    if temporary_credentials and expires_in > TEMPORARY_CREDENTIALS_URL_EXPIRY_SECONDS:
+        print(f"Signing with temporary credentials: download links last "
+              f"{TEMPORARY_CREDENTIALS_URL_EXPIRY_SECONDS // 60} minutes, not {expires_in // 60}; "
+              f"re-presign from the manifest's s3_key values after that")
+        return TEMPORARY_CREDENTIALS_URL_EXPIRY_SECONDS
+    return expires_in
+
+
+def validate_job(job: Dict) -> Optional[str]:
+    """Error message for a row that can't be generated, or None"""
+    if not job['company']:
+        return 'Company name or number is required'
+    if not job['signatory_name'] or not job['signatory_title']:
+        return 'Signatory name and title are required'
+    unknown_types = [doc_type for doc_type in job['document_types'] if doc_type not in DOCUMENT_TYPES]
+    if not job['document_types'] or unknown_types:
+        return f"Document types must be one or more of: {', '.join(DOCUMENT_TYPES)}"
+    return None
+
+
+def run_bulk(
+    jobs: List[Dict],
+    write_entry: Callable[[Dict], None],
+    resolve_concurrency: int = DEFAULT_RESOLVE_CONCURRENCY,
+    render_processes: int = 0,
+    upload_concurrency: int = DEFAULT_UPLOAD_CONCURRENCY,
+    expires_in: int = BULK_URL_EXPIRY_SECONDS,
+    should_stop: Optional[Callable[[], bool]] = None
+) -> Dict:
+    """
+    Generate documents for every job, pipelining resolve -> render -> upload
+
+    Each stage starts as soon as the previous one finishes for a row, so
+    lookups, rendering and uploads overlap across rows.
+
+    Args:
+        jobs: Jobs from read_jobs (already-completed ones filtered out)
+        write_entry: Called with each finished row's manifest entry
+        resolve_concurrency: Concurrent company lookups (the API rate limit still applies)
+        render_processes: Render worker processes; 0 renders in threads (Lambda has no
+            /dev/shm, so process pools aren't available there)
+        upload_concurrency: Concurrent S3 uploads
+        expires_in: Presigned URL lifetime in seconds
+        should_stop: Checked before each new row starts; True leaves the rest for a resumed run
+
+    Returns:
+        Summary with succeeded, failed, remaining and elapsed seconds
+    """
+    start = time.time()
+    summary = {'succeeded': 0, 'failed': 0, 'remaining': 0}
+
+    def finish(job, documents=None, company=None, error=None):
+        entry = {'job_id': job['job_id'], 'row': job['row'], 'company': job['company'], 'success': error is None}
+        if error is None:
+            entry['company_details'] = company
+            entry['signatory'] = {'name': job['signatory_name'], 'title': job['signatory_title']}
+            entry['documents'] = documents
+            summary['succeeded'] += 1
+        else:
+            entry['error'] = error
+            summary['failed'] += 1
+        write_entry(entry)
+
+    templates = {
+        doc_type: contract_generator.get_template(DOCUMENT_TYPES[doc_type]['template_key'])
+        for doc_type in sorted({doc_type for job in jobs for doc_type in job['document_types']
+                                if doc_type in DOCUMENT_TYPES})
+    }
+
+    if render_processes:
+        renderer = ProcessPoolExecutor(max_workers=render_processes, initializer=_init_render_worker,
+                                       initargs=(templates,))
+    else:
+        _init_render_worker(templates)
+        renderer = ThreadPoolExecutor(max_workers=os.cpu_count() or 2)
+
+    # future -> (stage, job state, document type)
+    pending = {}
+
+    with ThreadPoolExecutor(max_workers=resolve_concurrency) as resolver, \
+            ThreadPoolExecutor(max_workers=upload_concurrency) as uploader, renderer:
+
+        queue = iter(jobs)
+
+        def start_next_job():
+            for job in queue:
+                if should_stop and should_stop():
+                    summary['remaining'] += 1 + sum(1 for _ in queue)
+                    return
+                error = validate_job(job)
+                if error:
+                    finish(job, error=error)
+                    continue
+                state = {'job': job, 'documents': {}, 'failed': False}
+                pending[resolver.submit(contract_generator.resolve_company, job['company'])] = ('resolve', state, None)
+                return
+
+        # Keep the resolver busy; each completed lookup pulls in the next row
+        for _ in range(resolve_concurrency * 2):
+            start_next_job()
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                stage, state, doc_type = pending.pop(future)
+                job = state['job']
+
+                try:
+                    result = future.result()
+                except Exception as e:
+                    if not state['failed']:
+                        state['failed'] = True
+                        print(f"Row {job['row']} ({job['company']}) failed at {stage}: {e}")
+                        finish(job, error=f"{stage}: {e}")
+                    if stage == 'resolve':
+                        start_next_job()
+                    continue
+
+                if state['failed']:
+                    continue
+
+                if stage == 'resolve':
+                    state['company'] = result
+                    state['context'] = build_render_context(result, job['signatory_name'], job['signatory_title'])
+                    for doc_type in job['document_types']:
+                        pending[renderer.submit(_render_in_worker, doc_type, state['context'])] = \
+                            ('render', state, doc_type)
+                    start_next_job()
+
+                elif stage == 'render':
+                    pending[uploader.submit(
+                        contract_generator.save_document, doc_type, state['company'], state['context'], result,
+                        f"_{job['job_id'][:8]}", expires_in
+                    )] = ('upload', state, doc_type)
+
+                else:
+                    state['documents'][doc_type] = {
+                        'type': doc_type,
+                        's3_key': result['s3_key'],
+                        'download_url': result['download_url'],
+                    }
+                    if len(state['documents']) == len(job['document_types']):
+                        documents = [state['documents'][t] for t in job['document_types']]
+                        finish(job, documents=documents, company=result['company_details'])
+
+    summary['elapsed'] = round(time.time() - start, 1)
+    return summary
+
+
+def _init_render_worker(templates: Dict[str, bytes]) -> None:
+    """Give a render worker the template bytes once, instead of with every task"""
+    _worker_templates.update(templates)
+
+
+def _render_in_worker(doc_type: str, context: Dict) -> bytes:
+    """Render one document in a worker from its preloaded template"""
+    return render_document(doc_type, _worker_templates[doc_type], context)
+
+
+def handle_bulk_request(event: Dict, context=None) -> Dict:
+    """
+    Run a bulk job from a direct Lambda invocation
+
+    Expected event:
+    {
+        "action": "generateBulk",
+        "input_key": "bulk-input/event-attendees.csv",   (or "jobs": [{...}, ...])
+        "document_types": ["nda"],                        (default for rows without their own)
+        "manifest_key": "generated-bulk/event-attendees/manifest.jsonl"   (optional)
+    }
+
+    The manifest in S3 is read first and its completed rows skipped, and it
+    is saved every MANIFEST_FLUSH_ROWS rows or MANIFEST_FLUSH_SECONDS during
+    the run. If the Lambda is about to time out, the run stops early with
+    complete: false; invoke again with the same event to carry on.
+
+    The execution role's credentials are temporary, so the manifest and
+    document URLs last TEMPORARY_CREDENTIALS_URL_EXPIRY_SECONDS (see
+    url_expires_in); after that, presign manifest_key (and each document's
+    s3_key) again.
+
+    Returns:
+        Summary with manifest_key, manifest_url, url_expires_in, succeeded, failed,
+        remaining and complete
+    """
+    bucket = contract_generator.KNOWLEDGE_BASE_BUCKET
+    s3 = contract_generator.s3
+    default_types = parse_document_types(event.get('document_types') or ['nda'])
+    expires_in = url_expiry(BULK_URL_EXPIRY_SECONDS, bool(os.environ.get('AWS_SESSION_TOKEN')))
+
+    try:
+        if event.get('jobs'):
+            lines = [json.dumps(job) for job in event['jobs']]
+            default_name = datetime.utcnow().strftime('%Y%m%d-%H%M%S')
+        elif event.get('input_key'):
+            body = s3.get_object(Bucket=bucket, Key=event['input_key'])['Body'].read().decode('utf-8-sig')
+            lines = body.splitlines(keepends=True)
+            default_name = os.path.splitext(os.path.basename(event['input_key']))[0]
+        else:
+            return {'success': False, 'error': 'input_key or jobs is required'}
+
+        jobs = read_jobs(lines, default_types)
+        manifest_key = event.get('manifest_key') or f"{BULK_OUTPUT_PREFIX}{default_name}/manifest.jsonl"
+
+        manifest_lines = []
+        try:
+            existing = s3.get_object(Bucket=bucket, Key=manifest_key)['Body'].read().decode('utf-8')
+            manifest_lines = [line for line in existing.splitlines() if line.strip()]
+        except s3.exceptions.NoSuchKey:
+            pass
+
+        done = completed_job_ids(manifest_lines)
+        # Failed rows are retried, so drop their old entries
+        manifest_lines = [line for line in manifest_lines
+                          if (parse_manifest_line(line) or {}).get('job_id') in done]
+        todo = [job for job in jobs if job['job_id'] not in done]
+        print(f"Bulk job: {len(jobs)} rows, {len(jobs) - len(todo)} already done")
+
+        should_stop = None
+        if context is not None:
+            should_stop = lambda: context.get_remaining_time_in_millis() < LAMBDA_TIME_MARGIN_MS
+
+        flushed = {'rows': len(manifest_lines), 'at': time.time()}
+
+        def save_manifest():
+            s3.put_object(
+                Bucket=bucket,
+                Key=manifest_key,
+                Body=('\n'.join(manifest_lines) + '\n').encode('utf-8'),
+                ContentType='application/x-ndjson',
+                ServerSideEncryption='aws:kms'  # Required by bucket policy
+            )
+            flushed.update(rows=len(manifest_lines), at=time.time())
+
+        def write_entry(entry):
+            manifest_lines.append(json.dumps(entry))
+            if (len(manifest_lines) - flushed['rows'] >= MANIFEST_FLUSH_ROWS
+                    or time.time() - flushed['at'] >= MANIFEST_FLUSH_SECONDS):
+                save_manifest()
+
+        try:
+            summary = run_bulk(todo, write_entry, expires_in=expires_in, should_stop=should_stop)
+        finally:
+            save_manifest()
+
+        manifest_url = s3.generate_presigned_url(
+            'get_object',
+            Params={'Bucket': bucket, 'Key': manifest_key},
+            ExpiresIn=expires_in
+        )
+
+        return {
+            'success': True,
+            'manifest_key': manifest_key,
+            'manifest_url': manifest_url,
+            'url_expires_in': expires_in,
+            'total': len(jobs),
+            'already_done': len(jobs) - len(todo),
+            **summary,
+            'complete': summary['remaining'] == 0,
+        }
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return {'success': False, 'error': str(e)}
@@ -3,9 +3,32 @@ Companies House API Integration
 Fetches company information from the UK Companies House API
 """
 
-import requests
-from typing import Dict, Optional
+import os
+import random
 import re
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Explicit timeouts so a slow response can't hang a Lambda until its own timeout
+CONNECT_TIMEOUT_SECONDS = float(os.environ.get('COMPANIES_HOUSE_CONNECT_TIMEOUT', '3.05'))
+READ_TIMEOUT_SECONDS = float(os.environ.get('COMPANIES_HOUSE_READ_TIMEOUT', '10'))
+
+# Companies House allows 600 requests per 5 minutes per API key
+RATE_LIMIT_REQUESTS = 600
+RATE_LIMIT_WINDOW_SECONDS = 300
+
+# Retries on 429/5xx and connection errors, with full-jitter exponential backoff
+MAX_RETRIES = 3
+RETRY_BASE_DELAY_SECONDS = 0.5
+RETRY_MAX_DELAY_SECONDS = 8
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Upper bound on total time spent on one request, including retries and rate-limit waits
+REQUEST_DEADLINE_SECONDS = float(os.environ.get('COMPANIES_HOUSE_REQUEST_DEADLINE', '20'))
 
 
 # Company number prefix mappings
@@ -59,6 +82,185 @@ JURISDICTION_PREFIXES = {
 }
 
 
+# Legal-form suffixes ignored when comparing company names (longest first)
+COMPANY_NAME_SUFFIXES = [
+    'public limited company',
+    'limited liability partnership',
+    'community interest company',
+    'cyfyngedig',
+    'unlimited',
+    'limited',
+    'ltd',
+    'plc',
+    'llp',
+    'cic',
+    'cyf',
+    'ccc',
+    'lp',
+]
+
+
+class CompanyNotFoundError(ValueError):
+    """Companies House has no company with this number (a 404), as opposed to a failed lookup"""
+
+
+class CompanyMatchError(ValueError):
+    """A name search found candidates, but none matches clearly enough to use"""
+
+
+def normalize_company_name(name: str) -> str:
+    """
+    Normalise a company name for matching
+
+    Lowercases, treats '&' as 'and', drops punctuation and strips legal-form
+    suffixes, so 'ACME (UK) Ltd.' and 'Acme UK Limited' both become 'acme uk'.
+    """
+    name = name.lower().replace('&', ' and ').replace('.', '')
+    words = re.sub(r'[^a-z0-9]+', ' ', name).split()
+
+    stripped = True
+    while stripped and len(words) > 1:
+        stripped = False
+        for suffix in COMPANY_NAME_SUFFIXES:
+            suffix_words = suffix.split()
+            if len(words) > len(suffix_words) and words[-len(suffix_words):] == suffix_words:
+                words = words[:-len(suffix_words)]
+                stripped = True
+                break
+
+    return ' '.join(words)
+
+
+def format_address(address_data: Dict) -> str:
+    """Format address from Companies House data into single string"""
+    parts = []
+
+    # Add address line components
+    for key in ['address_line_1', 'address_line_2', 'care_of', 'po_box']:
+        if address_data.get(key):
+            parts.append(address_data[key])
+
+    # Add locality/town
+    if address_data.get('locality'):
+        parts.append(address_data['locality'])
+
+    # Add region
+    if address_data.get('region'):
+        parts.append(address_data['region'])
+
+    # Add postal code
+    if address_data.get('postal_code'):
+        parts.append(address_data['postal_code'])
+
+    # Add country
+    if address_data.get('country'):
+        parts.append(address_data['country'])
+
+    return ', '.join(parts)
+
+
+def infer_company_type(company_number: str) -> str:
+    """Infer company type from company number prefix"""
+    return COMPANY_TYPE_PREFIXES.get(extract_prefix(company_number), 'Private Limited Company')
+
+
+def infer_jurisdiction(company_number: str) -> str:
+    """Infer jurisdiction from company number prefix"""
+    return JURISDICTION_PREFIXES.get(extract_prefix(company_number), 'England and Wales')
+
+
+def extract_prefix(company_number: str) -> str:
+    """Extract alphabetic prefix from company number"""
+    match = re.match(r'^([A-Z]+)', company_number)
+    return match.group(1) if match else ''
+
+
+class RateLimiter:
+    """
+    Token bucket for the Companies House rate limit
+
+    Refills continuously at RATE_LIMIT_REQUESTS per RATE_LIMIT_WINDOW_SECONDS
+    and is corrected from the X-Ratelimit-* response headers, which reflect
+    usage of the API key across every caller, not just this process.
+    """
+
+    def __init__(self, capacity: int = RATE_LIMIT_REQUESTS, window_seconds: float = RATE_LIMIT_WINDOW_SECONDS):
+        self.capacity = capacity
+        self.refill_rate = capacity / window_seconds
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline: Optional[float] = None) -> None:
+        """Wait for a request slot; raises TimeoutError if it would pass the deadline"""
+        while True:
+            wait = self.try_acquire()
+            if wait == 0:
+                return
+
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise TimeoutError(f"Companies House rate limit: next slot in {wait:.1f}s")
+            time.sleep(wait)
+
+    def try_acquire(self) -> float:
+        """Take a slot if one is free and return 0, otherwise return the seconds to wait"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            wait = max(self.blocked_until - now, 0.0)
+            if wait > 0:
+                return wait
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.refill_rate
+
+    def update_from_headers(self, headers) -> None:
+        """Sync with X-Ratelimit-Remain / X-Ratelimit-Reset (epoch seconds)"""
+        remain = headers.get('X-Ratelimit-Remain')
+        reset = headers.get('X-Ratelimit-Reset')
+        if remain is None:
+            return
+
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, float(remain))
+            if int(remain) <= 0 and reset:
+                self.block_for(float(reset) - time.time())
+
+    def block_for(self, seconds: float) -> None:
+        """Stop handing out slots for a while (e.g. after a 429)"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + max(seconds, 0.0))
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+        self.updated_at = now
+
+
+_shared_session = None
+_rate_limiter = RateLimiter()
+_clients: Dict[Optional[str], 'CompaniesHouseClient'] = {}
+
+
+def get_session() -> requests.Session:
+    """Module-level session with pooled keep-alive connections, shared by all clients"""
+    global _shared_session
+    if _shared_session is None:
+        _shared_session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        _shared_session.mount('https://', adapter)
+    return _shared_session
+
+
+def get_client(api_key: Optional[str] = None) -> 'CompaniesHouseClient':
+    """Shared client per API key, reused across warm Lambda invocations"""
+    if api_key not in _clients:
+        _clients[api_key] = CompaniesHouseClient(api_key)
+    return _clients[api_key]
+
+
 class CompaniesHouseClient:
     """Client for Companies House API"""
 
@@ -72,10 +274,61 @@ class CompaniesHouseClient:
             api_key: Companies House API key (optional, free tier available)
         """
         self.api_key = api_key
-        self.session = requests.Session()
-        if api_key:
-            # API key is used as basic auth username with no password
-            self.session.auth = (api_key, '')
+        self.session = get_session()
+        self.rate_limiter = _rate_limiter
+        # API key is used as basic auth username with no password
+        self.auth = (api_key, '') if api_key else None
+
+    def request(self, path: str, params: Optional[Dict] = None) -> requests.Response:
+        """
+        GET an API path under the rate limit, with timeouts and jittered retries
+
+        Retries 429/5xx responses and connection errors/timeouts; other
+        responses (including 404) are returned for the caller to handle.
+        """
+        url = f"{self.BASE_URL}{path}"
+        deadline = time.monotonic() + REQUEST_DEADLINE_SECONDS
+        attempt = 0
+
+        while True:
+            self.rate_limiter.acquire(deadline)
+
+            try:
+                response = self.session.get(
+                    url,
+                    params=params,
+                    auth=self.auth,
+                    timeout=(CONNECT_TIMEOUT_SECONDS, READ_TIMEOUT_SECONDS)
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= MAX_RETRIES:
+                    raise
+                delay = self._backoff(attempt)
+                print(f"Companies House request failed ({e}); retrying in {delay:.1f}s")
+            else:
+                self.rate_limiter.update_from_headers(response.headers)
+
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= MAX_RETRIES:
+                    return response
+
+                delay = self._backoff(attempt)
+                if response.status_code == 429:
+                    retry_after = response.headers.get('Retry-After')
+                    if retry_after and retry_after.isdigit():
+                        delay = max(delay, float(retry_after))
+                    self.rate_limiter.block_for(delay)
+                print(f"Companies House returned {response.status_code}; retrying in {delay:.1f}s")
+
+            if time.monotonic() + delay > deadline:
+                raise TimeoutError(f"Companies House request to {path} exceeded {REQUEST_DEADLINE_SECONDS}s")
+
+            time.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """Full-jitter exponential backoff"""
+        return random.uniform(0, min(RETRY_MAX_DELAY_SECONDS, RETRY_BASE_DELAY_SECONDS * 2 ** attempt))
 
     def get_company_details(self, company_number: str) -> Dict:
         """
@@ -88,17 +341,15 @@ class CompaniesHouseClient:
             Dictionary with company details
 
         Raises:
-            Exception if company not found or API error
+            CompanyNotFoundError if company not found, Exception on API error
         """
         # Clean company number (remove spaces and convert to uppercase)
         company_number = company_number.replace(' ', '').upper()
 
-        url = f"{self.BASE_URL}/company/{company_number}"
-
-        response = self.session.get(url)
+        response = self.request(f"/company/{company_number}")
 
         if response.status_code == 404:
-            raise ValueError(f"Company number {company_number} not found")
+            raise CompanyNotFoundError(f"Company number {company_number} not found")
         elif response.status_code != 200:
             raise Exception(f"Companies House API error: {response.status_code} - {response.text}")
 
@@ -138,45 +389,19 @@ class CompaniesHouseClient:
 
     def _format_address(self, address_data: Dict) -> str:
         """Format address from Companies House data into single string"""
-        parts = []
-
-        # Add address line components
-        for key in ['address_line_1', 'address_line_2', 'care_of', 'po_box']:
-            if address_data.get(key):
-                parts.append(address_data[key])
-
-        # Add locality/town
-        if address_data.get('locality'):
-            parts.append(address_data['locality'])
-
-        # Add region
-        if address_data.get('region'):
-            parts.append(address_data['region'])
-
-        # Add postal code
-        if address_data.get('postal_code'):
-            parts.append(address_data['postal_code'])
-
-        # Add country
-        if address_data.get('country'):
-            parts.append(address_data['country'])
-
-        return ', '.join(parts)
+        return format_address(address_data)
 
     def _infer_company_type(self, company_number: str) -> str:
         """Infer company type from company number prefix"""
-        prefix = self._extract_prefix(company_number)
-        return COMPANY_TYPE_PREFIXES.get(prefix, 'Private Limited Company')
+        return infer_company_type(company_number)
 
     def _infer_jurisdiction(self, company_number: str) -> str:
         """Infer jurisdiction from company number prefix"""
-        prefix = self._extract_prefix(company_number)
-        return JURISDICTION_PREFIXES.get(prefix, 'England and Wales')
+        return infer_jurisdiction(company_number)
 
     def _extract_prefix(self, company_number: str) -> str:
         """Extract alphabetic prefix from company number"""
-        match = re.match(r'^([A-Z]+)', company_number)
-        return match.group(1) if match else ''
+        return extract_prefix(company_number)
 
 
 def search_company_by_name(company_name: str, api_key: Optional[str] = None) -> list:
@@ -190,10 +415,9 @@ def search_company_by_name(company_name: str, api_key: Optional[str] = None) ->
     Returns:
         List of matching companies with basic details
     """
-    client = CompaniesHouseClient(api_key)
-    url = f"{client.BASE_URL}/search/companies"
+    client = get_client(api_key)
 
-    response = client.session.get(url, params={'q': company_name})
+    response = client.request("/search/companies", params={'q': company_name})
 
     if response.status_code != 200:
         raise Exception(f"Companies House search error: {response.status_code}")
@@ -0,0 +1,159 @@
+"""
+Async Companies House API Client
+asyncio-based client for bulk company enrichment: looks up many company
+numbers concurrently under the API rate limit, producing the same parsed
+output as CompaniesHouseClient
+"""
+
+import asyncio
+from typing import AsyncIterator, Dict, Iterable, Optional
+
+from companies_house import (
+    CONNECT_TIMEOUT_SECONDS,
+    MAX_RETRIES,
+    READ_TIMEOUT_SECONDS,
+    RETRY_STATUS_CODES,
+    CompaniesHouseClient,
+    CompanyNotFoundError,
+    RateLimiter,
+)
+
+try:
+    import aiohttp
+except ImportError:
+    print("Warning: aiohttp not installed. Install with: pip install aiohttp")
+
+DEFAULT_CONCURRENCY = 10
+
+
+class AsyncCompaniesHouseClient:
+    """
+    Async client for Companies House API
+
+    Usage:
+        async with AsyncCompaniesHouseClient(api_key) as client:
+            details = await client.get_company_details('01234567')
+            async for result in client.get_many(numbers):
+                ...
+    """
+
+    BASE_URL = CompaniesHouseClient.BASE_URL
+
+    def __init__(self, api_key: Optional[str] = None, concurrency: int = DEFAULT_CONCURRENCY,
+                 rate_limiter: Optional[RateLimiter] = None):
+        """
+        Args:
+            api_key: Companies House API key
+            concurrency: Maximum requests in flight
+            rate_limiter: Token bucket shared with other clients (a new one by default)
+        """
+        self.api_key = api_key
+        self.concurrency = concurrency
+        self.rate_limiter = rate_limiter or RateLimiter()
+        # Reuse the sync client's parsing so output is identical
+        self._parser = CompaniesHouseClient(api_key)
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._session = None
+
+    async def __aenter__(self):
+        self._session = aiohttp.ClientSession(
+            auth=aiohttp.BasicAuth(self.api_key, '') if self.api_key else None,
+            timeout=aiohttp.ClientTimeout(connect=CONNECT_TIMEOUT_SECONDS, sock_read=READ_TIMEOUT_SECONDS),
+            connector=aiohttp.TCPConnector(limit=self.concurrency)
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._session.close()
+
+    async def get_company_details(self, company_number: str) -> Dict:
+        """
+        Fetch company details from Companies House
+
+        Args:
+            company_number: UK company registration number
+
+        Returns:
+            Dictionary with company details, as CompaniesHouseClient.get_company_details
+
+        Raises:
+            CompanyNotFoundError if company not found, Exception on API error
+        """
+        # Clean company number (remove spaces and convert to uppercase)
+        company_number = company_number.replace(' ', '').upper()
+
+        status, data = await self._get(f"/company/{company_number}")
+
+        if status == 404:
+            raise CompanyNotFoundError(f"Company number {company_number} not found")
+        elif status != 200:
+            raise Exception(f"Companies House API error: {status}")
+
+        return self._parser._parse_company_data(data)
+
+    async def get_many(self, company_numbers: Iterable[str]) -> AsyncIterator[Dict]:
+        """
+        Look up many companies with bounded concurrency, yielding results as they complete
+
+        Company numbers are consumed lazily, so very large inputs are not held
+        in memory. Each result is {'company_number', 'success', 'company'} or
+        {'company_number', 'success': False, 'error'}; failures don't stop the run.
+        """
+        numbers = iter(company_numbers)
+        results = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        async def worker():
+            for company_number in numbers:
+                try:
+                    company = await self.get_company_details(company_number)
+                    await results.put({'company_number': company_number, 'success': True, 'company': company})
+                except Exception as e:
+                    await results.put({'company_number': company_number, 'success': False, 'error': str(e)})
+            await results.put(None)
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        finished = 0
+
+        try:
+            while finished < len(workers):
+                result = await results.get()
+                if result is None:
+                    finished += 1
+                else:
+                    yield result
+        finally:
+            for task in workers:
+                task.cancel()
+
+    async def _get(self, path: str):
+        """GET an API path under the rate limit, retrying 429/5xx with jittered backoff"""
+        url = f"{self.BASE_URL}{path}"
+
+        for attempt in range(MAX_RETRIES + 1):
+            while True:
+                wait = self.rate_limiter.try_acquire()
+                if wait == 0:
+                    break
+                await asyncio.sleep(wait)
+
+            try:
+                async with self._semaphore, self._session.get(url) as response:
+                    self.rate_limiter.update_from_headers(response.headers)
+                    status = response.status
+                    retry_after = response.headers.get('Retry-After')
+                    data = await response.json(content_type=None) if status == 200 else None
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt >= MAX_RETRIES:
+                    raise
+                await asyncio.sleep(CompaniesHouseClient._backoff(attempt))
+                continue
+
+            if status not in RETRY_STATUS_CODES or attempt >= MAX_RETRIES:
+                return status, data
+
+            delay = CompaniesHouseClient._backoff(attempt)
+            if status == 429:
+                if retry_after and retry_after.isdigit():
+                    delay = max(delay, float(retry_after))
+                self.rate_limiter.block_for(delay)
+            await asyncio.sleep(delay)
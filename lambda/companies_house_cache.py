@@ -0,0 +1,297 @@
+"""
+Companies House Response Cache
+Caches company details and name searches so repeat lookups during a deal cycle
+don't hit the live API. In-memory LRU backed by an optional persistent store
+(SQLite in /tmp or JSON objects in S3), with TTLs, negative caching for unknown
+company numbers and stale-while-revalidate.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, Optional
+
+from companies_house import CompanyNotFoundError, get_client, search_company_by_name
+
+# Fresh lifetime of cached entries, in seconds
+COMPANY_TTL_SECONDS = int(os.environ.get('COMPANIES_HOUSE_CACHE_TTL_SECONDS', '86400'))
+SEARCH_TTL_SECONDS = int(os.environ.get('COMPANIES_HOUSE_SEARCH_TTL_SECONDS', '3600'))
+NEGATIVE_TTL_SECONDS = int(os.environ.get('COMPANIES_HOUSE_NEGATIVE_TTL_SECONDS', '3600'))
+
+# How long past expiry an entry may still be served (while revalidating, or when the API fails)
+STALE_TTL_SECONDS = int(os.environ.get('COMPANIES_HOUSE_STALE_TTL_SECONDS', str(7 * 86400)))
+
+# Serve stale data instead of waiting longer than this for the API
+STALE_IF_SLOW_SECONDS = float(os.environ.get('COMPANIES_HOUSE_STALE_IF_SLOW_SECONDS', '2'))
+
+# Persistent store: '' (memory only), 'sqlite' or 's3'
+CACHE_STORE = os.environ.get('COMPANIES_HOUSE_CACHE_STORE', '')
+CACHE_SQLITE_PATH = os.environ.get('COMPANIES_HOUSE_CACHE_PATH', '/tmp/companies_house_cache.sqlite')
+CACHE_S3_PREFIX = 'cache/companies-house/'
+
+MEMORY_CACHE_SIZE = 1024
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU cache of entries"""
+
+    def __init__(self, max_size: int = MEMORY_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: Dict) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+class SQLiteCacheStore:
+    """Persistent cache in a local SQLite file; survives warm Lambda invocations via /tmp"""
+
+    def __init__(self, path: str = CACHE_SQLITE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, entry TEXT NOT NULL)'
+        )
+        self._connection.commit()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._connection.execute('SELECT entry FROM entries WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, entry: Dict) -> None:
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO entries (key, entry) VALUES (?, ?)', (key, json.dumps(entry))
+            )
+            self._connection.commit()
+
+
+class S3CacheStore:
+    """Persistent cache as one JSON object per key in S3, shared by all Lambda containers"""
+
+    def __init__(self, bucket: str, prefix: str = CACHE_S3_PREFIX, s3_client=None):
+        import boto3
+
+        self.bucket = bucket
+        self.prefix = prefix
+        self.s3 = s3_client or boto3.client('s3')
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}{re.sub(r'[^a-zA-Z0-9:_-]', '_', key)}.json"
+
+    def get(self, key: str) -> Optional[Dict]:
+        try:
+            response = self.s3.get_object(Bucket=self.bucket, Key=self._object_key(key))
+            return json.loads(response['Body'].read())
+        except self.s3.exceptions.NoSuchKey:
+            return None
+
+    def set(self, key: str, entry: Dict) -> None:
+        self.s3.put_object(
+            Bucket=self.bucket,
+            Key=self._object_key(key),
+            Body=json.dumps(entry),
+            ContentType='application/json',
+            ServerSideEncryption='aws:kms'  # Required by bucket policy
+        )
+
+
+class CachedCompaniesHouseClient:
+    """
+    Companies House client with a read-through cache
+
+    Exposes the same lookups as CompaniesHouseClient/search_company_by_name.
+    Entries are fresh for their TTL; after that they are still served for up
+    to STALE_TTL_SECONDS while a background refresh runs. If the API fails or
+    is slower than STALE_IF_SLOW_SECONDS, a copy within that window is served
+    instead. Older entries are never served: the lookup waits for the API and
+    raises if it fails.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, store=None, memory: Optional[LRUCache] = None,
+                 client=None):
+        """
+        Args:
+            api_key: Companies House API key (optional)
+            store: Optional persistent store with get(key)/set(key, entry)
+            memory: In-memory cache (a new LRU by default)
+            client: Source of company details on a miss (the shared API client by default)
+        """
+        self.api_key = api_key
+        self.client = client or get_client(api_key)
+        self.store = store
+        self.memory = memory or LRUCache()
+        self._executor = ThreadPoolExecutor(max_workers=4)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'negative_hits': 0}
+
+    def get_company_details(self, company_number: str) -> Dict:
+        """Company details by number; raises CompanyNotFoundError for unknown numbers (cached)"""
+        number = normalize_company_number(company_number)
+        return self._cached(
+            f'company:{number}',
+            lambda: self.client.get_company_details(number),
+            COMPANY_TTL_SECONDS
+        )
+
+    def search_company_by_name(self, company_name: str) -> list:
+        """Name search results, cached by normalised query"""
+        query = normalize_query(company_name)
+        return self._cached(
+            f'search:{query}',
+            lambda: search_company_by_name(company_name, self.api_key),
+            SEARCH_TTL_SECONDS
+        )
+
+    def _cached(self, key: str, fetch: Callable, ttl: int):
+        entry = self._load(key)
+        now = time.time()
+        within_stale = False
+
+        if entry is not None:
+            age = now - entry['stored_at']
+            fresh_for = NEGATIVE_TTL_SECONDS if entry.get('negative') else ttl
+            within_stale = age < fresh_for + STALE_TTL_SECONDS
+
+            if age < fresh_for:
+                self.stats['negative_hits' if entry.get('negative') else 'hits'] += 1
+                return self._unwrap(entry)
+
+            if within_stale and not entry.get('negative'):
+                # Stale-while-revalidate: answer now, refresh in the background
+                print(f"Serving stale Companies House data for {key} ({int(age)}s old)")
+                self.stats['stale_hits'] += 1
+                self._refresh_in_background(key, fetch)
+                return self._unwrap(entry)
+
+        self.stats['misses'] += 1
+        future = self._executor.submit(self._fetch_and_store, key, fetch)
+
+        # Only an entry still inside the stale window may stand in for the API
+        fallback = entry if within_stale and not entry.get('negative') else None
+
+        try:
+            # Only bound the wait when there is something to fall back on
+            timeout = STALE_IF_SLOW_SECONDS if fallback is not None else None
+            return self._unwrap(future.result(timeout=timeout))
+        except FutureTimeoutError:
+            print(f"Companies House slow for {key}; serving stale data")
+            return self._unwrap(fallback)
+        except CompanyNotFoundError:
+            raise
+        except Exception as e:
+            if fallback is not None:
+                print(f"Companies House error for {key} ({e}); serving stale data")
+                return self._unwrap(fallback)
+            raise
+
+    def _fetch_and_store(self, key: str, fetch: Callable) -> Dict:
+        """
+        Call the API and cache the outcome; 404s are cached as negative entries
+
+        Any other error (including an unparseable response) is raised without
+        touching the cache, so a stale copy can still be served.
+        """
+        try:
+            entry = {'value': fetch(), 'stored_at': time.time()}
+        except CompanyNotFoundError as e:
+            entry = {'negative': True, 'error': str(e), 'stored_at': time.time()}
+
+        self._save(key, entry)
+        return entry
+
+    def _refresh_in_background(self, key: str, fetch: Callable) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._fetch_and_store(key, fetch)
+            except Exception as e:
+                print(f"Background refresh failed for {key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._executor.submit(refresh)
+
+    def _load(self, key: str) -> Optional[Dict]:
+        entry = self.memory.get(key)
+        if entry is None and self.store is not None:
+            try:
+                entry = self.store.get(key)
+            except Exception as e:
+                print(f"Cache store read failed for {key}: {e}")
+            if entry is not None:
+                self.memory.set(key, entry)
+        return entry
+
+    def _save(self, key: str, entry: Dict) -> None:
+        self.memory.set(key, entry)
+        if self.store is not None:
+            try:
+                self.store.set(key, entry)
+            except Exception as e:
+                print(f"Cache store write failed for {key}: {e}")
+
+    @staticmethod
+    def _unwrap(entry: Dict):
+        if entry.get('negative'):
+            raise CompanyNotFoundError(entry['error'])
+        return entry['value']
+
+
+def normalize_company_number(company_number: str) -> str:
+    """Uppercase, strip spaces and zero-pad to the 8-character Companies House format"""
+    number = company_number.replace(' ', '').upper()
+    match = re.match(r'^([A-Z]*)(\d+)$', number)
+    if match and len(number) < 8:
+        prefix, digits = match.groups()
+        number = prefix + digits.zfill(8 - len(prefix))
+    return number
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive search key"""
+    return ' '.join(query.lower().split())
+
+
+def create_cache_store(bucket: Optional[str] = None):
+    """Persistent store configured by COMPANIES_HOUSE_CACHE_STORE, or None"""
+    if CACHE_STORE == 'sqlite':
+        return SQLiteCacheStore(CACHE_SQLITE_PATH)
+    if CACHE_STORE == 's3' and bucket:
+        return S3CacheStore(bucket)
+    return None
+
+
+_cached_clients: Dict[Optional[str], CachedCompaniesHouseClient] = {}
+
+
+def get_cached_client(api_key: Optional[str] = None, bucket: Optional[str] = None) -> CachedCompaniesHouseClient:
+    """Module-level cached client, shared across warm Lambda invocations"""
+    if api_key not in _cached_clients:
+        _cached_clients[api_key] = CachedCompaniesHouseClient(api_key, store=create_cache_store(bucket))
+    return _cached_clients[api_key]
@@ -4,8 +4,9 @@ Scrapes company information from the public Companies House website
 NO API KEY REQUIRED - uses public data
 """
 
+import os
 import re
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from urllib.parse import quote
 
 try:
@@ -14,56 +15,33 @@ try:
 except ImportError:
     print("Warning: requests or beautifulsoup4 not installed")
 
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+# Prefix tables and inference are shared with the API client
+from companies_house import (
+    COMPANY_TYPE_PREFIXES,
+    CONNECT_TIMEOUT_SECONDS,
+    JURISDICTION_PREFIXES,
+    READ_TIMEOUT_SECONDS,
+    CompanyNotFoundError,
+    extract_prefix,
+    infer_company_type,
+    infer_jurisdiction,
+)
 
-# Company number prefix mappings (same as before)
-COMPANY_TYPE_PREFIXES = {
-    # England and Wales
-    '': 'Private Limited Company',
-    'OC': 'Limited Liability Partnership',
-    'LP': 'Limited Partnership',
-    'FC': 'Overseas Company',
-    'AC': 'Assurance Company',
-    'RC': 'Royal Charter Company',
-    'CE': 'Charitable Incorporated Organisation',
-    'ZC': 'Unregistered Company',
-
-    # Scotland
-    'SC': 'Private Limited Company',
-    'SO': 'Limited Liability Partnership',
-    'SL': 'Limited Partnership',
-    'SF': 'Overseas Company',
-    'SA': 'Assurance Company',
-    'SR': 'Royal Charter Company',
-    'CS': 'Scottish Charitable Incorporated Organisation',
-    'SZ': 'Unregistered Company',
-
-    # Northern Ireland
-    'NI': 'Private Limited Company',
-    'NC': 'Limited Liability Partnership',
-    'NO': 'Limited Liability Partnership',
-    'NL': 'Limited Partnership',
-    'NR': 'Royal Charter Company',
-
-    # UK Establishment
-    'BR': 'UK Establishment',
-}
-
-JURISDICTION_PREFIXES = {
-    'SC': 'Scotland',
-    'SO': 'Scotland',
-    'SL': 'Scotland',
-    'SF': 'Scotland',
-    'SA': 'Scotland',
-    'SR': 'Scotland',
-    'CS': 'Scotland',
-    'SZ': 'Scotland',
-
-    'NI': 'Northern Ireland',
-    'NC': 'Northern Ireland',
-    'NO': 'Northern Ireland',
-    'NL': 'Northern Ireland',
-    'NR': 'Northern Ireland',
-}
+# 'lxml' extracts everything in one pass over an lxml tree; 'html.parser' is the
+# original BeautifulSoup path (also used when lxml is not installed)
+PAGE_PARSER = os.environ.get('COMPANIES_HOUSE_PAGE_PARSER', 'lxml')
+
+# Elements whose content BeautifulSoup doesn't treat as page text
+NON_TEXT_ELEMENTS = {'script', 'style', 'template'}
+
+ADDRESS_FALLBACK_PATTERN = re.compile(
+    r'Registered office address\s*([A-Z0-9].*?)(?:Company status|Date of|Accounts)', re.DOTALL
+)
 
 
 class CompaniesHouseScraper:
@@ -71,8 +49,14 @@ class CompaniesHouseScraper:
 
     BASE_URL = "https://find-and-update.company-information.service.gov.uk"
 
-    def __init__(self):
-        """Initialize scraper"""
+    def __init__(self, company_index=None):
+        """
+        Initialize scraper
+
+        Args:
+            company_index: Optional CompanyIndex; fresh snapshot records are returned without scraping
+        """
+        self.company_index = company_index
         self.session = requests.Session()
         # Set user agent to look like a browser
         self.session.headers.update({
@@ -95,25 +79,61 @@ class CompaniesHouseScraper:
         # Clean company number
         company_number = company_number.replace(' ', '').upper()
 
+        # Local register snapshot, if one is loaded and recent
+        if self.company_index is not None and self.company_index.is_fresh():
+            company = self.company_index.get(company_number)
+            if company:
+                return company
+
         # Build URL
         url = f"{self.BASE_URL}/company/{company_number}"
 
         print(f"Fetching: {url}")
 
         # Fetch page
-        response = self.session.get(url)
+        response = self.session.get(url, timeout=(CONNECT_TIMEOUT_SECONDS, READ_TIMEOUT_SECONDS))
 
         if response.status_code == 404:
-            raise ValueError(f"Company number {company_number} not found")
+            raise CompanyNotFoundError(f"Company number {company_number} not found")
         elif response.status_code != 200:
             raise Exception(f"Error fetching company page: {response.status_code}")
 
-        # Parse HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
-
         # Extract company data
+        return self.parse_company_page(response.content, company_number)
+
+    def parse_company_page(self, content: bytes, company_number: str) -> Dict:
+        """
+        Parse a company overview page with the configured parser
+
+        Args:
+            content: Page HTML
+            company_number: Company number the page is for
+
+        Returns:
+            Dictionary with company details
+        """
+        if PAGE_PARSER == 'lxml' and etree is not None:
+            return self._build_company_data(extract_company_page(content), company_number)
+
+        soup = BeautifulSoup(content, 'html.parser')
         return self._parse_company_page(soup, company_number)
 
+    def _build_company_data(self, page: Dict, company_number: str) -> Dict:
+        """Company details from fields extracted by extract_company_page"""
+        # Prefer inferred type, fallback to page type
+        company_type_inferred = self._infer_company_type(company_number)
+        company_type = company_type_inferred if company_type_inferred else page['company_type']
+
+        return {
+            'company_number': company_number,
+            'company_name': page['company_name'],
+            'registered_office_address': page['registered_office_address'],
+            'company_type': company_type,
+            'jurisdiction': self._infer_jurisdiction(company_number),
+            'company_status': page['company_status'],
+            'source': 'web_scrape'
+        }
+
     def _parse_company_page(self, soup: BeautifulSoup, company_number: str) -> Dict:
         """Parse company details from HTML page"""
 
@@ -222,18 +242,133 @@ class CompaniesHouseScraper:
 
     def _infer_company_type(self, company_number: str) -> str:
         """Infer company type from company number prefix"""
-        prefix = self._extract_prefix(company_number)
-        return COMPANY_TYPE_PREFIXES.get(prefix, 'Private Limited Company')
+        return infer_company_type(company_number)
 
     def _infer_jurisdiction(self, company_number: str) -> str:
         """Infer jurisdiction from company number prefix"""
-        prefix = self._extract_prefix(company_number)
-        return JURISDICTION_PREFIXES.get(prefix, 'England and Wales')
+        return infer_jurisdiction(company_number)
 
     def _extract_prefix(self, company_number: str) -> str:
         """Extract alphabetic prefix from company number"""
-        match = re.match(r'^([A-Z]+)', company_number)
-        return match.group(1) if match else ''
+        return extract_prefix(company_number)
+
+
+def extract_company_page(content: bytes) -> Dict:
+    """
+    Extract name, address, type and status from a company overview page in one traversal
+
+    Same results as the BeautifulSoup extractors on CompaniesHouseScraper: the
+    walk records the elements those look for (first h1.heading-xlarge, title,
+    first dl, first dl.column-three-quarters, div#registered-office-address)
+    and collects the page text, so the address regex fallback needs no second
+    pass over the document.
+    """
+    found = {}
+    text = []
+
+    def walk(element, in_non_text):
+        tag = element.tag
+        if isinstance(tag, str):
+            if tag == 'h1' and 'heading-xlarge' in _classes(element):
+                found.setdefault('h1', element)
+            elif tag == 'title':
+                found.setdefault('title', element)
+            elif tag == 'dl':
+                found.setdefault('dl', element)
+                if 'column-three-quarters' in _classes(element):
+                    found.setdefault('address_dl', element)
+            elif tag == 'div' and element.get('id') == 'registered-office-address':
+                found.setdefault('address_div', element)
+
+            inner_non_text = in_non_text or tag in NON_TEXT_ELEMENTS
+            if element.text and not inner_non_text:
+                text.append(element.text)
+            for child in element:
+                walk(child, inner_non_text)
+
+        # Comments are skipped, but the text after them is still page text
+        if element.tail and not in_non_text:
+            text.append(element.tail)
+
+    root = etree.HTML(content) if content else None
+    if root is not None:
+        walk(root, False)
+
+    # Company name: h1, falling back to the page title
+    # Title format: "COMPANY NAME - Overview - Find and update company information"
+    company_name = None
+    if 'h1' in found:
+        company_name = _text(found['h1']).strip()
+    if not company_name and 'title' in found:
+        company_name = _text(found['title']).split(' - ')[0].strip()
+
+    return {
+        'company_name': company_name,
+        'registered_office_address': _find_address(found, ''.join(text)),
+        'company_type': _find_definition(found.get('dl'), 'Company type') or "Private Limited Company",
+        'company_status': _find_definition(found.get('dl'), 'Company status') or "Active",
+    }
+
+
+def _find_address(found: Dict, page_text: str) -> str:
+    """Registered office address from the recorded elements, else from the page text"""
+    # Method 1: dt/dd pair in the address dl
+    if 'address_dl' in found:
+        for dt in found['address_dl'].iter('dt'):
+            if 'registered office' in _text(dt).lower():
+                dd = next(dt.itersiblings('dd'), None)
+                if dd is not None:
+                    return ', '.join(_strings(dd))
+
+    # Method 2: address div
+    if 'address_div' in found:
+        return ', '.join(_strings(found['address_div']))
+
+    # Method 3: regex over the page text, starting where the label first appears
+    start = page_text.find('Registered office address')
+    if start >= 0:
+        address_match = ADDRESS_FALLBACK_PATTERN.search(page_text, start)
+        if address_match:
+            return re.sub(r'\s+', ' ', address_match.group(1).strip())
+
+    return "Address not found"
+
+
+def _find_definition(dl, label: str) -> Optional[str]:
+    """Stripped text of the dd following the first dt containing label, or None"""
+    if dl is None:
+        return None
+    for dt in dl.iter('dt'):
+        if label in _text(dt):
+            dd = next(dt.itersiblings('dd'), None)
+            if dd is not None:
+                return _text(dd).strip()
+    return None
+
+
+def _classes(element) -> List[str]:
+    return (element.get('class') or '').split()
+
+
+def _text_pieces(element, include_tail: bool = False):
+    """Text nodes under an element, skipping comments and script/style/template content"""
+    if isinstance(element.tag, str) and element.tag not in NON_TEXT_ELEMENTS:
+        if element.text:
+            yield element.text
+        for child in element:
+            yield from _text_pieces(child, include_tail=True)
+    if include_tail and element.tail:
+        yield element.tail
+
+
+def _text(element) -> str:
+    """Element text, matching BeautifulSoup's .text"""
+    return ''.join(_text_pieces(element))
+
+
+def _strings(element) -> List[str]:
+    """Non-empty stripped text nodes, matching BeautifulSoup's .stripped_strings"""
+    return [piece.strip() for piece in _text_pieces(element) if piece.strip()]
 
 
 # Example usage
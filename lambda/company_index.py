@@ -0,0 +1,344 @@
+"""
+Local Company Register Index
+Builds and queries a compact SQLite index of the Companies House "basic company
+data" bulk snapshot, so company numbers and names resolve locally without an
+API round trip. The live API is only needed on a miss or when the snapshot is
+older than COMPANY_INDEX_MAX_AGE_DAYS.
+"""
+
+import csv
+import io
+import os
+import re
+import sqlite3
+import threading
+import time
+import zipfile
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from companies_house import format_address, infer_company_type, infer_jurisdiction, normalize_company_name
+from companies_house_cache import normalize_company_number
+
+# Where the Lambda finds the index: a local file, or an S3 key in the bucket copied to /tmp
+COMPANY_INDEX_PATH = os.environ.get('COMPANY_INDEX_PATH', '')
+COMPANY_INDEX_KEY = os.environ.get('COMPANY_INDEX_KEY', '')
+COMPANY_INDEX_LOCAL_PATH = '/tmp/company_index.sqlite'
+
+# Snapshots are published monthly; older indexes defer to the live API
+COMPANY_INDEX_MAX_AGE_DAYS = int(os.environ.get('COMPANY_INDEX_MAX_AGE_DAYS', '35'))
+
+DEFAULT_SEARCH_LIMIT = 20
+INSERT_BATCH_SIZE = 10000
+
+# Bulk CSV columns -> format_address keys
+ADDRESS_COLUMNS = {
+    'RegAddress.AddressLine1': 'address_line_1',
+    'RegAddress.AddressLine2': 'address_line_2',
+    'RegAddress.CareOf': 'care_of',
+    'RegAddress.POBox': 'po_box',
+    'RegAddress.PostTown': 'locality',
+    'RegAddress.County': 'region',
+    'RegAddress.PostCode': 'postal_code',
+    'RegAddress.Country': 'country',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS companies (
+    company_number TEXT PRIMARY KEY,
+    company_name TEXT NOT NULL,
+    normalized_name TEXT NOT NULL,
+    company_category TEXT,
+    company_status TEXT,
+    address TEXT,
+    incorporation_date TEXT
+);
+CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+class CompanyIndex:
+    """Read-only lookups against a built company index"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite index file created by build_index
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(f'file:{path}?mode=ro', uri=True, check_same_thread=False)
+
+        metadata = dict(self._connection.execute('SELECT key, value FROM metadata'))
+        self.snapshot_date = metadata.get('snapshot_date', '')
+        self.company_count = int(metadata.get('company_count', '0'))
+        self.has_fuzzy = metadata.get('fuzzy') == '1'
+
+    def is_fresh(self, max_age_days: int = COMPANY_INDEX_MAX_AGE_DAYS) -> bool:
+        """Whether the snapshot is recent enough to answer without the live API"""
+        try:
+            snapshot = datetime.strptime(self.snapshot_date, '%Y-%m-%d').date()
+        except ValueError:
+            return False
+        return (date.today() - snapshot).days <= max_age_days
+
+    def get(self, company_number: str) -> Optional[Dict]:
+        """
+        Company details by number
+
+        Returns:
+            Dictionary shaped like CompaniesHouseClient.get_company_details, or None if not in the snapshot
+        """
+        number = normalize_company_number(company_number)
+
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT company_number, company_name, company_category, company_status, address, '
+                'incorporation_date FROM companies WHERE company_number = ?',
+                (number,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        number, name, category, status, address, incorporated = row
+        return {
+            'company_number': number,
+            'company_name': name,
+            'registered_office_address': address,
+            'company_type': infer_company_type(number),
+            'company_type_api': category,
+            'jurisdiction': infer_jurisdiction(number),
+            'company_status': status,
+            'date_of_creation': incorporated,
+            'source': 'snapshot',
+            'snapshot_date': self.snapshot_date,
+        }
+
+    def search(self, company_name: str, limit: int = DEFAULT_SEARCH_LIMIT) -> List[Dict]:
+        """
+        Search by name: exact normalised matches, then prefix matches, then trigram fuzzy matches
+
+        Returns:
+            List shaped like search_company_by_name results, each with a 'match' of
+            'exact', 'prefix' or 'fuzzy'
+        """
+        query = normalize_company_name(company_name)
+        if not query:
+            return []
+
+        results = []
+        seen = set()
+
+        def add(rows, match):
+            for number, name, category, status, address in rows:
+                if number in seen or len(results) >= limit:
+                    continue
+                seen.add(number)
+                results.append({
+                    'company_number': number,
+                    'company_name': name,
+                    'company_type': category,
+                    'company_status': status,
+                    'address': address,
+                    'match': match,
+                })
+
+        columns = 'company_number, company_name, company_category, company_status, address'
+
+        with self._lock:
+            add(self._connection.execute(
+                f'SELECT {columns} FROM companies WHERE normalized_name = ? LIMIT ?',
+                (query, limit)
+            ), 'exact')
+
+            if len(results) < limit:
+                # Range scan on the normalized_name index
+                add(self._connection.execute(
+                    f'SELECT {columns} FROM companies WHERE normalized_name > ? AND normalized_name < ? '
+                    f'ORDER BY normalized_name LIMIT ?',
+                    (query, query + '\uffff', limit)
+                ), 'prefix')
+
+            fuzzy_query = _trigram_query(query)
+            if len(results) < limit and self.has_fuzzy and fuzzy_query:
+                add(self._connection.execute(
+                    f'SELECT {columns} FROM companies WHERE rowid IN ('
+                    f'SELECT rowid FROM company_names WHERE company_names MATCH ? ORDER BY rank LIMIT ?)',
+                    (fuzzy_query, limit * 5)
+                ), 'fuzzy')
+
+        return results
+
+
+def _trigram_query(normalized_name: str) -> str:
+    """FTS5 query matching any trigram of the name, so near-misses and typos still score"""
+    trigrams = dict.fromkeys(normalized_name[i:i + 3] for i in range(len(normalized_name) - 2))
+    return ' OR '.join(f'"{trigram}"' for trigram in trigrams)
+
+
+def read_snapshot_rows(paths: Iterable[str]) -> Iterator[Dict]:
+    """
+    Yield rows from bulk snapshot files
+
+    Accepts the published zip files or extracted CSVs. Header names are
+    stripped, as the published CSVs pad some of them with a leading space.
+    """
+    for path in paths:
+        if path.lower().endswith('.zip'):
+            with zipfile.ZipFile(path) as archive:
+                for name in archive.namelist():
+                    if name.lower().endswith('.csv'):
+                        with archive.open(name) as raw:
+                            yield from _read_csv(io.TextIOWrapper(raw, encoding='utf-8', newline=''))
+        else:
+            with open(path, encoding='utf-8', newline='') as f:
+                yield from _read_csv(f)
+
+
+def _read_csv(f) -> Iterator[Dict]:
+    reader = csv.reader(f)
+    header = [column.strip() for column in next(reader)]
+    for row in reader:
+        yield dict(zip(header, row))
+
+
+def _index_row(row: Dict) -> Optional[tuple]:
+    """companies table row for a snapshot CSV row"""
+    number = row.get('CompanyNumber', '').strip()
+    name = row.get('CompanyName', '').strip()
+    if not number or not name:
+        return None
+
+    address = format_address({key: row.get(column, '').strip() for column, key in ADDRESS_COLUMNS.items()})
+
+    # Snapshot dates are DD/MM/YYYY; store ISO dates like the API
+    incorporated = row.get('IncorporationDate', '').strip()
+    try:
+        incorporated = datetime.strptime(incorporated, '%d/%m/%Y').strftime('%Y-%m-%d')
+    except ValueError:
+        pass
+
+    return (
+        normalize_company_number(number),
+        name,
+        normalize_company_name(name),
+        row.get('CompanyCategory', '').strip(),
+        row.get('CompanyStatus', '').strip(),
+        address,
+        incorporated,
+    )
+
+
+def build_index(paths: List[str], index_path: str, snapshot_date: Optional[str] = None,
+                fuzzy: bool = True) -> Dict:
+    """
+    Build a company index from bulk snapshot files
+
+    Args:
+        paths: Snapshot zip/CSV files (the single file or the multi-part download)
+        index_path: SQLite file to create (replaced if it exists)
+        snapshot_date: YYYY-MM-DD; taken from the file name when not given
+        fuzzy: Also build the trigram index for fuzzy name search
+
+    Returns:
+        Dictionary with company_count, snapshot_date and elapsed seconds
+    """
+    start = time.time()
+
+    if snapshot_date is None:
+        match = re.search(r'(\d{4}-\d{2}-\d{2})', ' '.join(os.path.basename(path) for path in paths))
+        snapshot_date = match.group(1) if match else date.today().isoformat()
+
+    if os.path.exists(index_path):
+        os.remove(index_path)
+
+    connection = sqlite3.connect(index_path)
+    connection.execute('PRAGMA journal_mode = OFF')
+    connection.execute('PRAGMA synchronous = OFF')
+    connection.executescript(SCHEMA)
+
+    count = 0
+    batch = []
+    for row in read_snapshot_rows(paths):
+        values = _index_row(row)
+        if values is None:
+            continue
+
+        batch.append(values)
+        if len(batch) >= INSERT_BATCH_SIZE:
+            count += _insert(connection, batch)
+            batch = []
+            print(f"  {count} companies indexed...", flush=True)
+
+    count += _insert(connection, batch)
+
+    print("Building name indexes...")
+    connection.execute('CREATE INDEX companies_normalized_name ON companies (normalized_name)')
+
+    if fuzzy:
+        try:
+            connection.execute(
+                "CREATE VIRTUAL TABLE company_names USING fts5("
+                "normalized_name, content='companies', content_rowid='rowid', tokenize='trigram')"
+            )
+            connection.execute("INSERT INTO company_names (company_names) VALUES ('rebuild')")
+        except sqlite3.OperationalError as e:
+            print(f"Warning: SQLite FTS5 trigram tokenizer unavailable ({e}); fuzzy search disabled")
+            fuzzy = False
+
+    connection.executemany('INSERT INTO metadata (key, value) VALUES (?, ?)', [
+        ('snapshot_date', snapshot_date),
+        ('company_count', str(count)),
+        ('fuzzy', '1' if fuzzy else '0'),
+    ])
+    connection.commit()
+    connection.execute('VACUUM')
+    connection.close()
+
+    return {'company_count': count, 'snapshot_date': snapshot_date, 'elapsed': time.time() - start}
+
+
+def _insert(connection: sqlite3.Connection, batch: List[tuple]) -> int:
+    # Later rows win, so a multi-part download with overlaps keeps the last copy
+    connection.executemany('INSERT OR REPLACE INTO companies VALUES (?, ?, ?, ?, ?, ?, ?)', batch)
+    return len(batch)
+
+
+_company_index = None
+_company_index_loaded = False
+
+
+def get_company_index(bucket: Optional[str] = None) -> Optional[CompanyIndex]:
+    """
+    Module-level company index, shared across warm Lambda invocations
+
+    Uses COMPANY_INDEX_PATH if set, otherwise downloads COMPANY_INDEX_KEY from
+    the bucket to /tmp once per container. Returns None when no index is
+    configured or it can't be loaded, so callers fall back to the API.
+    """
+    global _company_index, _company_index_loaded
+
+    if _company_index_loaded:
+        return _company_index
+    _company_index_loaded = True
+
+    path = COMPANY_INDEX_PATH
+    try:
+        if not path and COMPANY_INDEX_KEY and bucket:
+            path = COMPANY_INDEX_LOCAL_PATH
+            if not os.path.exists(path):
+                import boto3
+
+                print(f"Downloading company index s3://{bucket}/{COMPANY_INDEX_KEY}")
+                boto3.client('s3').download_file(bucket, COMPANY_INDEX_KEY, path)
+
+        if path:
+            _company_index = CompanyIndex(path)
+            print(f"Loaded company index: {_company_index.company_count} companies, "
+                  f"snapshot {_company_index.snapshot_date}")
+    except Exception as e:
+        print(f"Warning: company index unavailable ({e}); using the Companies House API")
+        _company_index = None
+
+    return _company_index
@@ -0,0 +1,173 @@
+"""
+Company Name Matching
+Ranks company search candidates against the name a user asked for, instead of
+trusting the first search result. Scores combine normalised-name similarity,
+company status and legal form; a confidence score says whether the best
+candidate is clear enough to generate documents for. All in-process: no
+extra API calls.
+"""
+
+import os
+import re
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional
+
+from companies_house import normalize_company_name
+
+# Below this confidence the caller should ask which company was meant
+MATCH_CONFIDENCE_THRESHOLD = float(os.environ.get('COMPANY_MATCH_CONFIDENCE_THRESHOLD', '0.75'))
+
+# Score gap to the runner-up under which the best candidate is considered ambiguous
+AMBIGUITY_MARGIN = 0.15
+
+# Multipliers by company status; closed companies rarely sign new contracts
+STATUS_WEIGHTS = [
+    ('dissolved', 0.4),
+    ('converted', 0.4),
+    ('closed', 0.4),
+    ('removed', 0.4),
+    ('liquidation', 0.5),
+    ('receivership', 0.6),
+    ('administration', 0.6),
+    ('insolvency', 0.6),
+    ('strike off', 0.8),
+    ('active', 1.0),
+]
+UNKNOWN_STATUS_WEIGHT = 0.9
+
+# Adjustments when the requested legal form (e.g. '... PLC') does or doesn't match
+TYPE_MATCH_BONUS = 0.05
+TYPE_MISMATCH_PENALTY = 0.1
+
+# Legal-form words in a name -> type family
+NAME_TYPE_FAMILIES = {
+    'limited': 'ltd',
+    'ltd': 'ltd',
+    'plc': 'plc',
+    'llp': 'llp',
+    'lp': 'lp',
+}
+
+
+def match_company(query: str, candidates: List[Dict]) -> Dict:
+    """
+    Pick the best candidate for a company name
+
+    Args:
+        query: Company name as given by the user
+        candidates: Search results (search_company_by_name or CompanyIndex.search)
+
+    Returns:
+        Dictionary with 'company' (best candidate, or None if there are none),
+        'confidence' (0-1), 'confident' (confidence >= MATCH_CONFIDENCE_THRESHOLD)
+        and 'candidates' (all candidates, best first, each with a 'score')
+    """
+    ranked = rank_candidates(query, candidates)
+
+    if not ranked:
+        return {'company': None, 'confidence': 0.0, 'confident': False, 'candidates': []}
+
+    best = ranked[0]['score']
+    confidence = best
+    if len(ranked) > 1:
+        # Halve confidence for a tie, scaling back to full once the gap reaches the margin
+        gap = best - ranked[1]['score']
+        confidence *= 1 - 0.5 * max(0.0, 1 - gap / AMBIGUITY_MARGIN)
+
+    confidence = round(confidence, 3)
+    return {
+        'company': ranked[0],
+        'confidence': confidence,
+        'confident': confidence >= MATCH_CONFIDENCE_THRESHOLD,
+        'candidates': ranked,
+    }
+
+
+def rank_candidates(query: str, candidates: List[Dict]) -> List[Dict]:
+    """Candidates scored against the query, best first (copies, with 'score' added)"""
+    normalized_query = normalize_company_name(query)
+    query_family = _name_type_family(query)
+
+    ranked = []
+    for candidate in candidates:
+        name = candidate.get('company_name') or ''
+        score = name_similarity(normalized_query, normalize_company_name(name))
+        score *= status_weight(candidate.get('company_status'))
+
+        if query_family:
+            family = type_family(candidate.get('company_type'), name)
+            if family == query_family:
+                score += TYPE_MATCH_BONUS
+            elif family:
+                score -= TYPE_MISMATCH_PENALTY
+
+        ranked.append({**candidate, 'score': round(min(max(score, 0.0), 1.0), 3)})
+
+    # Stable sort keeps the search order for equal scores
+    ranked.sort(key=lambda candidate: candidate['score'], reverse=True)
+    return ranked
+
+
+def name_similarity(a: str, b: str) -> float:
+    """
+    Similarity of two normalised names, 0-1
+
+    Average of token overlap (Dice coefficient), which ignores word order, and
+    character sequence similarity, which tolerates typos.
+    """
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+
+    tokens_a, tokens_b = set(a.split()), set(b.split())
+    token_overlap = 2 * len(tokens_a & tokens_b) / (len(tokens_a) + len(tokens_b))
+    sequence = SequenceMatcher(None, a, b).ratio()
+
+    return 0.5 * token_overlap + 0.5 * sequence
+
+
+def status_weight(status: Optional[str]) -> float:
+    """Score multiplier for a company status (API 'active'/'dissolved' or snapshot 'Active' etc.)"""
+    status = (status or '').lower().replace('-', ' ')
+    for keyword, weight in STATUS_WEIGHTS:
+        if keyword in status:
+            return weight
+    return UNKNOWN_STATUS_WEIGHT
+
+
+def type_family(company_type: Optional[str], company_name: str = '') -> str:
+    """
+    Legal form family ('ltd', 'plc', 'llp', 'lp') of a candidate, or '' if unknown
+
+    Understands API search types ('ltd', 'plc', 'llp', 'limited-partnership', ...)
+    and snapshot categories ('Private Limited Company', ...), falling back to
+    the suffix of the company name.
+    """
+    company_type = (company_type or '').lower().replace('-', ' ')
+
+    if 'llp' in company_type or 'liability partnership' in company_type:
+        return 'llp'
+    if 'limited partnership' in company_type:
+        return 'lp'
+    if company_type == 'plc' or 'public limited' in company_type:
+        return 'plc'
+    if company_type == 'ltd' or company_type.startswith('private') or company_type.startswith('pri/'):
+        return 'ltd'
+
+    return _name_type_family(company_name)
+
+
+def _name_type_family(name: str) -> str:
+    """Type family from the legal-form word at the end of a name"""
+    words = re.sub(r'[^a-z0-9]+', ' ', name.lower().replace('.', '')).split()
+    return NAME_TYPE_FAMILIES.get(words[-1], '') if len(words) > 1 else ''
+
+
+def describe_candidates(candidates: List[Dict], limit: int = 5) -> str:
+    """Short human-readable list of candidates, for asking the user to pick one"""
+    lines = []
+    for candidate in candidates[:limit]:
+        status = candidate.get('company_status') or 'unknown status'
+        lines.append(f"{candidate.get('company_name')} ({candidate.get('company_number')}, {status})")
+    return '; '.join(lines)
@@ -0,0 +1,205 @@
+"""
+Company Data Provider
+Single entry point for company details: cache first, then the Companies House
+API (when a key is configured), then the public website scraper. Sources are
+hedged: if one hasn't answered within HEDGE_AFTER_SECONDS the next is started
+in parallel and the first good answer wins, bounding tail latency when either
+source is slow. Output has the same fields whichever source answered.
+"""
+
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+from companies_house import CompanyNotFoundError, get_client, infer_company_type, infer_jurisdiction
+from companies_house_cache import CachedCompaniesHouseClient, create_cache_store, normalize_company_number
+from companies_house_scraper import CompaniesHouseScraper
+
+# Start the next source if the current one hasn't answered within this many seconds
+HEDGE_AFTER_SECONDS = float(os.environ.get('COMPANY_DATA_HEDGE_SECONDS', '1.5'))
+
+# Fields every provider result has, whichever source it came from
+COMPANY_FIELDS = [
+    'company_number',
+    'company_name',
+    'registered_office_address',
+    'company_type',
+    'company_type_api',
+    'jurisdiction',
+    'company_status',
+    'date_of_creation',
+    'source',
+]
+
+# Shared by all providers; hedged calls that lose the race finish here in the background
+_executor = ThreadPoolExecutor(max_workers=8)
+
+
+class HedgedCompanySource:
+    """Fetches company details from an ordered list of sources, hedging slow ones"""
+
+    def __init__(self, sources: List[Tuple[str, object]], hedge_after: float = HEDGE_AFTER_SECONDS):
+        """
+        Args:
+            sources: (name, source) pairs in preference order; each source has get_company_details(number)
+            hedge_after: Seconds to wait on a source before also starting the next one
+        """
+        self.sources = sources
+        self.hedge_after = hedge_after
+        self.stats = {name: {'wins': 0, 'errors': 0} for name, _ in sources}
+        self.stats['hedged'] = 0
+
+    def get_company_details(self, company_number: str) -> Dict:
+        """Normalised company details from the first source to answer successfully"""
+        name, data = self._first_success(lambda source: source.get_company_details(company_number))
+        return normalize_company_data(data, name)
+
+    def _first_success(self, call: Callable) -> Tuple[str, Dict]:
+        """
+        Run call against the sources, starting the next one when the current one is
+        slow or fails; returns (source name, result) for the first success
+
+        Raises:
+            CompanyNotFoundError as soon as a source reports the company as not found,
+            otherwise the first source's error if all of them fail
+        """
+        if not self.sources:
+            raise Exception("No company data sources configured")
+
+        started = {}
+        pending = set()
+        errors = []
+
+        def start_next():
+            name, source = self.sources[len(started)]
+            future = _executor.submit(call, source)
+            started[future] = (name, time.time())
+            pending.add(future)
+
+        start_next()
+
+        while pending:
+            can_hedge = len(started) < len(self.sources)
+            done, _ = wait(pending, timeout=self.hedge_after if can_hedge else None, return_when=FIRST_COMPLETED)
+
+            if not done:
+                print(f"No answer within {self.hedge_after}s; hedging with {self.sources[len(started)][0]}")
+                self.stats['hedged'] += 1
+                start_next()
+                continue
+
+            for future in done:
+                pending.discard(future)
+                name, started_at = started[future]
+                try:
+                    result = future.result()
+                except CompanyNotFoundError:
+                    # A definite "not found" is an answer too; no point asking another source
+                    raise
+                except Exception as e:
+                    print(f"Company data source {name} failed: {e}")
+                    self.stats[name]['errors'] += 1
+                    errors.append(e)
+                    continue
+
+                print(f"Company data from {name} in {(time.time() - started_at) * 1000:.0f}ms")
+                self.stats[name]['wins'] += 1
+                return name, result
+
+            # Everything running has failed; move straight on to the next source
+            if not pending and len(started) < len(self.sources):
+                start_next()
+
+        raise errors[0]
+
+
+class CompanyDataProvider:
+    """
+    Cache -> API -> scraper company lookups
+
+    Usage:
+        provider = get_company_provider(api_key, bucket)
+        details = provider.get_company_details('SC123456')
+    """
+
+    def __init__(self, api_key: Optional[str] = None, bucket: Optional[str] = None,
+                 sources: Optional[List[Tuple[str, object]]] = None, hedge_after: float = HEDGE_AFTER_SECONDS):
+        """
+        Args:
+            api_key: Companies House API key; without one only the scraper is used
+            bucket: Bucket for the persistent cache store, if COMPANIES_HOUSE_CACHE_STORE is 's3'
+            sources: (name, source) pairs overriding the default API -> scraper order
+            hedge_after: Seconds to wait on a source before also starting the next one
+        """
+        if sources is None:
+            sources = [('api', get_client(api_key))] if api_key else []
+            sources.append(('scraper', CompaniesHouseScraper()))
+
+        self.api_key = api_key
+        self.source = HedgedCompanySource(sources, hedge_after)
+        self.cache = CachedCompaniesHouseClient(api_key, store=create_cache_store(bucket), client=self.source)
+
+    def get_company_details(self, company_number: str) -> Dict:
+        """
+        Company details by number, from the cache or the fastest healthy source
+
+        Returns:
+            Dictionary with COMPANY_FIELDS
+
+        Raises:
+            CompanyNotFoundError if the company doesn't exist
+        """
+        return self.cache.get_company_details(company_number)
+
+    def search_company_by_name(self, company_name: str) -> list:
+        """Name search (cached); needs the API, as the website search isn't scraped"""
+        return self.cache.search_company_by_name(company_name)
+
+    @property
+    def stats(self) -> Dict:
+        """Cache hit/miss counts and per-source wins/errors"""
+        return {'cache': dict(self.cache.stats), 'sources': self.source.stats}
+
+
+def normalize_company_data(data: Dict, source: str) -> Dict:
+    """
+    Company details with the same fields and conventions whichever source produced them
+
+    Type and jurisdiction are always inferred from the company number, and
+    status uses the API's lowercase form ('active', 'dissolved', ...).
+    """
+    company_number = normalize_company_number(data.get('company_number') or '')
+
+    return {
+        'company_number': company_number,
+        'company_name': (data.get('company_name') or '').strip(),
+        'registered_office_address': re.sub(r'\s+', ' ', data.get('registered_office_address') or '').strip(),
+        'company_type': infer_company_type(company_number),
+        'company_type_api': data.get('company_type_api') or '',
+        'jurisdiction': infer_jurisdiction(company_number),
+        'company_status': normalize_status(data.get('company_status')),
+        'date_of_creation': data.get('date_of_creation') or '',
+        'source': data.get('source') or source,
+    }
+
+
+def normalize_status(status: Optional[str]) -> str:
+    """'Active', 'Active - Proposal to Strike off' and 'active' all become 'active'"""
+    status = (status or '').strip().lower()
+    if status.startswith('active'):
+        return 'active'
+    if status.startswith('in '):
+        status = status[3:]
+    return status.replace(' ', '-')
+
+
+_providers: Dict[Optional[str], CompanyDataProvider] = {}
+
+
+def get_company_provider(api_key: Optional[str] = None, bucket: Optional[str] = None) -> CompanyDataProvider:
+    """Module-level provider, shared across warm Lambda invocations"""
+    if api_key not in _providers:
+        _providers[api_key] = CompanyDataProvider(api_key, bucket)
+    return _providers[api_key]
@@ -0,0 +1,704 @@
+"""
+Contract Generator Lambda Function
+Generates contracts (NDAs, MSAs) by fetching company data from Companies House
+and populating templates. Document types are data-driven: adding a new contract
+only needs an entry in DOCUMENT_TYPES.
+"""
+
+import hashlib
+import io
+import json
+import boto3
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from datetime import datetime
+import re
+from companies_house import CompanyMatchError, CompanyNotFoundError
+from company_index import get_company_index
+from company_matching import describe_candidates, match_company
+from company_provider import get_company_provider, normalize_company_data
+from docx_template import render_template
+
+try:
+    from botocore.exceptions import ClientError
+except ImportError:
+    ClientError = Exception
+
+from boto3.s3.transfer import TransferConfig
+
+s3 = boto3.client('s3')
+
+# Documents above 8 MB are uploaded in parallel parts
+TRANSFER_CONFIG = TransferConfig(multipart_threshold=8 * 1024 * 1024, max_concurrency=4)
+
+KNOWLEDGE_BASE_BUCKET = os.environ.get('KNOWLEDGE_BASE_BUCKET', '')
+COMPANIES_HOUSE_API_KEY = os.environ.get('COMPANIES_HOUSE_API_KEY', '')  # Optional
+
+# How long a cached template is trusted before revalidating its ETag with S3
+TEMPLATE_CACHE_TTL_SECONDS = int(os.environ.get('TEMPLATE_CACHE_TTL_SECONDS', '300'))
+
+# Reuse an identical document (same render inputs and template version) already in S3
+# instead of rendering and uploading it again; only a fresh download URL is issued
+DOCUMENT_DEDUP = os.environ.get('DOCUMENT_DEDUP', 'true').lower() == 'true'
+
+DOCX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+# Placeholders shared by every template, mapped to render context fields (see build_render_context)
+COMMON_PLACEHOLDERS = {
+    '[Company Type]': 'company_type',
+    '[Jurisdiction]': 'jurisdiction',
+    '[Company Number]': 'company_number',
+    '[Registered Address]': 'registered_office_address',
+    '[Name]': 'signatory_name',  # Signatory name
+    '[Title]': 'signatory_title',  # Signatory title
+}
+
+# Registry of document types: template, placeholder map (in replacement order) and output location
+DOCUMENT_TYPES = {
+    'nda': {
+        'label': 'NDA',
+        'template_key': 'templates/Non-Disclosure Agreement Template v01 JC OFFLINE.docx',
+        'output_prefix': 'generated-ndas/NDA',
+        'placeholders': {
+            '[Date]': 'date',
+            '[Recipient Name]': 'company_name',  # Full company name
+            '[Recipient]': 'company_name',  # Short reference to company
+            **COMMON_PLACEHOLDERS,
+        },
+    },
+    'msa': {
+        'label': 'MSA',
+        'template_key': 'templates/Master Services Agreement Template v02 JC - OFFLINE.docx',
+        'output_prefix': 'generated-msas/MSA',
+        'placeholders': {
+            '[Date]': 'date',
+            '[Client Name]': 'company_name',  # Full company name
+            '[Client]': 'company_name',  # Short reference to company
+            **COMMON_PLACEHOLDERS,
+        },
+    },
+}
+
+# Bedrock Agent function name -> document types it generates
+# (generateDocuments takes them from its document_types parameter)
+AGENT_FUNCTIONS = {
+    'generateNDA': ['nda'],
+    'generateMSA': ['msa'],
+}
+
+# Direct (non-agent) invocation rendering several documents for one company
+BUNDLE_ACTION = 'generateBundle'
+
+# Direct invocation generating documents for a list of companies (see bulk_contracts.py)
+BULK_ACTION = 'generateBulk'
+
+# Agent function and direct invocation action rendering a proposal deck (see presentation_generator.py)
+PRESENTATION_ACTION = 'generatePresentation'
+
+# Template bytes keyed by S3 key: {'etag', 'content', 'checked_at'}; survives warm invocations
+_template_cache: Dict[str, Dict] = {}
+
+
+def lambda_handler(event, context):
+    """
+    Main handler for Bedrock Agent action groups - contract generation
+
+    The document types come from the agent function name (generateNDA,
+    generateMSA) or, for generateDocuments, from the document_types parameter.
+    Direct invocations with action=generateBundle (see handle_bundle_request)
+    or action=generateBulk (see bulk_contracts.handle_bulk_request) skip the
+    agent response format. generatePresentation, as an agent function or a
+    direct action, renders a proposal deck (see presentation_generator.py).
+    """
+    print(f"Received event: {json.dumps(event)}")
+
+    if PRESENTATION_ACTION in (event.get('action'), event.get('function')):
+        from presentation_generator import handle_presentation_request
+        return handle_presentation_request(event)
+
+    if event.get('action') == BUNDLE_ACTION:
+        return handle_bundle_request(event)
+
+    if event.get('action') == BULK_ACTION:
+        from bulk_contracts import handle_bulk_request
+        return handle_bulk_request(event, context)
+
+    return handle_agent_request(event, AGENT_FUNCTIONS.get(event.get('function')))
+
+
+def handle_agent_request(event: Dict, document_types: Optional[List[str]] = None) -> Dict:
+    """
+    Generate the requested documents for a Bedrock Agent action group event
+
+    Args:
+        event: Bedrock Agent action group event
+        document_types: Document types to generate; read from the
+            document_types parameter when not given
+
+    Returns:
+        Bedrock Agent action group response
+    """
+    action_group = event.get('actionGroup')
+    function = event.get('function')
+    parameters = {param['name']: param['value'] for param in event.get('parameters', [])}
+
+    company_identifier = parameters.get('company_identifier')
+    signatory_name = parameters.get('signatory_name')
+    signatory_title = parameters.get('signatory_title')
+
+    if document_types is None:
+        document_types = parse_document_types(parameters.get('document_types', ''))
+
+    if not company_identifier:
+        return error_response("Company identifier (name or number) is required")
+
+    if not signatory_name or not signatory_title:
+        return error_response("Signatory name and title are required")
+
+    unknown_types = [doc_type for doc_type in document_types if doc_type not in DOCUMENT_TYPES]
+    if not document_types or unknown_types:
+        return error_response(f"Document types must be one or more of: {', '.join(DOCUMENT_TYPES)}")
+
+    try:
+        results = generate_documents(
+            company_identifier=company_identifier,
+            signatory_name=signatory_name,
+            signatory_title=signatory_title,
+            document_types=document_types
+        )
+
+        # A single document keeps the original per-document response shape
+        result = results[0] if len(results) == 1 else combine_results(results)
+
+        # Format response for Bedrock Agent
+        response_body = {
+            "TEXT": {
+                "body": json.dumps(result)
+            }
+        }
+
+        action_response = {
+            'actionGroup': action_group,
+            'function': function,
+            'functionResponse': {
+                'responseBody': response_body
+            }
+        }
+
+        return {
+            'response': action_response,
+            'messageVersion': event['messageVersion']
+        }
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return error_response(str(e))
+
+
+def handle_bundle_request(event: Dict) -> Dict:
+    """
+    Generate several documents for one company from a direct Lambda invocation
+
+    Expected event:
+    {
+        "action": "generateBundle",
+        "company": "Company Name or Number",
+        "signatory_name": "John Smith",
+        "signatory_title": "Director",
+        "document_types": ["nda", "msa"]
+    }
+
+    Returns:
+        Combined result with every presigned URL, or {'success': False, 'error': ...,
+        'error_type': ...}. error_type is 'invalid_request' or 'company' for problems
+        the caller can fix, 'internal' for everything else.
+    """
+    company_identifier = event.get('company')
+    signatory_name = event.get('signatory_name')
+    signatory_title = event.get('signatory_title')
+    document_types = parse_document_types(event.get('document_types') or [])
+
+    if not company_identifier:
+        return {'success': False, 'error': 'Company name or number is required', 'error_type': 'invalid_request'}
+
+    if not signatory_name or not signatory_title:
+        return {'success': False, 'error': 'Signatory name and title are required', 'error_type': 'invalid_request'}
+
+    unknown_types = [doc_type for doc_type in document_types if doc_type not in DOCUMENT_TYPES]
+    if not document_types or unknown_types:
+        return {'success': False, 'error': f"Document types must be one or more of: {', '.join(DOCUMENT_TYPES)}",
+                'error_type': 'invalid_request'}
+
+    try:
+        results = generate_documents(
+            company_identifier=company_identifier,
+            signatory_name=signatory_name,
+            signatory_title=signatory_title,
+            document_types=document_types
+        )
+        return combine_results(results)
+
+    except (CompanyNotFoundError, CompanyMatchError) as e:
+        print(f"Company not resolved: {str(e)}")
+        return {'success': False, 'error': str(e), 'error_type': 'company'}
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return {'success': False, 'error': str(e), 'error_type': 'internal'}
+
+
+def parse_document_types(value) -> List[str]:
+    """Normalise document types given as a list or a comma-separated string, dropping repeats"""
+    if isinstance(value, str):
+        value = value.split(',')
+    return list(dict.fromkeys(doc_type.strip().lower() for doc_type in value if doc_type and doc_type.strip()))
+
+
+def generate_documents(
+    company_identifier: str,
+    signatory_name: str,
+    signatory_title: str,
+    document_types: List[str]
+) -> List[Dict]:
+    """
+    Generate one or more contract documents for a company
+
+    The company is resolved once and shared by every document; when several
+    documents are requested they are rendered and uploaded concurrently.
+
+    Args:
+        company_identifier: Company name or Companies House number
+        signatory_name: Name of the person signing
+        signatory_title: Title/position of the signatory
+        document_types: Keys of DOCUMENT_TYPES to generate
+
+    Returns:
+        List of generation results, one per document type
+    """
+    labels = ', '.join(DOCUMENT_TYPES[doc_type]['label'] for doc_type in document_types)
+    print(f"Generating {labels} for: {company_identifier}")
+
+    # Step 1: Get company details from Companies House
+    company_data = resolve_company(company_identifier)
+    print(f"Company data retrieved: {company_data['company_name']}")
+
+    context = build_render_context(company_data, signatory_name, signatory_title)
+
+    # Steps 2-4: Render each document from its cached template and save to S3
+    if len(document_types) == 1:
+        return [generate_from_context(document_types[0], company_data, context)]
+
+    with ThreadPoolExecutor(max_workers=len(document_types)) as executor:
+        return list(executor.map(
+            lambda doc_type: generate_from_context(doc_type, company_data, context),
+            document_types
+        ))
+
+
+def generate_document(doc_type: str, company_identifier: str, signatory_name: str, signatory_title: str) -> Dict:
+    """Generate a single contract document (see generate_documents)"""
+    return generate_documents(company_identifier, signatory_name, signatory_title, [doc_type])[0]
+
+
+def resolve_company(company_identifier: str) -> Dict:
+    """
+    Look up a company by Companies House number or name
+
+    Args:
+        company_identifier: Company name or Companies House number
+
+    Returns:
+        Parsed company details
+    """
+    # Local register snapshot first; the API only for misses or a stale snapshot
+    company_index = get_company_index(KNOWLEDGE_BASE_BUCKET)
+    if company_index is not None and company_index.is_fresh():
+        company = lookup_company_index(company_index, company_identifier)
+        if company:
+            print(f"Resolved {company_identifier} from company index: "
+                  f"{company['company_name']} ({company['company_number']})")
+            return company
+
+    # Cache, then API, then scraper; cached across invocations (and containers, with the S3 cache store)
+    ch_client = get_company_provider(COMPANIES_HOUSE_API_KEY or None, KNOWLEDGE_BASE_BUCKET)
+
+    # Check if it's a company number or name
+    if is_company_number(company_identifier):
+        print(f"Fetching company by number: {company_identifier}")
+        return ch_client.get_company_details(company_identifier)
+
+    print(f"Searching for company by name: {company_identifier}")
+    search_results = ch_client.search_company_by_name(company_identifier)
+
+    if not search_results:
+        raise CompanyNotFoundError(f"No company found with name: {company_identifier}")
+
+    # Rank candidates rather than trusting the first result; only fetch details for a clear match
+    match = match_company(company_identifier, search_results)
+    best = match['company']
+    print(f"Best match: {best['company_name']} ({best['company_number']}), confidence {match['confidence']}")
+
+    if not match['confident']:
+        raise CompanyMatchError(
+            f"Couldn't confidently identify '{company_identifier}' (confidence {match['confidence']:.2f}). "
+            f"Closest matches: {describe_candidates(match['candidates'])}. "
+            f"Please confirm the company name or give its company number."
+        )
+
+    return ch_client.get_company_details(best['company_number'])
+
+
+def lookup_company_index(company_index, company_identifier: str) -> Optional[Dict]:
+    """Company details from the local index by number or name, or None on a miss"""
+    if is_company_number(company_identifier):
+        company = company_index.get(company_identifier)
+    else:
+        # Unclear matches go to the API, which also knows companies newer than the snapshot
+        match = match_company(company_identifier, company_index.search(company_identifier))
+        company = company_index.get(match['company']['company_number']) if match['confident'] else None
+
+    return normalize_company_data(company, 'snapshot') if company else None
+
+
+def build_render_context(company_data: Dict, signatory_name: str, signatory_title: str) -> Dict:
+    """Values that placeholders map to, shared by every document in a request"""
+    return {
+        'date': datetime.utcnow().strftime('%d %B %Y'),
+        'company_name': company_data['company_name'],
+        'company_type': company_data['company_type'],
+        'jurisdiction': company_data['jurisdiction'],
+        'company_number': company_data['company_number'],
+        'registered_office_address': company_data['registered_office_address'],
+        'signatory_name': signatory_name,
+        'signatory_title': signatory_title,
+    }
+
+
+def generate_from_context(doc_type: str, company_data: Dict, context: Dict) -> Dict:
+    """
+    Render, store and presign one document for an already resolved company
+
+    Args:
+        doc_type: Key of DOCUMENT_TYPES
+        company_data: Parsed company details
+        context: Render context from build_render_context
+
+    Returns:
+        Dictionary with generation results
+    """
+    document = DOCUMENT_TYPES[doc_type]
+    label = document['label']
+
+    # Step 2: Get template (cached across warm invocations)
+    template_content = get_template(document['template_key'])
+
+    # Identical inputs and template version give the same key, so an earlier copy can be reused
+    output_key = None
+    if DOCUMENT_DEDUP:
+        fingerprint = document_fingerprint(doc_type, context, get_template_version(document['template_key']))
+        output_key = document_key(doc_type, company_data, fingerprint[:16])
+        if document_exists(output_key):
+            print(f"Reusing identical {label}: {output_key}")
+            return document_result(doc_type, company_data, context, output_key, reused=True)
+
+    # Step 3: Populate template with company data
+    print(f"Populating {label} template...")
+    populated_doc = render_document(doc_type, template_content, context)
+
+    # Step 4: Save generated document to S3
+    return save_document(doc_type, company_data, context, populated_doc, output_key=output_key)
+
+
+def document_fingerprint(doc_type: str, context: Dict, template_etag: str) -> str:
+    """
+    Hash of everything that determines a rendered document's content
+
+    The render context includes the date, so identical requests on different
+    days still get their own (correctly dated) document.
+    """
+    inputs = json.dumps({'doc_type': doc_type, 'template_etag': template_etag, 'context': context}, sort_keys=True)
+    return hashlib.sha256(inputs.encode('utf-8')).hexdigest()
+
+
+def document_key(doc_type: str, company_data: Dict, name_suffix: str) -> str:
+    """S3 key for a generated document: <output prefix>_<company>_<suffix>.docx"""
+    company_name_safe = re.sub(r'[^a-zA-Z0-9-]', '_', company_data['company_name'])
+    return f"{DOCUMENT_TYPES[doc_type]['output_prefix']}_{company_name_safe}_{name_suffix}.docx"
+
+
+def document_exists(output_key: str) -> bool:
+    """Whether a generated document is (still) in S3; lifecycle rules expire old ones"""
+    try:
+        s3.head_object(Bucket=KNOWLEDGE_BASE_BUCKET, Key=output_key)
+        return True
+    except ClientError as e:
+        code = e.response.get('Error', {}).get('Code') if hasattr(e, 'response') else None
+        if code not in ('404', 'NoSuchKey', 'NotFound'):
+            print(f"Couldn't check for an existing document ({e}); generating it")
+        return False
+
+
+def save_document(doc_type: str, company_data: Dict, context: Dict, populated_doc: bytes,
+                  key_suffix: str = '', expires_in: int = 3600, output_key: Optional[str] = None) -> Dict:
+    """
+    Upload a rendered document and presign a download URL
+
+    Uploads go through the S3 transfer manager, which switches to parallel
+    multipart uploads for large documents.
+
+    Args:
+        doc_type: Key of DOCUMENT_TYPES
+        company_data: Parsed company details
+        context: Render context from build_render_context
+        populated_doc: Rendered document bytes
+        key_suffix: Appended to the object name, to keep keys unique in bulk runs
+        expires_in: Presigned URL lifetime in seconds
+        output_key: S3 key to use instead of a timestamped one (content-addressed documents)
+
+    Returns:
+        Dictionary with generation results
+    """
+    document = DOCUMENT_TYPES[doc_type]
+    label = document['label']
+
+    timestamp = datetime.utcnow().strftime('%Y%m%d-%H%M%S')
+    output_key = output_key or document_key(doc_type, company_data, f"{timestamp}{key_suffix}")
+
+    print(f"Saving {label} to S3: {output_key}")
+    s3.upload_fileobj(
+        io.BytesIO(populated_doc),
+        KNOWLEDGE_BASE_BUCKET,
+        output_key,
+        ExtraArgs={
+            'ContentType': DOCX_CONTENT_TYPE,
+            'ServerSideEncryption': 'aws:kms',  # Required by bucket policy
+            'Metadata': {
+                'company_name': company_data['company_name'],
+                'company_number': company_data['company_number'],
+                'signatory_name': context['signatory_name'],
+                'signatory_title': context['signatory_title'],
+                'generated_date': timestamp
+            }
+        },
+        Config=TRANSFER_CONFIG
+    )
+
+    return document_result(doc_type, company_data, context, output_key, expires_in)
+
+
+def document_result(doc_type: str, company_data: Dict, context: Dict, output_key: str,
+                    expires_in: int = 3600, reused: bool = False) -> Dict:
+    """
+    Generation result for a document stored in S3, with a fresh presigned download URL
+
+    Returns:
+        Dictionary with generation results
+    """
+    label = DOCUMENT_TYPES[doc_type]['label']
+
+    # Generate download URL (presigned, valid for 1 hour by default)
+    download_url = s3.generate_presigned_url(
+        'get_object',
+        Params={'Bucket': KNOWLEDGE_BASE_BUCKET, 'Key': output_key},
+        ExpiresIn=expires_in
+    )
+
+    return {
+        'success': True,
+        'document_type': doc_type,
+        'message': f'{label} generated successfully for {company_data["company_name"]}',
+        'company_details': {
+            'name': company_data['company_name'],
+            'number': company_data['company_number'],
+            'type': company_data['company_type'],
+            'jurisdiction': company_data['jurisdiction'],
+            'address': company_data['registered_office_address']
+        },
+        'signatory': {
+            'name': context['signatory_name'],
+            'title': context['signatory_title']
+        },
+        's3_key': output_key,
+        'download_url': download_url,
+        'expires_in': describe_expiry(expires_in),
+        'reused': reused
+    }
+
+
+def describe_expiry(expires_in: int) -> str:
+    """Presigned URL lifetime for messages: '1 hour', '24 hours', '15 minutes'"""
+    if expires_in >= 3600 and expires_in % 3600 == 0:
+        hours = expires_in // 3600
+        return '1 hour' if hours == 1 else f'{hours} hours'
+    minutes = max(expires_in // 60, 1)
+    return '1 minute' if minutes == 1 else f'{minutes} minutes'
+
+
+def combine_results(results: List[Dict]) -> Dict:
+    """Merge per-document results into one response with all download URLs"""
+    labels = ' and '.join(DOCUMENT_TYPES[result['document_type']]['label'] for result in results)
+    company_details = results[0]['company_details']
+
+    return {
+        'success': True,
+        'message': f"{labels} generated successfully for {company_details['name']}",
+        'company_details': company_details,
+        'signatory': results[0]['signatory'],
+        'documents': [
+            {
+                'type': result['document_type'],
+                's3_key': result['s3_key'],
+                'download_url': result['download_url'],
+                'reused': result['reused']
+            }
+            for result in results
+        ],
+        'expires_in': results[0]['expires_in']
+    }
+
+
+def get_template(template_key: str) -> bytes:
+    """
+    Return template bytes, downloading from S3 only when the cached copy is stale
+
+    After TEMPLATE_CACHE_TTL_SECONDS the cached ETag is revalidated with a
+    conditional GET, so an unchanged template is not downloaded again.
+    """
+    cached = _template_cache.get(template_key)
+    now = time.time()
+
+    if cached and now - cached['checked_at'] < TEMPLATE_CACHE_TTL_SECONDS:
+        return cached['content']
+
+    request = {'Bucket': KNOWLEDGE_BASE_BUCKET, 'Key': template_key}
+    if cached:
+        request['IfNoneMatch'] = cached['etag']
+
+    try:
+        print(f"Downloading template from S3: {template_key}")
+        template_obj = s3.get_object(**request)
+    except ClientError as e:
+        if cached and e.response.get('Error', {}).get('Code') in ('304', 'NotModified'):
+            print(f"Template unchanged: {template_key}")
+            cached['checked_at'] = now
+            return cached['content']
+        raise
+
+    _template_cache[template_key] = {
+        'etag': template_obj['ETag'],
+        'content': template_obj['Body'].read(),
+        'checked_at': now
+    }
+    return _template_cache[template_key]['content']
+
+
+def get_template_version(template_key: str) -> str:
+    """ETag of the cached copy of a template (call get_template first)"""
+    return _template_cache[template_key]['etag']
+
+
+def render_document(doc_type: str, template_content: bytes, context: Dict) -> bytes:
+    """
+    Populate a template using its document type's placeholder map
+
+    Args:
+        doc_type: Key of DOCUMENT_TYPES
+        template_content: Word document template as bytes
+        context: Render context from build_render_context
+
+    Returns:
+        Populated document as bytes
+    """
+    placeholders = DOCUMENT_TYPES[doc_type]['placeholders']
+    replacements = {placeholder: context[field] for placeholder, field in placeholders.items()}
+
+    # Only the paragraphs recorded in the cached render plan are touched
+    return render_template(template_content, replacements)
+
+
+def populate_template(
+    doc_type: str,
+    template_content: bytes,
+    company_data: Dict,
+    signatory_name: str,
+    signatory_title: str
+) -> bytes:
+    """
+    Populate a template with company and signatory information
+
+    Args:
+        doc_type: Key of DOCUMENT_TYPES
+        template_content: Word document template as bytes
+        company_data: Dictionary with company information from Companies House
+        signatory_name: Name of signatory
+        signatory_title: Title of signatory
+
+    Returns:
+        Populated document as bytes
+    """
+    context = build_render_context(company_data, signatory_name, signatory_title)
+    return render_document(doc_type, template_content, context)
+
+
+def is_company_number(identifier: str) -> bool:
+    """
+    Check if the identifier looks like a Companies House number
+
+    Company numbers are typically:
+    - 8 characters (with leading zeros)
+    - May have letter prefix (e.g., SC, OC, NI)
+    - Format: [PREFIX]NNNNNN or NNNNNNNN
+    """
+    # Remove spaces
+    identifier = identifier.replace(' ', '').upper()
+
+    # Check if it matches company number pattern
+    # Alphanumeric, 6-8 characters
+    if re.match(r'^[A-Z]{0,2}\d{6,8}$', identifier):
+        return True
+
+    return False
+
+
+def error_response(error_message: str) -> Dict:
+    """Format error response for Bedrock Agent"""
+    return {
+        'response': {
+            'functionResponse': {
+                'responseBody': {
+                    'TEXT': {
+                        'body': json.dumps({
+                            'success': False,
+                            'error': error_message
+                        })
+                    }
+                }
+            }
+        }
+    }
+
+
+# Testing
+if __name__ == '__main__':
+    # Test generating both contracts locally
+    test_event = {
+        'agent': 'test',
+        'actionGroup': 'Contracts',
+        'function': 'generateDocuments',
+        'parameters': [
+            {'name': 'company_identifier', 'value': '01234567'},
+            {'name': 'signatory_name', 'value': 'Patrick Godden'},
+            {'name': 'signatory_title', 'value': 'Director'},
+            {'name': 'document_types', 'value': 'nda,msa'}
+        ],
+        'messageVersion': '1.0'
+    }
+
+    result = lambda_handler(test_event, None)
+    print(json.dumps(result, indent=2))
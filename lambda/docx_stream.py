@@ -0,0 +1,220 @@
+"""
+Streaming OOXML Renderer
+Populates Word templates without building a DOM: the template is treated as a
+zip, unchanged members are streamed straight through, and placeholder
+substitution is done on the XML text of the parts that need it
+"""
+
+import html
+import io
+import re
+import shutil
+import zipfile
+from typing import BinaryIO, Dict, List, Tuple
+from xml.sax.saxutils import escape
+
+# Package parts that can contain placeholders: body, headers and footers
+TEMPLATE_PART_PATTERN = re.compile(r'^word/(document|header\d*|footer\d*)\.xml$')
+
+# Any start, end or empty-element tag; declarations and comments are skipped
+TAG_PATTERN = re.compile(r'<(/?)([A-Za-z_][\w.:-]*)([^>]*?)(/?)>')
+ANY_TAG_PATTERN = re.compile(r'<[^>]+>')
+
+# Run children that contribute text, matching python-docx Run.text
+RUN_TEXT_ELEMENTS = {
+    'w:tab': '\t',
+    'w:ptab': '\t',
+    'w:br': '\n',
+    'w:cr': '\n',
+    'w:noBreakHyphen': '-',
+}
+
+COPY_BUFFER_SIZE = 64 * 1024
+
+
+def render_stream(template_content: bytes, replacements: Dict[str, str]) -> bytes:
+    """
+    Populate a Word template in memory using the streaming renderer
+
+    Args:
+        template_content: Word document template as bytes
+        replacements: Placeholder -> value, applied in order
+
+    Returns:
+        Populated document as bytes
+    """
+    output = io.BytesIO()
+    render_stream_to(io.BytesIO(template_content), output, replacements)
+    return output.getvalue()
+
+
+def render_stream_to(template_file: BinaryIO, output_file: BinaryIO, replacements: Dict[str, str]) -> None:
+    """
+    Populate a Word template from one file object into another
+
+    Members without placeholders are copied in fixed-size chunks, so memory use
+    is bounded by the largest XML part that has to be rewritten.
+    """
+    with zipfile.ZipFile(template_file) as template_zip, \
+            zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED) as output_zip:
+        for item in template_zip.infolist():
+            info = _copy_zip_info(item)
+
+            if TEMPLATE_PART_PATTERN.match(item.filename):
+                xml = template_zip.read(item.filename).decode('utf-8')
+                if _may_contain_placeholders(xml, replacements):
+                    xml = substitute_xml(xml, replacements)
+                output_zip.writestr(info, xml.encode('utf-8'))
+                continue
+
+            with template_zip.open(item) as source, output_zip.open(info, 'w') as target:
+                shutil.copyfileobj(source, target, COPY_BUFFER_SIZE)
+
+
+def substitute_xml(xml: str, replacements: Dict[str, str]) -> str:
+    """
+    Replace placeholders in the paragraphs of a WordprocessingML part
+
+    Placeholders split across runs are handled the same way as the python-docx
+    renderer: a changed paragraph's text is merged into its first run, keeping
+    that run's formatting, and the other runs are emptied.
+    """
+    edits: List[Tuple[int, int, str]] = []
+    stack: List[str] = []
+    paragraphs: List[Dict] = []
+    text_run = None
+    text_start = None
+
+    for match in TAG_PATTERN.finditer(xml):
+        closing, name, attributes, empty = match.groups()
+        run = paragraphs[-1]['run'] if paragraphs else None
+
+        if closing:
+            if stack:
+                stack.pop()
+
+            if name == 'w:t' and text_start is not None:
+                text_run['text'].append(html.unescape(xml[text_start:match.start()]))
+                text_run = text_start = None
+            elif name == 'w:rPr' and run is not None and len(stack) == run['depth']:
+                run['content_start'] = match.end()
+            elif name == 'w:r' and run is not None and len(stack) == run['depth'] - 1:
+                run['content_end'] = match.start()
+                paragraphs[-1]['run'] = None
+            elif name == 'w:p' and paragraphs and len(stack) == paragraphs[-1]['depth'] - 1:
+                paragraph = paragraphs.pop()
+                paragraph['end'] = match.start()
+                _rewrite_paragraph(paragraph, replacements, edits)
+            continue
+
+        depth = len(stack)
+        is_direct_child = run is not None and depth == run['depth']
+
+        if name == 'w:p' and not empty:
+            paragraphs.append({'depth': depth + 1, 'runs': [], 'run': None})
+        elif name == 'w:r' and paragraphs and run is None and depth == paragraphs[-1]['depth']:
+            new_run = {
+                'depth': depth + 1,
+                'open_start': match.start(),
+                'content_start': match.end(),
+                'attributes': attributes,
+                'empty': bool(empty),
+                'text': [],
+            }
+            paragraphs[-1]['runs'].append(new_run)
+            if not empty:
+                paragraphs[-1]['run'] = new_run
+        elif is_direct_child and name == 'w:t' and not empty:
+            text_run = run
+            text_start = match.end()
+        elif is_direct_child and name in RUN_TEXT_ELEMENTS:
+            run['text'].append(RUN_TEXT_ELEMENTS[name])
+
+        if not empty:
+            stack.append(name)
+
+    return _apply_edits(xml, edits)
+
+
+def _rewrite_paragraph(paragraph: Dict, replacements: Dict[str, str], edits: List[Tuple[int, int, str]]) -> None:
+    """Queue the edits that merge a paragraph's replaced text into its first run"""
+    runs = paragraph['runs']
+    original_text = ''.join(''.join(r['text']) for r in runs)
+
+    full_text = original_text
+    for key, value in replacements.items():
+        if key in full_text:
+            full_text = full_text.replace(key, value)
+
+    if full_text == original_text:
+        return
+
+    content = _run_content(full_text)
+
+    if not runs:
+        edits.append((paragraph['end'], paragraph['end'], f'<w:r>{content}</w:r>'))
+        return
+
+    for index, r in enumerate(runs):
+        new_content = content if index == 0 else ''
+        if r['empty']:
+            if new_content:
+                edits.append((r['open_start'], r['content_start'],
+                              f"<w:r{r['attributes'].rstrip()}>{new_content}</w:r>"))
+        else:
+            edits.append((r['content_start'], r['content_end'], new_content))
+
+
+def _run_content(text: str) -> str:
+    """Run content XML for text, matching python-docx Run.text assignment"""
+    parts = []
+    for piece in re.split(r'([\t\n\r])', text):
+        if piece == '\t':
+            parts.append('<w:tab/>')
+        elif piece in ('\n', '\r'):
+            parts.append('<w:br/>')
+        elif piece:
+            space = ' xml:space="preserve"' if piece != piece.strip() else ''
+            parts.append(f'<w:t{space}>{escape(piece)}</w:t>')
+    return ''.join(parts)
+
+
+def _apply_edits(xml: str, edits: List[Tuple[int, int, str]]) -> str:
+    """
+    Splice edits into the XML text
+
+    Edits are queued innermost paragraph first; an edit that falls inside a
+    later (outer) edit is dropped, as the outer run content replaces it.
+    """
+    if not edits:
+        return xml
+
+    edits.sort(key=lambda edit: (edit[0], -edit[1]))
+
+    pieces = []
+    position = 0
+    for start, end, replacement in edits:
+        if start < position:
+            continue
+        pieces.append(xml[position:start])
+        pieces.append(replacement)
+        position = end
+    pieces.append(xml[position:])
+
+    return ''.join(pieces)
+
+
+def _may_contain_placeholders(xml: str, replacements: Dict[str, str]) -> bool:
+    """Cheap check on the tag-stripped text before doing a full substitution pass"""
+    text = html.unescape(ANY_TAG_PATTERN.sub('', xml))
+    return any(key in text for key in replacements)
+
+
+def _copy_zip_info(item: zipfile.ZipInfo) -> zipfile.ZipInfo:
+    """Fresh ZipInfo for the output archive with the template member's attributes"""
+    info = zipfile.ZipInfo(item.filename, date_time=item.date_time)
+    info.compress_type = item.compress_type
+    info.external_attr = item.external_attr
+    info.create_system = item.create_system
+    info.comment = item.comment
+    return info
@@ -0,0 +1,300 @@
+"""
+DOCX Template Renderer
+Compiles Word templates into a cached render plan so each generation only
+patches the XML of paragraphs that actually contain placeholders
+"""
+
+import hashlib
+import io
+import os
+import re
+import zipfile
+from typing import Dict, Iterable, List, Tuple
+
+try:
+    from lxml import etree
+except ImportError:
+    print("Warning: lxml not available. Will fail when generating documents.")
+
+from docx_stream import render_stream
+
+# Legacy rendering path, kept as a fallback engine
+try:
+    from docx import Document
+except ImportError:
+    Document = None
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+W = f'{{{W_NS}}}'
+XML_SPACE = '{http://www.w3.org/XML/1998/namespace}space'
+
+# Package parts that can contain placeholders: body, headers and footers
+TEMPLATE_PART_PATTERN = re.compile(r'^word/(document|header\d*|footer\d*)\.xml$')
+
+# 'plan' patches the compiled locations directly, 'stream' rewrites the XML text
+# without a DOM (see docx_stream.py), 'python-docx' walks the full document
+RENDER_ENGINE = os.environ.get('DOCX_RENDER_ENGINE', 'plan')
+
+# Compiled plans, keyed by (template digest, placeholders); survives warm Lambda invocations
+_plan_cache: Dict[Tuple[str, Tuple[str, ...]], 'RenderPlan'] = {}
+
+
+class RenderPlan:
+    """Locations of placeholders within a template, computed once per template"""
+
+    def __init__(self, digest: str, locations: Dict[str, List[Tuple[int, Tuple[str, ...]]]]):
+        """
+        Args:
+            digest: SHA-256 of the template bytes the plan was compiled from
+            locations: Part name -> list of (paragraph index, placeholders in that paragraph)
+        """
+        self.digest = digest
+        self.locations = locations
+
+    @property
+    def placeholder_count(self) -> int:
+        """Number of paragraphs that need patching"""
+        return sum(len(paragraphs) for paragraphs in self.locations.values())
+
+    def render(self, template_content: bytes, replacements: Dict[str, str]) -> bytes:
+        """
+        Render the template, patching only the planned paragraphs
+
+        Args:
+            template_content: Word document template as bytes (must match the plan digest)
+            replacements: Placeholder -> value, applied in order
+
+        Returns:
+            Populated document as bytes
+        """
+        output = io.BytesIO()
+
+        with zipfile.ZipFile(io.BytesIO(template_content)) as template_zip, \
+                zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as output_zip:
+            for item in template_zip.infolist():
+                data = template_zip.read(item.filename)
+
+                paragraphs = self.locations.get(item.filename)
+                if paragraphs:
+                    data = _patch_part(data, paragraphs, replacements)
+
+                output_zip.writestr(item, data)
+
+        return output.getvalue()
+
+
+def compile_template(template_content: bytes, placeholders: Iterable[str]) -> RenderPlan:
+    """
+    Scan a template once and record which paragraphs contain which placeholders
+
+    Args:
+        template_content: Word document template as bytes
+        placeholders: Placeholder strings to look for (e.g. '[Company Number]')
+
+    Returns:
+        RenderPlan for the template
+    """
+    placeholders = tuple(placeholders)
+    digest = hashlib.sha256(template_content).hexdigest()
+    locations = {}
+
+    with zipfile.ZipFile(io.BytesIO(template_content)) as template_zip:
+        for name in template_zip.namelist():
+            if not TEMPLATE_PART_PATTERN.match(name):
+                continue
+
+            root = etree.fromstring(template_zip.read(name))
+            found = []
+            for index, paragraph in enumerate(root.iter(f'{W}p')):
+                text = paragraph_text(paragraph)
+                keys = tuple(key for key in placeholders if key in text)
+                if keys:
+                    found.append((index, keys))
+
+            if found:
+                locations[name] = found
+
+    plan = RenderPlan(digest, locations)
+    print(f"Compiled render plan {digest[:12]}: {plan.placeholder_count} paragraph(s) "
+          f"across {len(locations)} part(s)")
+    return plan
+
+
+def get_render_plan(template_content: bytes, placeholders: Iterable[str]) -> RenderPlan:
+    """Return the cached render plan for a template, compiling it on first use"""
+    placeholders = tuple(placeholders)
+    cache_key = (hashlib.sha256(template_content).hexdigest(), placeholders)
+
+    plan = _plan_cache.get(cache_key)
+    if plan is None:
+        plan = compile_template(template_content, placeholders)
+        _plan_cache[cache_key] = plan
+
+    return plan
+
+
+def render_template(template_content: bytes, replacements: Dict[str, str]) -> bytes:
+    """
+    Populate a Word template with the configured rendering engine
+
+    Args:
+        template_content: Word document template as bytes
+        replacements: Placeholder -> value, applied in order
+
+    Returns:
+        Populated document as bytes
+    """
+    print(f"Replacements: {replacements}")
+
+    if RENDER_ENGINE == 'python-docx':
+        return render_with_python_docx(template_content, replacements)
+
+    if RENDER_ENGINE == 'stream':
+        return render_stream(template_content, replacements)
+
+    plan = get_render_plan(template_content, replacements.keys())
+    return plan.render(template_content, replacements)
+
+
+def paragraph_text(paragraph) -> str:
+    """Text of a <w:p> element's runs, matching python-docx Paragraph.text"""
+    return ''.join(_run_text(run) for run in paragraph.iterchildren(f'{W}r'))
+
+
+def _run_text(run) -> str:
+    """Text of a <w:r> element, matching python-docx Run.text"""
+    parts = []
+    for child in run:
+        if child.tag == f'{W}t':
+            parts.append(child.text or '')
+        elif child.tag in (f'{W}tab', f'{W}ptab'):
+            parts.append('\t')
+        elif child.tag in (f'{W}br', f'{W}cr'):
+            parts.append('\n')
+        elif child.tag == f'{W}noBreakHyphen':
+            parts.append('-')
+    return ''.join(parts)
+
+
+def _patch_part(data: bytes, paragraphs: List[Tuple[int, Tuple[str, ...]]],
+                replacements: Dict[str, str]) -> bytes:
+    """Apply replacements to the planned paragraphs of one XML part"""
+    root = etree.fromstring(data)
+    all_paragraphs = list(root.iter(f'{W}p'))
+
+    for index, keys in paragraphs:
+        paragraph = all_paragraphs[index]
+        full_text = paragraph_text(paragraph)
+
+        for key, value in replacements.items():
+            if key in keys and key in full_text:
+                full_text = full_text.replace(key, value)
+
+        _set_paragraph_text(paragraph, full_text)
+
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+
+def _set_paragraph_text(paragraph, text: str) -> None:
+    """
+    Merge paragraph text into its first run, handling text split across runs
+
+    Same result as clearing every python-docx run and setting runs[0].text,
+    so the first run's formatting is kept.
+    """
+    runs = list(paragraph.iterchildren(f'{W}r'))
+
+    for run in runs:
+        for child in list(run):
+            if child.tag != f'{W}rPr':
+                run.remove(child)
+
+    if runs:
+        target = runs[0]
+    else:
+        target = etree.SubElement(paragraph, f'{W}r')
+
+    for piece in re.split(r'([\t\n\r])', text):
+        if piece == '\t':
+            etree.SubElement(target, f'{W}tab')
+        elif piece in ('\n', '\r'):
+            etree.SubElement(target, f'{W}br')
+        elif piece:
+            t = etree.SubElement(target, f'{W}t')
+            t.text = piece
+            if piece != piece.strip():
+                t.set(XML_SPACE, 'preserve')
+
+
+def render_with_python_docx(template_content: bytes, replacements: Dict[str, str]) -> bytes:
+    """
+    Populate a template by walking the whole python-docx object graph
+
+    Original rendering path; slower and heavier than the render plan but
+    kept for comparison and as a fallback (DOCX_RENDER_ENGINE=python-docx).
+    """
+    if Document is None:
+        raise ImportError("python-docx is required for the python-docx render engine")
+
+    # Load document from bytes
+    doc = Document(io.BytesIO(template_content))
+
+    def replace_text_in_paragraph(paragraph, replacements):
+        """Replace text in a paragraph, handling text split across runs"""
+        full_text = paragraph.text
+        for key, value in replacements.items():
+            if key in full_text:
+                print(f"Replacing {key} with {value} in paragraph")
+                full_text = full_text.replace(key, value)
+
+        # Only update if something changed
+        if full_text != paragraph.text:
+            # Clear existing runs and add new text
+            for run in paragraph.runs:
+                run.text = ""
+            if paragraph.runs:
+                paragraph.runs[0].text = full_text
+            else:
+                paragraph.add_run(full_text)
+
+    # Replace placeholders in paragraphs
+    for paragraph in doc.paragraphs:
+        replace_text_in_paragraph(paragraph, replacements)
+
+    # Replace placeholders in tables
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                for paragraph in cell.paragraphs:
+                    replace_text_in_paragraph(paragraph, replacements)
+
+    # Replace placeholders in headers and footers
+    for section in doc.sections:
+        # Header paragraphs
+        for paragraph in section.header.paragraphs:
+            replace_text_in_paragraph(paragraph, replacements)
+
+        # Header tables
+        for table in section.header.tables:
+            for row in table.rows:
+                for cell in row.cells:
+                    for paragraph in cell.paragraphs:
+                        replace_text_in_paragraph(paragraph, replacements)
+
+        # Footer paragraphs
+        for paragraph in section.footer.paragraphs:
+            replace_text_in_paragraph(paragraph, replacements)
+
+        # Footer tables
+        for table in section.footer.tables:
+            for row in table.rows:
+                for cell in row.cells:
+                    for paragraph in cell.paragraphs:
+                        replace_text_in_paragraph(paragraph, replacements)
+
+    # Save to bytes
+    output = io.BytesIO()
+    doc.save(output)
+    output.seek(0)
+
+    return output.read()
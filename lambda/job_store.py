@@ -0,0 +1,107 @@
+"""
+Generation Job Store
+Keeps the state of asynchronous document generation jobs so the API can
+answer status polls while generation runs in the background. Stores are
+pluggable: DynamoDB for deployed Lambdas, in-memory for local runs and tests.
+"""
+
+import os
+import threading
+import time
+import uuid
+from decimal import Decimal
+from typing import Dict, Optional
+
+# 'dynamodb' (needs JOB_TABLE) or 'memory'; defaults to DynamoDB when a table is configured
+JOB_TABLE = os.environ.get('JOB_TABLE', '')
+JOB_STORE = os.environ.get('JOB_STORE', 'dynamodb' if JOB_TABLE else 'memory')
+
+# Finished jobs are kept this long for polling, then expire (DynamoDB TTL on expires_at)
+JOB_TTL_SECONDS = int(os.environ.get('JOB_TTL_SECONDS', str(24 * 3600)))
+
+PENDING = 'pending'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+FINISHED_STATUSES = (SUCCEEDED, FAILED)
+
+
+def new_job(request: Dict, owner: Optional[str] = None) -> Dict:
+    """A fresh pending job record for a generation request"""
+    now = int(time.time())
+    return {
+        'job_id': str(uuid.uuid4()),
+        'status': PENDING,
+        'owner': owner or '',
+        'request': request,
+        'created_at': now,
+        'updated_at': now,
+        'expires_at': now + JOB_TTL_SECONDS,
+    }
+
+
+class InMemoryJobStore:
+    """Jobs in a process-local dict; for local runs and tests"""
+
+    def __init__(self):
+        self._jobs: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def create(self, job: Dict) -> None:
+        with self._lock:
+            self._jobs[job['job_id']] = dict(job)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def update(self, job_id: str, **fields) -> None:
+        fields['updated_at'] = int(time.time())
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+
+class DynamoDBJobStore:
+    """Jobs as items in a DynamoDB table keyed by job_id, shared by all Lambda containers"""
+
+    def __init__(self, table_name: str = JOB_TABLE, dynamodb_resource=None):
+        import boto3
+
+        self.table = (dynamodb_resource or boto3.resource('dynamodb')).Table(table_name)
+
+    def create(self, job: Dict) -> None:
+        self.table.put_item(Item=job)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        item = self.table.get_item(Key={'job_id': job_id}, ConsistentRead=True).get('Item')
+        return _from_dynamodb(item) if item else None
+
+    def update(self, job_id: str, **fields) -> None:
+        fields['updated_at'] = int(time.time())
+        names = {f'#{key}': key for key in fields}
+        values = {f':{key}': value for key, value in fields.items()}
+        self.table.update_item(
+            Key={'job_id': job_id},
+            UpdateExpression='SET ' + ', '.join(f'#{key} = :{key}' for key in fields),
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values
+        )
+
+
+def _from_dynamodb(value):
+    """DynamoDB returns numbers as Decimal; convert back so jobs serialise to JSON"""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, dict):
+        return {key: _from_dynamodb(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_from_dynamodb(item) for item in value]
+    return value
+
+
+def create_job_store():
+    """Job store configured by JOB_STORE"""
+    if JOB_STORE == 'dynamodb':
+        return DynamoDBJobStore(JOB_TABLE)
+    return InMemoryJobStore()
@@ -1,19 +1,44 @@
 """
 NDA API Gateway Handler
-Invokes Jamie 2.0 Bedrock Agent to generate NDAs via HTTP API
+Generates NDAs/MSAs via HTTP API: structured requests go directly to the
+contract generator, free-form prompts through the Jamie 2.0 Bedrock Agent
 """
 
 import json
 import boto3
 import os
-from typing import Dict, Any
+import threading
+import urllib.request
+from typing import Any, Dict, Optional
 import uuid
 
+from agent_traces import AgentTraceProcessor, log_debug
+from job_store import FAILED, FINISHED_STATUSES, RUNNING, SUCCEEDED, create_job_store, new_job
+
 # Environment variables
 AGENT_ID = os.environ.get('AGENT_ID')
 AGENT_ALIAS_ID = os.environ.get('AGENT_ALIAS_ID')
+CONTRACT_GENERATOR_FUNCTION = os.environ.get('CONTRACT_GENERATOR_FUNCTION')
+
+# How direct-mode requests reach the generation engine: 'invoke' calls the contract
+# generator Lambda; 'in-process' imports it (only if it is packaged with this handler)
+DIRECT_GENERATION = os.environ.get('DIRECT_GENERATION', 'invoke')
+
+# HTTP status for each contract generator error_type; anything else (including
+# a crashed invocation) is a 500
+GENERATION_ERROR_STATUS = {'invalid_request': 400, 'company': 422}
+
+# Request modes: 'direct' skips the agent, 'agent' goes through it, 'auto' picks per request
+REQUEST_MODES = ('auto', 'direct', 'agent')
+
+# How async jobs run: 'invoke' re-invokes this Lambda asynchronously; 'thread' runs
+# them in a background thread of this process (local runs and tests)
+ASYNC_DISPATCH = os.environ.get('ASYNC_DISPATCH', 'invoke' if os.environ.get('AWS_LAMBDA_FUNCTION_NAME') else 'thread')
+CALLBACK_TIMEOUT_SECONDS = 10
 
 bedrock_agent_runtime = boto3.client('bedrock-agent-runtime')
+lambda_client = boto3.client('lambda')
+job_store = create_job_store()
 
 
 def lambda_handler(event, context):
@@ -24,23 +49,86 @@ def lambda_handler(event, context):
     {
         "company": "Company Name or Number",
         "signatory_name": "John Smith",
-        "signatory_title": "Director"
+        "signatory_title": "Director",
+        "document_types": ["nda", "msa"],      (optional, default ["nda"])
+        "mode": "auto",                         (optional: auto, direct or agent)
+        "async": true,                          (optional: return a job id straight away)
+        "callback_url": "https://..."           (optional, async only: POSTed the result)
     }
+
+    or, for a free-form request handled by the agent:
+    {
+        "prompt": "NDA for Cloudscaler, signed by our CEO"
+    }
+
+    Structured requests go straight to the contract generator (see choose_mode);
+    the agent is only used for free-form prompts or when asked for explicitly.
+
+    Async requests are answered with 202 and a job id; GET /jobs/{job_id}
+    returns the job's status and, once finished, the same result a synchronous
+    request would have returned.
     """
     print(f"Received event: {json.dumps(event)}")
 
+    # Background run of an async job (self-invoked, not from API Gateway)
+    if event.get('job_action') == 'run':
+        run_job(event['job_id'])
+        return {'success': True}
+
+    method = event.get('requestContext', {}).get('http', {}).get('method')
+
     # Handle CORS preflight
-    if event.get('requestContext', {}).get('http', {}).get('method') == 'OPTIONS':
+    if method == 'OPTIONS':
         return cors_response(200, {'message': 'OK'})
 
+    if method == 'GET':
+        job_id = (event.get('pathParameters') or {}).get('job_id')
+        return get_job_status(job_id, request_owner(event))
+
     try:
         # Parse request body
         body = json.loads(event.get('body', '{}'))
 
+        if body.get('async'):
+            return start_job(body, request_owner(event))
+
+        return handle_generation_request(body)
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        import traceback
+        traceback.print_exc()
+
+        return cors_response(500, {
+            'error': str(e),
+            'message': 'Failed to generate NDA'
+        })
+
+
+def handle_generation_request(body: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Generate the documents for a parsed request body
+
+    Returns:
+        API response with the documents, or a 4xx/5xx error response
+    """
+    try:
         company = body.get('company')
         signatory_name = body.get('signatory_name')
         signatory_title = body.get('signatory_title')
         document_types = body.get('document_types', ['nda'])  # Default to NDA for backwards compatibility
+        prompt = body.get('prompt')
+
+        requested_mode = body.get('mode', 'auto')
+        if requested_mode not in REQUEST_MODES:
+            return cors_response(400, {'error': f"Mode must be one of: {', '.join(REQUEST_MODES)}"})
+
+        mode = choose_mode(body)
+        print(f"Request mode: {mode} (requested {requested_mode})")
+
+        # Free-form requests: the agent works out what to generate
+        if prompt and mode == 'agent':
+            return invoke_agent(prompt, body.get('document_types'))
 
         # Validate inputs
         if not company:
@@ -55,6 +143,11 @@ def lambda_handler(event, context):
         if not document_types or len(document_types) == 0:
             return cors_response(400, {'error': 'At least one document type must be specified'})
 
+        # Structured request: call the generation engine directly, with no LLM
+        # orchestration round (one company lookup, concurrent rendering)
+        if mode == 'direct':
+            return generate_direct(company, signatory_name, signatory_title, document_types)
+
         # Build prompt for Jamie 2.0 based on document types
         doc_names = []
         if 'nda' in document_types:
@@ -67,6 +160,153 @@ def lambda_handler(event, context):
         else:
             prompt = f"I need an {doc_names[0]} for {company}, signatory {signatory_name}, {signatory_title}"
 
+        return invoke_agent(prompt, document_types)
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        import traceback
+        traceback.print_exc()
+
+        return cors_response(500, {
+            'error': str(e),
+            'message': 'Failed to generate NDA'
+        })
+
+
+def request_owner(event: Dict[str, Any]) -> str:
+    """The signed-in user (Cognito JWT subject) making the request, if any"""
+    claims = event.get('requestContext', {}).get('authorizer', {}).get('jwt', {}).get('claims', {})
+    return claims.get('sub', '')
+
+
+def start_job(body: Dict[str, Any], owner: str) -> Dict[str, Any]:
+    """
+    Record an async job and start it in the background
+
+    Returns:
+        202 response with the job id and the path to poll for its status
+    """
+    callback_url = body.get('callback_url')
+    if callback_url and not callback_url.startswith('https://'):
+        return cors_response(400, {'error': 'callback_url must be an https:// URL'})
+
+    request = {key: value for key, value in body.items() if key != 'async'}
+    job = new_job(request, owner)
+    job_store.create(job)
+
+    if ASYNC_DISPATCH == 'invoke':
+        # A second, event-invoked run of this function isn't bound by API Gateway's 30s limit
+        lambda_client.invoke(
+            FunctionName=os.environ['AWS_LAMBDA_FUNCTION_NAME'],
+            InvocationType='Event',
+            Payload=json.dumps({'job_action': 'run', 'job_id': job['job_id']})
+        )
+    else:
+        threading.Thread(target=run_job, args=(job['job_id'],), daemon=True).start()
+
+    print(f"Started job {job['job_id']} ({ASYNC_DISPATCH})")
+
+    return cors_response(202, {
+        'success': True,
+        'job_id': job['job_id'],
+        'status': job['status'],
+        'status_path': f"/jobs/{job['job_id']}"
+    })
+
+
+def run_job(job_id: str) -> None:
+    """Generate an async job's documents, recording its progress and result in the job store"""
+    job = job_store.get(job_id)
+    if not job:
+        print(f"Job {job_id} not found")
+        return
+
+    job_store.update(job_id, status=RUNNING)
+
+    response = handle_generation_request(job['request'])
+    status = SUCCEEDED if response['statusCode'] == 200 else FAILED
+    result = json.loads(response['body'])
+
+    job_store.update(job_id, status=status, status_code=response['statusCode'], result=result)
+    print(f"Job {job_id} {status}")
+
+    callback_url = job['request'].get('callback_url')
+    if callback_url:
+        send_callback(callback_url, {'job_id': job_id, 'status': status, 'result': result})
+
+
+def send_callback(url: str, payload: Dict[str, Any]) -> None:
+    """POST a finished job's result to the caller's callback URL; failures are only logged"""
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json'},
+        method='POST'
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=CALLBACK_TIMEOUT_SECONDS) as response:
+            print(f"Callback to {url}: HTTP {response.status}")
+    except Exception as e:
+        print(f"Callback to {url} failed: {e}")
+
+
+def get_job_status(job_id: Optional[str], owner: str) -> Dict[str, Any]:
+    """
+    Status of an async job, with its result once finished
+
+    Jobs are only visible to the user who started them.
+    """
+    job = job_store.get(job_id) if job_id else None
+    if not job or job.get('owner', '') != owner:
+        return cors_response(404, {'error': 'Job not found'})
+
+    response = {
+        'job_id': job['job_id'],
+        'status': job['status'],
+        'created_at': job['created_at'],
+        'updated_at': job['updated_at']
+    }
+    if job['status'] in FINISHED_STATUSES:
+        response['status_code'] = job.get('status_code')
+        response['result'] = job.get('result')
+
+    return cors_response(200, response)
+
+
+def choose_mode(body: Dict[str, Any]) -> str:
+    """
+    Decide per request whether to bypass the agent
+
+    An explicit 'direct' or 'agent' mode is honoured ('direct' still needs a
+    generation engine to be available). Otherwise a free-form prompt goes to
+    the agent and a complete structured request is generated directly.
+
+    Returns:
+        'direct' or 'agent'
+    """
+    requested = body.get('mode', 'auto')
+    direct_available = bool(CONTRACT_GENERATOR_FUNCTION) or DIRECT_GENERATION == 'in-process'
+
+    if requested == 'agent':
+        return 'agent'
+    if requested == 'direct':
+        return 'direct' if direct_available else 'agent'
+
+    if body.get('prompt'):
+        return 'agent'
+
+    structured = all(body.get(field) for field in ('company', 'signatory_name', 'signatory_title'))
+    return 'direct' if structured and direct_available else 'agent'
+
+
+def invoke_agent(prompt: str, document_types: Optional[list] = None) -> Dict[str, Any]:
+    """
+    Send a prompt to the Bedrock Agent and collect the generated documents from its traces
+
+    Returns:
+        API response with the agent's reply and any document URLs
+    """
+    try:
         print(f"Invoking Bedrock Agent with prompt: {prompt}")
 
         # Invoke Bedrock Agent
@@ -82,82 +322,46 @@ def lambda_handler(event, context):
         # Process streaming response
         event_stream = response['completion']
         full_response = ""
-        documents = []  # Collect all documents (NDA and/or MSA)
-        company_details = None
-        expected_doc_count = len(document_types)  # How many documents we're expecting
+        # How many documents we're expecting (unknown for free-form prompts)
+        expected_doc_count = len(document_types) if document_types else None
+        traces = AgentTraceProcessor(expected_doc_count)
 
         for event in event_stream:
-            print(f"Event keys: {event.keys()}")
+            log_debug(f"Event keys: {list(event.keys())}")
 
             if 'chunk' in event:
                 chunk = event['chunk']
                 if 'bytes' in chunk:
                     chunk_text = chunk['bytes'].decode('utf-8')
                     full_response += chunk_text
-                    print(f"Chunk text: {chunk_text[:200]}")
+                    log_debug(f"Chunk text: {chunk_text[:200]}")
 
             elif 'trace' in event:
-                trace = event['trace']
-                print(f"Trace keys: {trace.keys()}")
-
-                # Extract document generation result from trace
-                trace_str = str(trace)
-                if 'download_url' in trace_str:
-                    print("Found download_url in trace")
-                    # Parse the trace to extract structured data
-                    if 'trace' in trace:
-                        print(f"Inner trace keys: {trace['trace'].keys()}")
-                        if 'orchestrationTrace' in trace.get('trace', {}):
-                            orch = trace['trace']['orchestrationTrace']
-                            print(f"Orchestration trace keys: {orch.keys()}")
-                            if 'observation' in orch:
-                                obs = orch['observation']
-                                print(f"Observation keys: {obs.keys()}")
-                                if 'actionGroupInvocationOutput' in obs:
-                                    output = obs['actionGroupInvocationOutput']
-                                    print(f"Action output keys: {output.keys()}")
-                                    if 'text' in output:
-                                        print(f"Action output text: {output['text'][:500]}")
-                                        try:
-                                            doc_data = json.loads(output['text'])
-                                            print(f"Parsed document data successfully")
-                                            if doc_data.get('success'):
-                                                # Determine document type from s3_key
-                                                s3_key = doc_data.get('s3_key', '')
-                                                doc_type = 'nda' if 'nda' in s3_key.lower() else 'msa'
-
-                                                documents.append({
-                                                    'type': doc_type,
-                                                    'download_url': doc_data.get('download_url'),
-                                                    's3_key': s3_key
-                                                })
-                                                print(f"Collected {len(documents)}/{expected_doc_count} documents")
-
-                                                # Save company details from first document
-                                                if not company_details:
-                                                    company_details = doc_data.get('company_details', {})
-
-                                                # Early exit: Return immediately once we have all expected documents
-                                                # This prevents API Gateway 30-second timeout
-                                                if len(documents) >= expected_doc_count:
-                                                    print(f"All {expected_doc_count} documents collected, returning early")
-                                                    response_data = {
-                                                        'success': True,
-                                                        'message': f"Successfully generated {len(documents)} document(s)",
-                                                        'company': company_details or {},
-                                                        'documents': documents,
-                                                        'expires_in': '1 hour'
-                                                    }
-                                                    return cors_response(200, response_data)
-                                        except Exception as e:
-                                            print(f"Failed to parse document data: {e}")
+                traces.process(event['trace'])
+
+                # Early exit: Return immediately once we have all expected documents
+                # This prevents API Gateway 30-second timeout
+                if traces.complete:
+                    print(f"All {expected_doc_count} documents collected, returning early")
+                    response_data = {
+                        'success': True,
+                        'mode': 'agent',
+                        'message': f"Successfully generated {len(traces.documents)} document(s)",
+                        'company': traces.company_details or {},
+                        'documents': traces.documents,
+                        'expires_in': '1 hour'
+                    }
+                    return cors_response(200, response_data)
+
+        documents = traces.documents
+        company_details = traces.company_details
 
         # Return response
-        print(f"Documents collected: {len(documents)}")
-        print(f"Documents: {documents}")
+        print(f"Documents collected: {len(documents)} ({traces.outputs_parsed} action outputs parsed)")
         if documents and len(documents) > 0:
             response_data = {
                 'success': True,
+                'mode': 'agent',
                 'message': full_response,
                 'company': company_details or {},
                 'documents': documents,
@@ -170,6 +374,7 @@ def lambda_handler(event, context):
             print("No documents collected, returning fallback response")
             return cors_response(200, {
                 'success': True,
+                'mode': 'agent',
                 'message': full_response,
                 'note': 'Documents generated but structured data not available. Check CloudWatch logs.'
             })
@@ -185,6 +390,59 @@ def lambda_handler(event, context):
         })
 
 
+def generate_direct(company: str, signatory_name: str, signatory_title: str, document_types: list) -> Dict[str, Any]:
+    """
+    Generate documents without the agent: in-process, or with a single direct
+    invoke of the contract generator
+
+    Returns:
+        API response with every document's presigned URL
+    """
+    event = {
+        'action': 'generateBundle',
+        'company': company,
+        'signatory_name': signatory_name,
+        'signatory_title': signatory_title,
+        'document_types': document_types
+    }
+
+    result = None
+    if DIRECT_GENERATION == 'in-process':
+        try:
+            from contract_generator import handle_bundle_request
+        except ImportError as e:
+            print(f"Contract generator not packaged with this handler ({e}); invoking it instead")
+        else:
+            print(f"Generating {document_types} in-process")
+            result = handle_bundle_request(event)
+
+    if result is None:
+        print(f"Invoking {CONTRACT_GENERATOR_FUNCTION} directly for: {document_types}")
+        response = lambda_client.invoke(
+            FunctionName=CONTRACT_GENERATOR_FUNCTION,
+            InvocationType='RequestResponse',
+            Payload=json.dumps(event)
+        )
+        result = json.loads(response['Payload'].read())
+        if response.get('FunctionError'):
+            result = {'success': False, 'error': result.get('errorMessage')}
+
+    if not result.get('success'):
+        error = result.get('error') or 'Document generation failed'
+        # Requests the user can fix aren't server errors: bad input, or a company we can't pin down
+        status_code = GENERATION_ERROR_STATUS.get(result.get('error_type'), 500)
+        return cors_response(status_code, {'error': error, 'message': 'Failed to generate documents'})
+
+    return cors_response(200, {
+        'success': True,
+        'mode': 'direct',
+        'message': result['message'],
+        'company': result.get('company_details', {}),
+        'documents': result['documents'],
+        'expires_in': result.get('expires_in', '1 hour')
+    })
+
+
 def cors_response(status_code: int, body: Dict[str, Any]) -> Dict[str, Any]:
     """Build response with CORS headers"""
     return {
@@ -193,7 +451,7 @@ def cors_response(status_code: int, body: Dict[str, Any]) -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*',  # Will restrict this to CloudFront domain later
             'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-            'Access-Control-Allow-Methods': 'POST,OPTIONS'
+            'Access-Control-Allow-Methods': 'GET,POST,OPTIONS'
         },
         'body': json.dumps(body)
     }
@@ -1,29 +1,22 @@
 """
 NDA Generator Lambda Function
 Generates NDAs by fetching company data from Companies House and populating templates
+
+Thin wrapper over the shared contract generation engine in contract_generator.py
 """
 
 import json
-import boto3
-import os
-from typing import Dict, List
-from datetime import datetime
-import io
-import re
-from companies_house import CompaniesHouseClient
-
-# Try to import python-docx, will be available in Lambda layer
-try:
-    from docx import Document
-    from docx.shared import Pt, RGBColor
-except ImportError:
-    print("Warning: python-docx not available. Will fail when generating documents.")
+from typing import Dict
 
-s3 = boto3.client('s3')
+from contract_generator import (
+    DOCUMENT_TYPES,
+    generate_document,
+    handle_agent_request,
+    is_company_number,
+    populate_template,
+)
 
-KNOWLEDGE_BASE_BUCKET = os.environ.get('KNOWLEDGE_BASE_BUCKET', '')
-COMPANIES_HOUSE_API_KEY = os.environ.get('COMPANIES_HOUSE_API_KEY', '')  # Optional
-NDA_TEMPLATE_KEY = 'templates/Non-Disclosure Agreement Template v01 JC OFFLINE.docx'
+NDA_TEMPLATE_KEY = DOCUMENT_TYPES['nda']['template_key']
 
 
 def lambda_handler(event, context):
@@ -32,62 +25,7 @@ def lambda_handler(event, context):
     """
     print(f"Received event: {json.dumps(event)}")
 
-    action_group = event.get('actionGroup')
-    function = event.get('function')
-    parameters = event.get('parameters', [])
-
-    # Extract parameters
-    company_identifier = None
-    signatory_name = None
-    signatory_title = None
-
-    for param in parameters:
-        if param['name'] == 'company_identifier':
-            company_identifier = param['value']
-        elif param['name'] == 'signatory_name':
-            signatory_name = param['value']
-        elif param['name'] == 'signatory_title':
-            signatory_title = param['value']
-
-    if not company_identifier:
-        return error_response("Company identifier (name or number) is required")
-
-    if not signatory_name or not signatory_title:
-        return error_response("Signatory name and title are required")
-
-    try:
-        # Generate the NDA
-        result = generate_nda(
-            company_identifier=company_identifier,
-            signatory_name=signatory_name,
-            signatory_title=signatory_title
-        )
-
-        # Format response for Bedrock Agent
-        response_body = {
-            "TEXT": {
-                "body": json.dumps(result)
-            }
-        }
-
-        action_response = {
-            'actionGroup': action_group,
-            'function': function,
-            'functionResponse': {
-                'responseBody': response_body
-            }
-        }
-
-        return {
-            'response': action_response,
-            'messageVersion': event['messageVersion']
-        }
-
-    except Exception as e:
-        print(f"Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return error_response(str(e))
+    return handle_agent_request(event, ['nda'])
 
 
 def generate_nda(company_identifier: str, signatory_name: str, signatory_title: str) -> Dict:
@@ -102,92 +40,7 @@ def generate_nda(company_identifier: str, signatory_name: str, signatory_title:
     Returns:
         Dictionary with generation results
     """
-    print(f"Generating NDA for: {company_identifier}")
-
-    # Step 1: Get company details from Companies House
-    ch_client = CompaniesHouseClient(COMPANIES_HOUSE_API_KEY or None)
-    company_data = None
-
-    # Check if it's a company number or name
-    if is_company_number(company_identifier):
-        print(f"Fetching company by number: {company_identifier}")
-        company_data = ch_client.get_company_details(company_identifier)
-    else:
-        print(f"Searching for company by name: {company_identifier}")
-        # Search by name and use first result
-        from companies_house import search_company_by_name
-        search_results = search_company_by_name(company_identifier, COMPANIES_HOUSE_API_KEY or None)
-
-        if not search_results:
-            raise ValueError(f"No company found with name: {company_identifier}")
-
-        # Use the first result
-        first_result = search_results[0]
-        print(f"Found company: {first_result['company_name']} ({first_result['company_number']})")
-        company_data = ch_client.get_company_details(first_result['company_number'])
-
-    print(f"Company data retrieved: {company_data['company_name']}")
-
-    # Step 2: Download NDA template from S3
-    print(f"Downloading template from S3: {NDA_TEMPLATE_KEY}")
-    template_obj = s3.get_object(Bucket=KNOWLEDGE_BASE_BUCKET, Key=NDA_TEMPLATE_KEY)
-    template_content = template_obj['Body'].read()
-
-    # Step 3: Populate template with company data
-    print("Populating template...")
-    populated_doc = populate_nda_template(
-        template_content=template_content,
-        company_data=company_data,
-        signatory_name=signatory_name,
-        signatory_title=signatory_title
-    )
-
-    # Step 4: Save generated NDA to S3
-    timestamp = datetime.utcnow().strftime('%Y%m%d-%H%M%S')
-    company_name_safe = re.sub(r'[^a-zA-Z0-9-]', '_', company_data['company_name'])
-    output_key = f"generated-ndas/NDA_{company_name_safe}_{timestamp}.docx"
-
-    print(f"Saving NDA to S3: {output_key}")
-    s3.put_object(
-        Bucket=KNOWLEDGE_BASE_BUCKET,
-        Key=output_key,
-        Body=populated_doc,
-        ContentType='application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-        ServerSideEncryption='aws:kms',  # Required by bucket policy
-        Metadata={
-            'company_name': company_data['company_name'],
-            'company_number': company_data['company_number'],
-            'signatory_name': signatory_name,
-            'signatory_title': signatory_title,
-            'generated_date': timestamp
-        }
-    )
-
-    # Generate download URL (presigned, valid for 1 hour)
-    download_url = s3.generate_presigned_url(
-        'get_object',
-        Params={'Bucket': KNOWLEDGE_BASE_BUCKET, 'Key': output_key},
-        ExpiresIn=3600
-    )
-
-    return {
-        'success': True,
-        'message': f'NDA generated successfully for {company_data["company_name"]}',
-        'company_details': {
-            'name': company_data['company_name'],
-            'number': company_data['company_number'],
-            'type': company_data['company_type'],
-            'jurisdiction': company_data['jurisdiction'],
-            'address': company_data['registered_office_address']
-        },
-        'signatory': {
-            'name': signatory_name,
-            'title': signatory_title
-        },
-        's3_key': output_key,
-        'download_url': download_url,
-        'expires_in': '1 hour'
-    }
+    return generate_document('nda', company_identifier, signatory_name, signatory_title)
 
 
 def populate_nda_template(
@@ -208,121 +61,7 @@ def populate_nda_template(
     Returns:
         Populated document as bytes
     """
-    # Load document from bytes
-    doc = Document(io.BytesIO(template_content))
-
-    # Build replacement dictionary matching exact template fields
-    replacements = {
-        '[Date]': datetime.utcnow().strftime('%d %B %Y'),
-        '[Recipient Name]': company_data['company_name'],  # Full company name
-        '[Recipient]': company_data['company_name'],  # Short reference to company
-        '[Company Type]': company_data['company_type'],
-        '[Jurisdiction]': company_data['jurisdiction'],
-        '[Company Number]': company_data['company_number'],
-        '[Registered Address]': company_data['registered_office_address'],
-        '[Name]': signatory_name,  # Signatory name
-        '[Title]': signatory_title,  # Signatory title
-    }
-
-    print(f"Replacements: {replacements}")
-
-    def replace_text_in_paragraph(paragraph, replacements):
-        """Replace text in a paragraph, handling text split across runs"""
-        full_text = paragraph.text
-        for key, value in replacements.items():
-            if key in full_text:
-                print(f"Replacing {key} with {value} in paragraph")
-                full_text = full_text.replace(key, value)
-
-        # Only update if something changed
-        if full_text != paragraph.text:
-            # Clear existing runs and add new text
-            for run in paragraph.runs:
-                run.text = ""
-            if paragraph.runs:
-                paragraph.runs[0].text = full_text
-            else:
-                paragraph.add_run(full_text)
-
-    # Replace placeholders in paragraphs
-    for paragraph in doc.paragraphs:
-        replace_text_in_paragraph(paragraph, replacements)
-
-    # Replace placeholders in tables
-    for table in doc.tables:
-        for row in table.rows:
-            for cell in row.cells:
-                for paragraph in cell.paragraphs:
-                    replace_text_in_paragraph(paragraph, replacements)
-
-    # Replace placeholders in headers and footers
-    for section in doc.sections:
-        # Header paragraphs
-        for paragraph in section.header.paragraphs:
-            replace_text_in_paragraph(paragraph, replacements)
-
-        # Header tables
-        for table in section.header.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for paragraph in cell.paragraphs:
-                        replace_text_in_paragraph(paragraph, replacements)
-
-        # Footer paragraphs
-        for paragraph in section.footer.paragraphs:
-            replace_text_in_paragraph(paragraph, replacements)
-
-        # Footer tables
-        for table in section.footer.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for paragraph in cell.paragraphs:
-                        replace_text_in_paragraph(paragraph, replacements)
-
-    # Save to bytes
-    output = io.BytesIO()
-    doc.save(output)
-    output.seek(0)
-
-    return output.read()
-
-
-def is_company_number(identifier: str) -> bool:
-    """
-    Check if the identifier looks like a Companies House number
-
-    Company numbers are typically:
-    - 8 characters (with leading zeros)
-    - May have letter prefix (e.g., SC, OC, NI)
-    - Format: [PREFIX]NNNNNN or NNNNNNNN
-    """
-    # Remove spaces
-    identifier = identifier.replace(' ', '').upper()
-
-    # Check if it matches company number pattern
-    # Alphanumeric, 6-8 characters
-    if re.match(r'^[A-Z]{0,2}\d{6,8}$', identifier):
-        return True
-
-    return False
-
-
-def error_response(error_message: str) -> Dict:
-    """Format error response for Bedrock Agent"""
-    return {
-        'response': {
-            'functionResponse': {
-                'responseBody': {
-                    'TEXT': {
-                        'body': json.dumps({
-                            'success': False,
-                            'error': error_message
-                        })
-                    }
-                }
-            }
-        }
-    }
+    return populate_template('nda', template_content, company_data, signatory_name, signatory_title)
 
 
 # Testing
@@ -0,0 +1,185 @@
+"""
+Presentation Generator
+Turns a Markdown proposal into a PowerPoint deck for the Bedrock Agent (or a
+direct invocation), stores it in S3 like the contracts and returns a
+presigned download URL. Runs inside the contract generator Lambda, sharing
+its warm template cache; decks are built in memory and never touch disk.
+"""
+
+import io
+import json
+import os
+import re
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+import contract_generator
+from contract_generator import (TEMPLATE_CACHE_TTL_SECONDS, TRANSFER_CONFIG, ClientError, describe_expiry,
+                                error_response, get_template, get_template_version)
+from proposal_pptx import create_presentation, load_template, parse_proposal
+
+# Corporate template in the knowledge base bucket (e.g. 'templates/Proposal Template.pptx');
+# a plain 10 x 7.5 inch deck when not set
+PRESENTATION_TEMPLATE_KEY = os.environ.get('PRESENTATION_TEMPLATE_KEY', '')
+
+PRESENTATION_OUTPUT_PREFIX = 'generated-proposals/Proposal'
+
+PPTX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.presentationml.presentation'
+
+# Agent function, and direct invocation action, that render a presentation
+PRESENTATION_FUNCTION = 'generatePresentation'
+
+# When the template was last found missing; retried after TEMPLATE_CACHE_TTL_SECONDS
+_template_missing_at = None
+
+
+def handle_presentation_request(event: Dict) -> Dict:
+    """
+    Render a presentation from an agent action group event or a direct invocation
+
+    Direct invocations pass {"action": "generatePresentation", "proposal": "...",
+    "title": "..."} and get the result dict back; agent events get the
+    action group response format.
+    """
+    if event.get('action') == PRESENTATION_FUNCTION:
+        try:
+            return generate_presentation(event.get('proposal', ''), event.get('title', ''))
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return {'success': False, 'error': str(e)}
+
+    parameters = {param['name']: param['value'] for param in event.get('parameters', [])}
+    proposal = parameters.get('proposal_markdown')
+
+    if not proposal:
+        return error_response("The proposal text (proposal_markdown) is required")
+
+    try:
+        result = generate_presentation(proposal, parameters.get('title', ''))
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return error_response(str(e))
+
+    return {
+        'response': {
+            'actionGroup': event.get('actionGroup'),
+            'function': event.get('function'),
+            'functionResponse': {
+                'responseBody': {
+                    'TEXT': {
+                        'body': json.dumps(result)
+                    }
+                }
+            }
+        },
+        'messageVersion': event['messageVersion']
+    }
+
+
+def generate_presentation(proposal: str, title: str = '', expires_in: int = 3600) -> Dict:
+    """
+    Render a proposal to PowerPoint in memory, upload it and presign a download URL
+
+    Args:
+        proposal: Proposal Markdown (#/##/### headings become slides)
+        title: Name for the file; defaults to the first slide's title
+        expires_in: Presigned URL lifetime in seconds
+
+    Returns:
+        Dictionary with the S3 key, download URL and slide count
+
+    Raises:
+        ValueError if the proposal has no headings to make slides from
+    """
+    slides = parse_proposal(proposal)
+    if not slides:
+        raise ValueError("The proposal has no headings (#, ## or ###) to turn into slides")
+
+    title = title or slides[0]['title']
+
+    output = io.BytesIO()
+    slide_count = create_presentation(slides, output, presentation_template())
+    output.seek(0)
+
+    timestamp = datetime.utcnow().strftime('%Y%m%d-%H%M%S')
+    title_safe = re.sub(r'[^a-zA-Z0-9-]', '_', title)[:60]
+    output_key = f"{PRESENTATION_OUTPUT_PREFIX}_{title_safe}_{timestamp}.pptx"
+
+    print(f"Saving presentation ({slide_count} slides) to S3: {output_key}")
+    contract_generator.s3.upload_fileobj(
+        output,
+        contract_generator.KNOWLEDGE_BASE_BUCKET,
+        output_key,
+        ExtraArgs={
+            'ContentType': PPTX_CONTENT_TYPE,
+            'ServerSideEncryption': 'aws:kms',  # Required by bucket policy
+            'Metadata': {
+                'slide_count': str(slide_count),
+                'generated_date': timestamp
+            }
+        },
+        Config=TRANSFER_CONFIG
+    )
+
+    download_url = contract_generator.s3.generate_presigned_url(
+        'get_object',
+        Params={'Bucket': contract_generator.KNOWLEDGE_BASE_BUCKET, 'Key': output_key},
+        ExpiresIn=expires_in
+    )
+
+    return {
+        'success': True,
+        'document_type': 'presentation',
+        'message': f"Presentation '{title}' generated with {slide_count} slides",
+        'title': title,
+        'slide_count': slide_count,
+        's3_key': output_key,
+        'download_url': download_url,
+        'expires_in': describe_expiry(expires_in)
+    }
+
+
+def presentation_template() -> Optional[str]:
+    """
+    Name of the loaded corporate template, or None for a plain deck
+
+    The bytes come from the contract generator's template cache (revalidated
+    by ETag); layouts are resolved once per template version. A missing
+    template isn't looked for again until TEMPLATE_CACHE_TTL_SECONDS pass.
+    """
+    global _template_missing_at
+
+    if not PRESENTATION_TEMPLATE_KEY:
+        return None
+
+    if _template_missing_at is not None and time.time() - _template_missing_at < TEMPLATE_CACHE_TTL_SECONDS:
+        return None
+
+    try:
+        content = get_template(PRESENTATION_TEMPLATE_KEY)
+    except ClientError as e:
+        print(f"Presentation template {PRESENTATION_TEMPLATE_KEY} unavailable ({e}); using a plain deck")
+        _template_missing_at = time.time()
+        return None
+
+    _template_missing_at = None
+    name = f"{PRESENTATION_TEMPLATE_KEY}@{get_template_version(PRESENTATION_TEMPLATE_KEY)}"
+    load_template(name, content)
+    return name
+
+
+# Testing
+if __name__ == '__main__':
+    test_event = {
+        'action': PRESENTATION_FUNCTION,
+        'proposal': '# Cloud Migration Proposal\nPrepared for Acme\n### Scope\n- Discovery\n- Migration\n'
+                    '### Costs\n| Phase | Cost |\n|---|---|\n| Discovery | £10,000 |',
+    }
+
+    result = handle_presentation_request(test_event)
+    print(json.dumps(result, indent=2))
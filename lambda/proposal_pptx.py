@@ -0,0 +1,397 @@
+"""
+Proposal to PowerPoint
+Turns Jamie's Markdown proposals into PowerPoint decks. Used by
+proposal-to-pptx.py and jamie-cli.py; StreamingPresentation builds the deck
+slide by slide while the agent's response is still streaming.
+"""
+
+import io
+import os
+import re
+
+from pptx import Presentation
+from pptx.util import Inches, Pt
+
+
+class ProposalParser:
+    """
+    Line-at-a-time state machine turning proposal Markdown into slides
+
+    Headings (#, ##, ###) close the current slide and open the next; the
+    open table is referenced directly, so each row is appended in constant
+    time. Any non-table line (including a blank one) closes the table.
+
+    Usage:
+        parser = ProposalParser()
+        for line in lines:
+            slide = parser.feed_line(line)
+            if slide:
+                ...
+        last = parser.close()
+    """
+
+    # Heading prefix -> slide type
+    HEADINGS = {'# ': 'title', '## ': 'section', '### ': 'content'}
+
+    def __init__(self):
+        self.slide = None
+        self.table = None
+
+    def feed_line(self, line):
+        """
+        Process one line
+
+        Returns:
+            The previous slide when this line starts a new one, otherwise None
+        """
+        line = line.strip()
+
+        if not line:
+            self.table = None
+            return None
+
+        if line[0] == '#':
+            hashes, space, title = line.partition(' ')
+            slide_type = self.HEADINGS.get(hashes + space)
+            if slide_type:
+                finished = self.slide
+                self.slide = {'type': slide_type, 'title': title, 'content': []}
+                self.table = None
+                return finished
+
+        slide = self.slide
+        if slide is None:
+            return None
+
+        # Table rows
+        if line[0] == '|':
+            row = [cell.strip() for cell in line.split('|')[1:-1]]
+            if self.table is None:
+                self.table = {'type': 'table', 'rows': []}
+                slide['content'].append(self.table)
+            if not all(cell.startswith('-') for cell in row):  # Skip separator rows
+                self.table['rows'].append(row)
+            return None
+
+        self.table = None
+
+        # Subheading (#### Subheading)
+        if line.startswith('#### '):
+            slide['content'].append({'type': 'subheading', 'text': line[5:]})
+
+        # Bullet points
+        elif line.startswith('- ') or line.startswith('* '):
+            slide['content'].append({'type': 'bullet', 'text': line[2:]})
+
+        # Regular paragraphs
+        else:
+            slide['content'].append({'type': 'text', 'text': line})
+
+        return None
+
+    def close(self):
+        """End of input: the last slide, if any"""
+        finished, self.slide, self.table = self.slide, None, None
+        return finished
+
+
+def iter_slides(lines):
+    """Yield slides from an iterable of lines (a file, a stream, a list) as each one completes"""
+    parser = ProposalParser()
+    for line in lines:
+        slide = parser.feed_line(line)
+        if slide:
+            yield slide
+
+    slide = parser.close()
+    if slide:
+        yield slide
+
+
+def parse_proposal(text):
+    """
+    Parse markdown proposal into structured slides
+
+    Args:
+        text: Proposal text, or any iterable of lines (e.g. an open file)
+    """
+    if isinstance(text, str):
+        text = io.StringIO(text)
+    return list(iter_slides(text))
+
+
+# Layouts for each slide type, looked up by name in the template (first match wins)
+LAYOUT_NAMES = {
+    'title': ['Title Slide'],
+    'section': ['Section Header', 'Section Title'],
+    'content': ['Title and Content', 'Title and Body', 'Title Only'],
+}
+
+# Fallback layout positions, as in python-pptx's default template
+DEFAULT_LAYOUT_INDEX = {'title': 0, 'section': 2, 'content': 1}
+
+# Corporate template used when none is given (path to a .pptx)
+PPTX_TEMPLATE = os.environ.get('PPTX_TEMPLATE', '')
+
+# Table rows per slide; longer tables continue on "(cont.)" slides with the header repeated
+TABLE_ROWS_PER_SLIDE = 14
+
+# Templates by name: {'content': bytes, 'layouts': {slide type: layout index}}; kept for the process
+_templates = {}
+
+
+def load_template(name, content=None):
+    """
+    A template's bytes and layout indices, read and resolved once per name
+
+    Args:
+        name: Template path, or any unique name (e.g. S3 key and ETag) when content is given
+        content: Template bytes, for templates not on local disk
+    """
+    if name not in _templates:
+        if content is None:
+            with open(name, 'rb') as f:
+                content = f.read()
+        _templates[name] = {'content': content, 'layouts': resolve_layouts(Presentation(io.BytesIO(content)))}
+    return _templates[name]
+
+
+def resolve_layouts(prs):
+    """Layout index for each slide type, by layout name with positional fallbacks"""
+    by_name = {layout.name.strip().lower(): index for index, layout in enumerate(prs.slide_layouts)}
+    layouts = {}
+
+    for slide_type, names in LAYOUT_NAMES.items():
+        matches = [by_name[name.lower()] for name in names if name.lower() in by_name]
+        fallback = DEFAULT_LAYOUT_INDEX[slide_type]
+        layouts[slide_type] = matches[0] if matches else min(fallback, len(prs.slide_layouts) - 1)
+
+    return layouts
+
+
+def new_presentation(template=None):
+    """
+    Empty presentation and its layout for each slide type
+
+    Args:
+        template: Template name from load_template (or a path); None for the
+            default 10 x 7.5 inch presentation (or PPTX_TEMPLATE, if set)
+
+    Returns:
+        (presentation, {slide type: slide layout})
+    """
+    template = template or PPTX_TEMPLATE
+
+    if template:
+        loaded = load_template(template)
+        prs = Presentation(io.BytesIO(loaded['content']))
+        remove_slides(prs)
+        indices = loaded['layouts']
+    else:
+        prs = Presentation()
+        prs.slide_width = Inches(10)
+        prs.slide_height = Inches(7.5)
+        indices = DEFAULT_LAYOUT_INDEX
+
+    return prs, {slide_type: prs.slide_layouts[index] for slide_type, index in indices.items()}
+
+
+def remove_slides(prs):
+    """Drop any example slides a template ships with, keeping its masters and layouts"""
+    slide_ids = prs.slides._sldIdLst
+    for slide_id in list(slide_ids):
+        prs.part.drop_rel(slide_id.rId)
+        slide_ids.remove(slide_id)
+
+
+def clean_markdown(text):
+    """Strip **bold** markers"""
+    return re.sub(r'\*\*(.*?)\*\*', r'\1', text)
+
+
+def body_placeholder(slide):
+    """The slide's first non-title placeholder, if its layout has one"""
+    return next((shape for shape in slide.placeholders if shape.placeholder_format.idx != 0), None)
+
+
+def add_slide(prs, slide_data, layouts):
+    """
+    Add one parsed slide to a presentation
+
+    Args:
+        prs: Presentation from new_presentation
+        slide_data: Slide from parse_proposal
+        layouts: Layouts from new_presentation
+
+    Returns:
+        Number of slides added (long tables continue on extra slides)
+    """
+    slide = prs.slides.add_slide(layouts[slide_data['type']])
+    slide.shapes.title.text = slide_data['title']
+
+    if slide_data['type'] == 'title':
+        # Add subtitle if available
+        subtitle = body_placeholder(slide)
+        if slide_data['content'] and subtitle is not None:
+            subtitle.text = '\n'.join([
+                item['text'] for item in slide_data['content']
+                if item['type'] == 'text'
+            ])
+        return 1
+
+    if slide_data['type'] == 'section':
+        return 1
+
+    # Content slide: text in the body placeholder, tables as table shapes below it
+    items = [item for item in slide_data['content'] if item['type'] != 'table']
+    tables = [item['rows'] for item in slide_data['content'] if item['type'] == 'table' and item['rows']]
+
+    body = body_placeholder(slide)
+    if body is not None:
+        left, top, width, height = body.left, body.top, body.width, body.height
+    else:
+        left, top = Inches(0.5), Inches(1.5)
+        width, height = prs.slide_width - Inches(1), prs.slide_height - Inches(2)
+
+    if tables and not items:
+        if body is not None:
+            body._element.getparent().remove(body._element)
+        table_top = top
+    else:
+        text_height = min(height * 0.45, Inches(0.4) * len(items)) if tables else height
+        if body is None:
+            body = slide.shapes.add_textbox(left, top, width, text_height)
+        body.height = int(text_height)
+        add_text_items(body.text_frame, items)
+        table_top = top + int(text_height)
+
+    added = 1
+    table_height = (top + height - table_top) // max(len(tables), 1)
+    # Rows that fit at full height (0.4in) under the text; the header takes one
+    first_rows = min(TABLE_ROWS_PER_SLIDE, max(table_height // Inches(0.4) - 1, 0))
+
+    for index, rows in enumerate(tables):
+        header, body_rows = rows[0], rows[1:]
+        first, rest = body_rows[:first_rows], body_rows[first_rows:]
+        if first or not body_rows:
+            add_table(slide, [header] + first, left, table_top + index * table_height, width, table_height)
+
+        # Overflow rows go on continuation slides, under a repeated header
+        while rest:
+            chunk, rest = rest[:TABLE_ROWS_PER_SLIDE], rest[TABLE_ROWS_PER_SLIDE:]
+            continuation = prs.slides.add_slide(layouts['content'])
+            continuation.shapes.title.text = f"{slide_data['title']} (cont.)"
+            placeholder = body_placeholder(continuation)
+            if placeholder is not None:
+                placeholder._element.getparent().remove(placeholder._element)
+            add_table(continuation, [header] + chunk, left, top, width, height)
+            added += 1
+
+    return added
+
+
+def add_text_items(tf, items):
+    """Subheadings, bullets and paragraphs into a text frame"""
+    tf.clear()
+
+    for item in items:
+        p = tf.add_paragraph()
+        p.text = clean_markdown(item['text'])
+        p.level = 0
+
+        if item['type'] == 'subheading':
+            p.font.bold = True
+            p.font.size = Pt(18)
+
+
+def add_table(slide, rows, left, top, width, max_height):
+    """A native table (first row as header), sized to its rows within max_height"""
+    columns = max(len(row) for row in rows)
+    row_height = min(Inches(0.4), max_height // len(rows))
+    font_size = Pt(12) if len(rows) <= 8 else Pt(10)
+
+    table = slide.shapes.add_table(len(rows), columns, left, top, width, row_height * len(rows)).table
+
+    for r, row in enumerate(rows):
+        for c in range(columns):
+            cell = table.cell(r, c)
+            cell.text = clean_markdown(row[c]) if c < len(row) else ''
+            for paragraph in cell.text_frame.paragraphs:
+                paragraph.font.size = font_size
+
+    return table
+
+
+def create_presentation(slides, output_file, template=None):
+    """
+    Create PowerPoint presentation from parsed slides
+
+    Args:
+        slides: Slides from parse_proposal
+        output_file: Path or file-like object (e.g. io.BytesIO) to save to
+        template: Template name or path (see new_presentation)
+
+    Returns:
+        Number of slides in the deck
+    """
+    prs, layouts = new_presentation(template)
+
+    count = 0
+    for slide_data in slides:
+        count += add_slide(prs, slide_data, layouts)
+
+    prs.save(output_file)
+    return count
+
+
+class StreamingPresentation:
+    """
+    Builds a deck from proposal text as it arrives
+
+    Each slide is added as soon as the next slide's heading is seen, so only
+    the last slide is left to build when the stream ends.
+
+    Usage:
+        deck = StreamingPresentation()
+        for chunk in chunks:
+            deck.feed(chunk)
+        deck.finish('proposal.pptx')
+    """
+
+    def __init__(self, template=None):
+        """
+        Args:
+            template: Template name or path (see new_presentation)
+        """
+        self.prs, self.layouts = new_presentation(template)
+        self.slide_count = 0
+        self._parser = ProposalParser()
+        self._partial_line = ''
+
+    def feed(self, text):
+        """Add streamed text; chunks may end mid-line"""
+        *lines, self._partial_line = (self._partial_line + text).split('\n')
+        for line in lines:
+            self._add(self._parser.feed_line(line))
+
+    def _add(self, slide_data):
+        if slide_data:
+            self.slide_count += add_slide(self.prs, slide_data, self.layouts)
+
+    def finish(self, output_file):
+        """
+        Add the last slide and save
+
+        Args:
+            output_file: Path or file-like object to save to
+
+        Returns:
+            Number of slides in the deck
+        """
+        if self._partial_line:
+            self._add(self._parser.feed_line(self._partial_line))
+            self._partial_line = ''
+        self._add(self._parser.close())
+
+        self.prs.save(output_file)
+        return self.slide_count
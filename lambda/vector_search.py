@@ -6,9 +6,13 @@ Cost-effective alternative to OpenSearch Serverless (~$0.35/month vs $700/month)
 
 import json
 import boto3
+import hashlib
 import os
-from typing import List, Dict, Tuple
-from datetime import datetime, timedelta
+import re
+import time
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
+from datetime import datetime
 import io
 
 # Import NumPy (will be in Lambda layer)
@@ -24,6 +28,38 @@ KNOWLEDGE_BASE_BUCKET = os.environ.get('KNOWLEDGE_BASE_BUCKET', '')
 VECTORS_PREFIX = 'vectors/'
 EMBEDDING_MODEL_ID = 'amazon.titan-embed-text-v2:0'
 
+# Result cache: repeated searches within the TTL skip the embedding and the scan.
+# Entries belong to one index version (the vector keys and their ETags), so
+# adding, re-embedding or deleting a vector file invalidates them.
+RESULT_CACHE_TTL_SECONDS = int(os.environ.get('RESULT_CACHE_TTL_SECONDS', '300'))
+RESULT_CACHE_MAX_ENTRIES = 256
+
+# Semantic cache: a query whose embedding is at least this similar to a cached
+# query's (same max_results, threshold and index version) gets that query's
+# results, skipping the scan. Lower it to catch more paraphrases at the cost
+# of recall; set it above 1.0 to turn the semantic cache off.
+SEMANTIC_CACHE_THRESHOLD = float(os.environ.get('SEMANTIC_CACHE_THRESHOLD', '0.95'))
+
+# Response shaping defaults, overridable per search. Results carry a preview of
+# the indexed text (a snippet around the passage best matching the query, or
+# its start) and only the listed fields; hits from several vector files of the
+# same document collapse into one. All of it comes from the index entries.
+PREVIEW_LENGTH = int(os.environ.get('PREVIEW_LENGTH', '300'))
+RESULT_FIELDS = os.environ.get('RESULT_FIELDS', 'document,similarity,text,hits')
+SNIPPETS = os.environ.get('SNIPPETS', 'true').lower() == 'true'
+DEDUPE_RESULTS = os.environ.get('DEDUPE_RESULTS', 'true').lower() == 'true'
+
+# Fields a result can carry ('hits' only when deduplicating)
+RESULT_FIELD_NAMES = ['key', 'document', 'similarity', 'text', 'metadata', 'timestamp', 'hits']
+
+# Kept across warm invocations:
+# (query, max_results, threshold, dedupe, version) -> {'query', 'embedding', 'results', 'expires_at'}
+_result_cache = OrderedDict()
+_result_cache_version = None
+
+# Hit counts since the container started, logged with every search
+_cache_stats = {'searches': 0, 'exact_hits': 0, 'semantic_hits': 0}
+
 
 def lambda_handler(event, context):
     """
@@ -39,6 +75,10 @@ def lambda_handler(event, context):
     query = None
     max_results = 5
     similarity_threshold = 0.3
+    preview_length = PREVIEW_LENGTH
+    fields = RESULT_FIELDS
+    snippets = SNIPPETS
+    dedupe = DEDUPE_RESULTS
 
     for param in parameters:
         if param['name'] == 'query':
@@ -47,27 +87,73 @@ def lambda_handler(event, context):
             max_results = int(param['value'])
         elif param['name'] == 'similarity_threshold':
             similarity_threshold = float(param['value'])
+        elif param['name'] == 'preview_length':
+            preview_length = max(0, int(param['value']))
+        elif param['name'] == 'fields':
+            fields = param['value']
+        elif param['name'] == 'snippets':
+            snippets = str(param['value']).lower() == 'true'
+        elif param['name'] == 'dedupe':
+            dedupe = str(param['value']).lower() == 'true'
 
     if not query:
         return error_response("Search query is required")
 
     try:
-        # Perform vector search
-        results = vector_search(
-            query=query,
-            max_results=max_results,
-            similarity_threshold=similarity_threshold
-        )
+        # Listing the index is cheap next to the embedding and the scan, and
+        # tells us whether cached results are still current
+        vector_index = list_vector_index()
+        cache_key = result_cache_key(query, max_results, similarity_threshold, dedupe, index_version(vector_index))
+
+        _cache_stats['searches'] += 1
+        matched_query = None
+
+        results = cached_results(cache_key)
+        cached = results is not None
+
+        if cached:
+            _cache_stats['exact_hits'] += 1
+            print(f"Result cache hit for: {query}")
+        else:
+            # Paraphrases of a cached query reuse its results; only the embedding is paid for
+            query_embedding = generate_embedding(query)
+            matched_query, results = semantic_cached_results(cache_key, query_embedding)
+            cached = results is not None
+
+            if cached:
+                _cache_stats['semantic_hits'] += 1
+                print(f"Semantic cache hit for: {query} (matched: {matched_query})")
+            else:
+                # Perform vector search
+                results = vector_search(
+                    query=query,
+                    max_results=max_results,
+                    similarity_threshold=similarity_threshold,
+                    vector_files=[key for key, _ in vector_index],
+                    query_embedding=query_embedding,
+                    dedupe=dedupe
+                )
+            cache_results(cache_key, results, query_embedding)
+
+        # Shaped per request, so cached results serve any preview or field choice
+        results = shape_results(results, query, preview_length, fields, snippets)
+
+        print(f"Cache stats: {cache_stats()}")
+
+        payload = {
+            "success": True,
+            "query": query,
+            "num_results": len(results),
+            "cached": cached,
+            "results": results
+        }
+        if matched_query:
+            payload["matched_query"] = matched_query
 
         # Format response for Bedrock Agent
         response_body = {
             "TEXT": {
-                "body": json.dumps({
-                    "success": True,
-                    "query": query,
-                    "num_results": len(results),
-                    "results": results
-                })
+                "body": json.dumps(payload, separators=(',', ':'))
             }
         }
 
@@ -91,7 +177,9 @@ def lambda_handler(event, context):
         return error_response(str(e))
 
 
-def vector_search(query: str, max_results: int = 5, similarity_threshold: float = 0.3) -> List[Dict]:
+def vector_search(query: str, max_results: int = 5, similarity_threshold: float = 0.3,
+                  vector_files: Optional[List[str]] = None,
+                  query_embedding: Optional[List[float]] = None, dedupe: bool = False) -> List[Dict]:
     """
     Search for documents using vector similarity (ALICE-style)
 
@@ -99,6 +187,9 @@ def vector_search(query: str, max_results: int = 5, similarity_threshold: float
         query: Search query text
         max_results: Maximum number of results to return
         similarity_threshold: Minimum similarity score (0.0 to 1.0)
+        vector_files: Vector file keys to search, if already listed
+        query_embedding: The query's embedding, if already generated
+        dedupe: Keep only the best hit per document (see dedupe_results)
 
     Returns:
         List of matching documents with similarity scores
@@ -106,10 +197,12 @@ def vector_search(query: str, max_results: int = 5, similarity_threshold: float
     print(f"Vector search for: {query}")
 
     # Step 1: Generate embedding for query
-    query_embedding = generate_embedding(query)
+    if query_embedding is None:
+        query_embedding = generate_embedding(query)
 
     # Step 2: List all vector files in S3
-    vector_files = list_vector_files()
+    if vector_files is None:
+        vector_files = list_vector_files()
 
     if not vector_files:
         print("No vector files found in S3")
@@ -150,6 +243,9 @@ def vector_search(query: str, max_results: int = 5, similarity_threshold: float
     # Step 4: Sort by similarity (descending)
     similarities.sort(key=lambda x: x['similarity'], reverse=True)
 
+    if dedupe:
+        similarities = dedupe_results(similarities)
+
     # Step 5: Return top N results
     results = similarities[:max_results]
 
@@ -158,6 +254,100 @@ def vector_search(query: str, max_results: int = 5, similarity_threshold: float
     return results
 
 
+def dedupe_results(results: List[Dict]) -> List[Dict]:
+    """
+    Keep the best hit for each document
+
+    A document re-embedded by embed-documents.py has one vector file per run,
+    so it can match several times. Each kept result counts its hits.
+
+    Args:
+        results: Matches sorted by similarity (descending)
+    """
+    by_document = {}
+
+    for result in results:
+        document = result['document'] or result['key']
+        if document in by_document:
+            by_document[document]['hits'] += 1
+        else:
+            by_document[document] = {**result, 'hits': 1}
+
+    return list(by_document.values())
+
+
+def shape_results(results: List[Dict], query: str, preview_length: int = PREVIEW_LENGTH,
+                  fields: str = RESULT_FIELDS, snippets: bool = SNIPPETS) -> List[Dict]:
+    """
+    Trim results for the agent's context
+
+    Args:
+        results: Results from vector_search
+        query: Search query, for picking snippets
+        preview_length: Maximum characters of text per result (0 for no text)
+        fields: Comma-separated fields to return (see RESULT_FIELD_NAMES)
+        snippets: Take the preview around the best-matching passage rather than from the start
+
+    Returns:
+        New result dicts; the input (possibly cached) is left untouched
+    """
+    wanted = [name for name in RESULT_FIELD_NAMES if name in {f.strip() for f in fields.split(',')}]
+    shaped = []
+
+    for result in results:
+        item = {name: result[name] for name in wanted if name in result}
+
+        if 'similarity' in item:
+            item['similarity'] = round(item['similarity'], 4)
+
+        if 'text' in item:
+            text = item['text']
+            if snippets:
+                item['text'] = extract_snippet(text, query, preview_length)
+            elif preview_length <= 0:
+                item['text'] = ''
+            elif len(text) > preview_length:
+                item['text'] = text[:preview_length].rstrip() + '...'
+
+        shaped.append(item)
+
+    return shaped
+
+
+def extract_snippet(text: str, query: str, length: int) -> str:
+    """
+    The window of text with the most query terms, about length characters long
+
+    Documents have a single embedding, so passages are ranked by the query
+    words they contain (matched on their first five letters, so "migrating"
+    finds "migration"). Falls back to the start of the text.
+    """
+    if len(text) <= length:
+        return text
+    if length <= 0:
+        return ''
+
+    terms = {word[:5] for word in re.findall(r'\w+', query.lower()) if len(word) > 2}
+    positions = [m.start() for m in re.finditer(r'\w+', text) if m.group().lower()[:5] in terms]
+
+    # Densest window: the most term positions within length characters of a starting hit
+    best_start, best_count, end = 0, 0, 0
+    for i, position in enumerate(positions):
+        while end < len(positions) and positions[end] < position + length:
+            end += 1
+        if end - i > best_count:
+            best_start, best_count = position, end - i
+
+    # Start a little before the first hit, on a word boundary
+    start = max(0, min(best_start - length // 5, len(text) - length))
+    if start:
+        space = text.find(' ', start, best_start or None)
+        start = space + 1 if space != -1 else start
+
+    snippet = text[start:start + length].strip()
+    return ('...' if start else '') + snippet + ('...' if start + length < len(text) else '')
+
+
 def generate_embedding(text: str) -> List[float]:
     """
     Generate embedding vector using Amazon Titan Embed v2
@@ -211,6 +401,16 @@ def list_vector_files() -> List[str]:
     """
     List all vector files in S3
     """
+    return [key for key, _ in list_vector_index()]
+
+
+def list_vector_index() -> List[Tuple[str, str]]:
+    """
+    List all vector files in S3 with their ETags
+
+    Returns:
+        (key, ETag) pairs, one per vector file
+    """
     vector_keys = []
 
     try:
@@ -229,7 +429,7 @@ def list_vector_files() -> List[str]:
 
                 # Only include .json files
                 if key.endswith('.json'):
-                    vector_keys.append(key)
+                    vector_keys.append((key, obj.get('ETag', '')))
 
         print(f"Found {len(vector_keys)} vector files")
 
@@ -240,6 +440,112 @@ def list_vector_files() -> List[str]:
     return vector_keys
 
 
+def index_version(vector_index: List[Tuple[str, str]]) -> str:
+    """
+    Fingerprint of the vector index; changes whenever a vector file is added,
+    overwritten or deleted
+    """
+    digest = hashlib.sha1()
+    for key, etag in sorted(vector_index):
+        digest.update(f"{key}\0{etag}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def result_cache_key(query: str, max_results: int, similarity_threshold: float, dedupe: bool, version: str) -> Tuple:
+    """Cache key for a search; queries differing only in case or whitespace share one"""
+    return (' '.join(query.lower().split()), max_results, similarity_threshold, dedupe, version)
+
+
+def cached_results(cache_key: Tuple) -> Optional[List[Dict]]:
+    """
+    Results cached for this search, if still fresh and the index hasn't changed
+
+    Returns:
+        The cached results, or None on a miss
+    """
+    global _result_cache_version
+
+    # A new index version makes every entry stale
+    version = cache_key[-1]
+    if version != _result_cache_version:
+        if _result_cache:
+            print(f"Vector index changed; dropping {len(_result_cache)} cached searches")
+        _result_cache.clear()
+        _result_cache_version = version
+        return None
+
+    entry = _result_cache.get(cache_key)
+    if entry is None:
+        return None
+
+    if entry['expires_at'] <= time.monotonic():
+        del _result_cache[cache_key]
+        return None
+
+    _result_cache.move_to_end(cache_key)
+    return entry['results']
+
+
+def semantic_cached_results(cache_key: Tuple, query_embedding: List[float]) -> Tuple[Optional[str], Optional[List[Dict]]]:
+    """
+    Results of the most similar cached query with the same max_results,
+    threshold and index version, if its similarity reaches SEMANTIC_CACHE_THRESHOLD
+
+    Call after cached_results, which drops entries from older index versions.
+
+    Returns:
+        (matched query, results), or (None, None) on a miss
+    """
+    if SEMANTIC_CACHE_THRESHOLD > 1.0 or not _result_cache:
+        return None, None
+
+    now = time.monotonic()
+    best_key, best_similarity = None, SEMANTIC_CACHE_THRESHOLD
+
+    for key, entry in _result_cache.items():
+        if key[1:] != cache_key[1:] or entry['expires_at'] <= now:
+            continue
+
+        similarity = cosine_similarity(query_embedding, entry['embedding'])
+        if similarity >= best_similarity:
+            best_key, best_similarity = key, similarity
+
+    if best_key is None:
+        return None, None
+
+    _result_cache.move_to_end(best_key)
+    entry = _result_cache[best_key]
+    print(f"Closest cached query similarity: {best_similarity:.3f}")
+    return entry['query'], entry['results']
+
+
+def cache_results(cache_key: Tuple, results: List[Dict], query_embedding: List[float]):
+    """Cache a search's results for RESULT_CACHE_TTL_SECONDS, evicting the least recently used"""
+    if RESULT_CACHE_TTL_SECONDS <= 0:
+        return
+
+    _result_cache[cache_key] = {
+        'query': cache_key[0],
+        'embedding': query_embedding,
+        'results': results,
+        'expires_at': time.monotonic() + RESULT_CACHE_TTL_SECONDS
+    }
+    _result_cache.move_to_end(cache_key)
+
+    while len(_result_cache) > RESULT_CACHE_MAX_ENTRIES:
+        _result_cache.popitem(last=False)
+
+
+def cache_stats() -> Dict:
+    """Searches, exact and semantic cache hits, and hit rate since the container started"""
+    searches = _cache_stats['searches']
+    hits = _cache_stats['exact_hits'] + _cache_stats['semantic_hits']
+    return {
+        **_cache_stats,
+        'hit_rate': round(hits / searches, 3) if searches else 0.0
+    }
+
+
 def download_vector_file(key: str) -> Dict:
     """
     Download and parse a vector file from S3
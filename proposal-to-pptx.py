@@ -1,197 +1,89 @@
 #!/usr/bin/env python3
 """
 Convert Jamie proposal text to PowerPoint presentation
-"""
-
-from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.enum.text import PP_ALIGN
-import re
-import sys
 
+The conversion itself lives in lambda/proposal_pptx.py, so jamie-cli.py can
+build decks in-process while a response streams. Any number of proposals
+can be converted in one run; the template is loaded once and shared.
 
-def parse_proposal(text):
-    """Parse markdown proposal into structured slides"""
-    slides = []
-    current_slide = None
+Usage:
+    python3 proposal-to-pptx.py proposal.txt [output.pptx]
+    python3 proposal-to-pptx.py proposals/*.txt --output-dir decks/ --template corporate.pptx
+"""
 
-    lines = text.split('\n')
+import argparse
+import os
+import sys
+import time
 
-    for line in lines:
-        line = line.strip()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lambda'))
 
-        if not line:
-            continue
+from proposal_pptx import PPTX_TEMPLATE, create_presentation, load_template, parse_proposal
 
-        # Main title (# Title)
-        if line.startswith('# '):
-            if current_slide:
-                slides.append(current_slide)
-            current_slide = {
-                'type': 'title',
-                'title': line[2:],
-                'content': []
-            }
-
-        # Subtitle (## Subtitle)
-        elif line.startswith('## '):
-            if current_slide:
-                slides.append(current_slide)
-            current_slide = {
-                'type': 'section',
-                'title': line[3:],
-                'content': []
-            }
-
-        # Section heading (### Heading)
-        elif line.startswith('### '):
-            if current_slide:
-                slides.append(current_slide)
-            current_slide = {
-                'type': 'content',
-                'title': line[4:],
-                'content': []
-            }
-
-        # Subheading (#### Subheading)
-        elif line.startswith('#### '):
-            if current_slide:
-                current_slide['content'].append({
-                    'type': 'subheading',
-                    'text': line[5:]
-                })
-
-        # Bullet points
-        elif line.startswith('- ') or line.startswith('* '):
-            if current_slide:
-                current_slide['content'].append({
-                    'type': 'bullet',
-                    'text': line[2:]
-                })
-
-        # Table rows
-        elif line.startswith('|'):
-            if current_slide:
-                if not any(item.get('type') == 'table' for item in current_slide['content']):
-                    current_slide['content'].append({
-                        'type': 'table',
-                        'rows': []
-                    })
-                # Find the table item and add row
-                for item in current_slide['content']:
-                    if item.get('type') == 'table':
-                        row = [cell.strip() for cell in line.split('|')[1:-1]]
-                        if not all(cell.startswith('-') for cell in row):  # Skip separator rows
-                            item['rows'].append(row)
-                        break
-
-        # Regular paragraphs
-        else:
-            if current_slide and line:
-                current_slide['content'].append({
-                    'type': 'text',
-                    'text': line
-                })
-
-    if current_slide:
-        slides.append(current_slide)
-
-    return slides
-
-
-def create_presentation(slides, output_file):
-    """Create PowerPoint presentation from parsed slides"""
-    prs = Presentation()
-    prs.slide_width = Inches(10)
-    prs.slide_height = Inches(7.5)
-
-    for slide_data in slides:
-        if slide_data['type'] == 'title':
-            # Title slide
-            slide_layout = prs.slide_layouts[0]  # Title Slide layout
-            slide = prs.slides.add_slide(slide_layout)
-            title = slide.shapes.title
-            title.text = slide_data['title']
-
-            # Add subtitle if available
-            if slide_data['content']:
-                subtitle = slide.placeholders[1]
-                subtitle.text = '\n'.join([
-                    item['text'] for item in slide_data['content']
-                    if item['type'] == 'text'
-                ])
-
-        elif slide_data['type'] == 'section':
-            # Section header slide
-            slide_layout = prs.slide_layouts[2]  # Section Header layout
-            slide = prs.slides.add_slide(slide_layout)
-            title = slide.shapes.title
-            title.text = slide_data['title']
 
-        else:
-            # Content slide
-            slide_layout = prs.slide_layouts[1]  # Title and Content layout
-            slide = prs.slides.add_slide(slide_layout)
-
-            title = slide.shapes.title
-            title.text = slide_data['title']
-
-            # Add content
-            body_shape = slide.shapes.placeholders[1]
-            tf = body_shape.text_frame
-            tf.clear()
-
-            for item in slide_data['content']:
-                if item['type'] == 'bullet':
-                    p = tf.add_paragraph()
-                    p.text = item['text']
-                    p.level = 0
-                    # Clean up markdown bold
-                    p.text = re.sub(r'\*\*(.*?)\*\*', r'\1', p.text)
-
-                elif item['type'] == 'subheading':
-                    p = tf.add_paragraph()
-                    p.text = item['text']
-                    p.level = 0
-                    p.font.bold = True
-                    p.font.size = Pt(18)
-
-                elif item['type'] == 'text':
-                    p = tf.add_paragraph()
-                    p.text = item['text']
-                    p.level = 0
-
-                elif item['type'] == 'table':
-                    # Add table to slide (simplified - just add as text for now)
-                    for row in item['rows']:
-                        p = tf.add_paragraph()
-                        p.text = ' | '.join(row)
-                        p.level = 0
-                        p.font.size = Pt(12)
-
-    prs.save(output_file)
-    print(f"✅ PowerPoint saved to: {output_file}")
+def convert(input_file: str, output_file: str, template: str = None) -> int:
+    """Convert one proposal file; returns the number of slides"""
+    with open(input_file, 'r') as f:
+        slides = parse_proposal(f)
+    return create_presentation(slides, output_file, template)
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python3 proposal-to-pptx.py <proposal.txt> [output.pptx]")
-        sys.exit(1)
-
-    input_file = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else input_file.replace('.txt', '.pptx')
-
-    print(f"📄 Reading proposal from: {input_file}")
-
-    with open(input_file, 'r') as f:
-        text = f.read()
-
-    print("🔄 Parsing proposal structure...")
-    slides = parse_proposal(text)
-    print(f"📊 Found {len(slides)} slides")
+    parser = argparse.ArgumentParser(description='Convert Jamie proposals to PowerPoint')
+    parser.add_argument('inputs', nargs='+', help='Proposal text files (optionally followed by one output .pptx)')
+    parser.add_argument('--output-dir', help='Directory for the decks (default: next to each proposal)')
+    parser.add_argument('--template', default=PPTX_TEMPLATE or None,
+                        help='Corporate .pptx template (default: $PPTX_TEMPLATE, else a blank deck)')
+
+    args = parser.parse_args()
+
+    inputs = args.inputs
+    explicit_output = None
+    if len(inputs) == 2 and inputs[1].endswith('.pptx'):
+        inputs, explicit_output = inputs[:1], inputs[1]
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    if args.template:
+        load_template(args.template)
+        print(f"🎨 Using template: {args.template}")
+
+    start = time.perf_counter()
+    converted = 0
+    failed = 0
+    total_slides = 0
+
+    for input_file in inputs:
+        if explicit_output:
+            output_file = explicit_output
+        else:
+            name = os.path.splitext(os.path.basename(input_file))[0] + '.pptx'
+            output_file = os.path.join(args.output_dir or os.path.dirname(input_file), name)
+
+        try:
+            slide_count = convert(input_file, output_file, args.template)
+        except Exception as e:
+            failed += 1
+            print(f"❌ {input_file}: {e}", file=sys.stderr)
+            continue
 
-    print("🎨 Creating PowerPoint presentation...")
-    create_presentation(slides, output_file)
+        converted += 1
+        total_slides += slide_count
+        print(f"✅ {input_file} -> {output_file} ({slide_count} slides)")
+
+    if len(inputs) > 1:
+        elapsed = time.perf_counter() - start
+        print(f"\n{'='*60}")
+        print("SUMMARY")
+        print(f"{'='*60}")
+        print(f"Converted: {converted}")
+        print(f"Failed: {failed}")
+        print(f"Slides: {total_slides}")
+        print(f"Elapsed: {elapsed:.1f}s ({elapsed / max(len(inputs), 1) * 1000:.0f} ms per proposal)")
+        print(f"{'='*60}\n")
+
+    sys.exit(1 if failed else 0)
 
 
 if __name__ == '__main__':
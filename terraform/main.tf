@@ -175,6 +175,19 @@ resource "aws_s3_bucket_lifecycle_configuration" "jamie_knowledge_base_lifecycle
       days = 90  # Generated NDAs auto-delete after 90 days
     }
   }
+
+  rule {
+    id     = "expire-generated-proposals"
+    status = "Enabled"
+
+    filter {
+      prefix = "generated-proposals/"
+    }
+
+    expiration {
+      days = 90
+    }
+  }
 }
 
 # Bucket policy - strict access control
@@ -253,44 +266,27 @@ resource "aws_lambda_function" "jamie_document_retriever" {
   depends_on = [data.archive_file.lambda_zip]
 }
 
-# Lambda function for NDA generation
-# NOTE: Build deployment package with: cd lambda && ./build-nda-package.sh
-resource "aws_lambda_function" "jamie_nda_generator" {
-  filename         = "nda_generator.zip"
-  function_name    = "jamie2-nda-generator"
-  role            = aws_iam_role.lambda_role.arn
-  handler         = "nda_generator.lambda_handler"
-  runtime         = "python3.12"
-  timeout         = 120
-  memory_size     = 1024
-  source_code_hash = filebase64sha256("nda_generator.zip")
-
-  environment {
-    variables = {
-      KNOWLEDGE_BASE_BUCKET    = aws_s3_bucket.jamie_knowledge_base.bucket
-      REGION                   = var.aws_region
-      COMPANIES_HOUSE_API_KEY  = var.companies_house_api_key
-    }
-  }
-}
-
-# Lambda function for MSA generation
-# NOTE: Build deployment package with: cd lambda && ./build-msa-package.sh
-resource "aws_lambda_function" "jamie_msa_generator" {
-  filename         = "msa_generator.zip"
-  function_name    = "jamie2-msa-generator"
+# Lambda function for contract generation (NDA and MSA share one engine and one warm container)
+# NOTE: Build deployment package with: cd lambda && ./build-contract-package.sh
+resource "aws_lambda_function" "jamie_contract_generator" {
+  filename         = "contract_generator.zip"
+  function_name    = "jamie2-contract-generator"
   role            = aws_iam_role.lambda_role.arn
-  handler         = "msa_generator.lambda_handler"
+  handler         = "contract_generator.lambda_handler"
   runtime         = "python3.12"
-  timeout         = 120
+  timeout         = 900  # Bulk jobs (generateBulk) stop early and resume if they would run over
   memory_size     = 1024
-  source_code_hash = filebase64sha256("msa_generator.zip")
+  source_code_hash = filebase64sha256("contract_generator.zip")
 
   environment {
     variables = {
       KNOWLEDGE_BASE_BUCKET    = aws_s3_bucket.jamie_knowledge_base.bucket
       REGION                   = var.aws_region
       COMPANIES_HOUSE_API_KEY  = var.companies_house_api_key
+      # Cache Companies House responses in the knowledge base bucket (cache/companies-house/)
+      COMPANIES_HOUSE_CACHE_STORE = "s3"
+      # Corporate PowerPoint template for generatePresentation (plain deck if the object doesn't exist)
+      PRESENTATION_TEMPLATE_KEY = "templates/Proposal Template.pptx"
     }
   }
 }
@@ -302,7 +298,7 @@ data "archive_file" "lambda_zip" {
   source_file = "../lambda/jamie_retriever.py"
 }
 
-# NOTE: NDA generator package is built manually using lambda/build-nda-package.sh
+# NOTE: Contract generator package is built manually using lambda/build-contract-package.sh
 # This is necessary because it requires Python dependencies (requests, python-docx, lxml)
 
 # IAM role for Lambda
@@ -386,20 +382,11 @@ resource "aws_lambda_permission" "allow_bedrock_retriever" {
   source_arn    = aws_bedrockagent_agent.jamie.agent_arn
 }
 
-# Lambda permission for Bedrock Agent - NDA Generator
-resource "aws_lambda_permission" "allow_bedrock_nda" {
-  statement_id  = "AllowExecutionFromBedrockNDA"
-  action        = "lambda:InvokeFunction"
-  function_name = aws_lambda_function.jamie_nda_generator.function_name
-  principal     = "bedrock.amazonaws.com"
-  source_arn    = aws_bedrockagent_agent.jamie.agent_arn
-}
-
-# Lambda permission for Bedrock Agent - MSA Generator
-resource "aws_lambda_permission" "allow_bedrock_msa" {
-  statement_id  = "AllowExecutionFromBedrockMSA"
+# Lambda permission for Bedrock Agent - Contract Generator (NDA and MSA action groups)
+resource "aws_lambda_permission" "allow_bedrock_contracts" {
+  statement_id  = "AllowExecutionFromBedrockContracts"
   action        = "lambda:InvokeFunction"
-  function_name = aws_lambda_function.jamie_msa_generator.function_name
+  function_name = aws_lambda_function.jamie_contract_generator.function_name
   principal     = "bedrock.amazonaws.com"
   source_arn    = aws_bedrockagent_agent.jamie.agent_arn
 }
@@ -418,8 +405,12 @@ resource "aws_lambda_function" "jamie_vector_search" {
 
   environment {
     variables = {
-      KNOWLEDGE_BASE_BUCKET = aws_s3_bucket.jamie_knowledge_base.bucket
-      REGION                = var.aws_region
+      KNOWLEDGE_BASE_BUCKET    = aws_s3_bucket.jamie_knowledge_base.bucket
+      REGION                   = var.aws_region
+      RESULT_CACHE_TTL_SECONDS = "300"
+      SEMANTIC_CACHE_THRESHOLD = "0.95"
+      PREVIEW_LENGTH           = "300"
+      DEDUPE_RESULTS           = "true"
     }
   }
 
@@ -493,7 +484,7 @@ resource "aws_iam_role_policy" "jamie_agent_policy" {
         ]
         Resource = [
           aws_lambda_function.jamie_document_retriever.arn,
-          aws_lambda_function.jamie_nda_generator.arn,
+          aws_lambda_function.jamie_contract_generator.arn,
           aws_lambda_function.jamie_vector_search.arn
         ]
       }
@@ -565,7 +556,7 @@ resource "aws_bedrockagent_agent_action_group" "nda_generation" {
   description = "Generate Non-Disclosure Agreements using Companies House data and NDA templates"
 
   action_group_executor {
-    lambda = aws_lambda_function.jamie_nda_generator.arn
+    lambda = aws_lambda_function.jamie_contract_generator.arn
   }
 
   function_schema {
@@ -606,7 +597,7 @@ resource "aws_bedrockagent_agent_action_group" "msa_generation" {
   description = "Generate Master Services Agreements using Companies House data and MSA templates"
 
   action_group_executor {
-    lambda = aws_lambda_function.jamie_msa_generator.arn
+    lambda = aws_lambda_function.jamie_contract_generator.arn
   }
 
   function_schema {
@@ -637,6 +628,88 @@ resource "aws_bedrockagent_agent_action_group" "msa_generation" {
   }
 }
 
+# Action group for generating several contracts for one company in a single call
+resource "aws_bedrockagent_agent_action_group" "contract_bundle_generation" {
+  action_group_name          = "ContractBundleGeneration"
+  agent_id                   = aws_bedrockagent_agent.jamie.agent_id
+  agent_version              = "DRAFT"
+  skip_resource_in_use_check = true
+
+  description = "Generate several contracts (e.g. NDA and MSA) for one company with a single Companies House lookup"
+
+  action_group_executor {
+    lambda = aws_lambda_function.jamie_contract_generator.arn
+  }
+
+  function_schema {
+    member_functions {
+      functions {
+        name        = "generateDocuments"
+        description = "Generate multiple contract documents at once. Use this instead of calling generateNDA and generateMSA separately when more than one document is requested"
+        parameters {
+          map_block_key = "company_identifier"
+          type          = "string"
+          description   = "Company name or Companies House registration number (e.g., '01234567' or 'SC123456' or 'Acme Ltd')"
+          required      = true
+        }
+        parameters {
+          map_block_key = "signatory_name"
+          type          = "string"
+          description   = "Full name of the person who will sign the documents"
+          required      = true
+        }
+        parameters {
+          map_block_key = "signatory_title"
+          type          = "string"
+          description   = "Job title/position of the signatory (e.g., 'Director', 'CEO', 'Managing Partner')"
+          required      = true
+        }
+        parameters {
+          map_block_key = "document_types"
+          type          = "string"
+          description   = "Comma-separated document types to generate: 'nda', 'msa' (e.g., 'nda,msa')"
+          required      = true
+        }
+      }
+    }
+  }
+}
+
+# Action group for turning a finished proposal into a PowerPoint deck
+resource "aws_bedrockagent_agent_action_group" "proposal_presentation" {
+  action_group_name          = "ProposalPresentation"
+  agent_id                   = aws_bedrockagent_agent.jamie.agent_id
+  agent_version              = "DRAFT"
+  skip_resource_in_use_check = true
+
+  description = "Render a proposal as a PowerPoint presentation and return a download link"
+
+  action_group_executor {
+    lambda = aws_lambda_function.jamie_contract_generator.arn
+  }
+
+  function_schema {
+    member_functions {
+      functions {
+        name        = "generatePresentation"
+        description = "Create a PowerPoint deck from a finished proposal. Use when the user asks for slides or a presentation"
+        parameters {
+          map_block_key = "proposal_markdown"
+          type          = "string"
+          description   = "The full proposal in Markdown: '# Title', '## Section' and '### Slide title' headings, '- ' bullets and | tables |"
+          required      = true
+        }
+        parameters {
+          map_block_key = "title"
+          type          = "string"
+          description   = "Short title used for the file name (default: the proposal's first heading)"
+          required      = false
+        }
+      }
+    }
+  }
+}
+
 # Action group for vector search
 resource "aws_bedrockagent_agent_action_group" "vector_search" {
   action_group_name          = "VectorSearch"
@@ -673,6 +746,18 @@ resource "aws_bedrockagent_agent_action_group" "vector_search" {
           description   = "Minimum similarity score from 0.0 to 1.0 (default: 0.3)"
           required      = false
         }
+        parameters {
+          map_block_key = "preview_length"
+          type          = "integer"
+          description   = "Characters of text to return per result, taken around the passage best matching the query (default: 300, 0 for none)"
+          required      = false
+        }
+        parameters {
+          map_block_key = "fields"
+          type          = "string"
+          description   = "Comma-separated fields per result from key, document, similarity, text, metadata, timestamp, hits (default: document,similarity,text,hits)"
+          required      = false
+        }
       }
     }
   }
@@ -689,6 +774,8 @@ resource "aws_bedrockagent_agent_alias" "jamie_prod" {
     aws_bedrockagent_agent_action_group.document_search,
     aws_bedrockagent_agent_action_group.nda_generation,
     aws_bedrockagent_agent_action_group.msa_generation,
+    aws_bedrockagent_agent_action_group.contract_bundle_generation,
+    aws_bedrockagent_agent_action_group.proposal_presentation,
     aws_bedrockagent_agent_action_group.vector_search
   ]
 }
@@ -704,18 +791,8 @@ resource "aws_cloudwatch_log_group" "lambda_retriever_logs" {
   }
 }
 
-resource "aws_cloudwatch_log_group" "lambda_nda_logs" {
-  name              = "/aws/lambda/jamie2-nda-generator"
-  retention_in_days = 7
-
-  tags = {
-    Project = "jamie2"
-    Purpose = "lambda-logs"
-  }
-}
-
-resource "aws_cloudwatch_log_group" "lambda_msa_logs" {
-  name              = "/aws/lambda/jamie2-msa-generator"
+resource "aws_cloudwatch_log_group" "lambda_contract_logs" {
+  name              = "/aws/lambda/jamie2-contract-generator"
   retention_in_days = 7
 
   tags = {
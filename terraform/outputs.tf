@@ -57,7 +57,7 @@ output "lambda_functions" {
   description = "Lambda function names"
   value = {
     document_retriever = aws_lambda_function.jamie_document_retriever.function_name
-    nda_generator      = aws_lambda_function.jamie_nda_generator.function_name
+    contract_generator = aws_lambda_function.jamie_contract_generator.function_name
     vector_search      = aws_lambda_function.jamie_vector_search.function_name
   }
 }
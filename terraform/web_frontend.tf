@@ -12,7 +12,7 @@ resource "aws_apigatewayv2_api" "nda_api" {
 
   cors_configuration {
     allow_origins = ["*"] # JWT authorizer provides the real security
-    allow_methods = ["POST", "OPTIONS"]
+    allow_methods = ["GET", "POST", "OPTIONS"]
     allow_headers = ["content-type", "authorization"]
     max_age       = 300
   }
@@ -77,14 +77,16 @@ resource "aws_lambda_function" "nda_api_handler" {
   role          = aws_iam_role.nda_api_handler_role.arn
   handler       = "nda_api_handler.lambda_handler"
   runtime       = "python3.12"
-  timeout       = 120
+  timeout       = 300 # Async jobs run in an event invocation, outside API Gateway's 30s limit
 
   source_code_hash = fileexists("${path.module}/nda_api_handler.zip") ? filebase64sha256("${path.module}/nda_api_handler.zip") : null
 
   environment {
     variables = {
-      AGENT_ID       = aws_bedrockagent_agent.jamie.agent_id
-      AGENT_ALIAS_ID = aws_bedrockagent_agent_alias.jamie_prod.agent_alias_id
+      AGENT_ID                    = aws_bedrockagent_agent.jamie.agent_id
+      AGENT_ALIAS_ID              = aws_bedrockagent_agent_alias.jamie_prod.agent_alias_id
+      CONTRACT_GENERATOR_FUNCTION = aws_lambda_function.jamie_contract_generator.function_name
+      JOB_TABLE                   = aws_dynamodb_table.generation_jobs.name
     }
   }
 
@@ -143,11 +145,53 @@ resource "aws_iam_role_policy" "nda_api_handler_policy" {
           "${aws_bedrockagent_agent.jamie.agent_arn}/*",
           "arn:aws:bedrock:${var.aws_region}:${data.aws_caller_identity.current.account_id}:agent-alias/${aws_bedrockagent_agent.jamie.agent_id}/*"
         ]
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "lambda:InvokeFunction"
+        ]
+        Resource = [
+          aws_lambda_function.jamie_contract_generator.arn,
+          # Async jobs re-invoke this function in the background
+          "arn:aws:lambda:${var.aws_region}:${data.aws_caller_identity.current.account_id}:function:jamie-nda-api-handler"
+        ]
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:GetItem",
+          "dynamodb:PutItem",
+          "dynamodb:UpdateItem"
+        ]
+        Resource = aws_dynamodb_table.generation_jobs.arn
       }
     ]
   })
 }
 
+# Async generation job state, polled by the web frontend; finished jobs expire after a day
+resource "aws_dynamodb_table" "generation_jobs" {
+  name         = "jamie-generation-jobs"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "job_id"
+
+  attribute {
+    name = "job_id"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
+  tags = {
+    Name        = "jamie-generation-jobs"
+    Environment = var.environment
+  }
+}
+
 # API Gateway Integration with Lambda
 resource "aws_apigatewayv2_integration" "nda_lambda_integration" {
   api_id           = aws_apigatewayv2_api.nda_api.id
@@ -166,6 +210,15 @@ resource "aws_apigatewayv2_route" "nda_generate" {
   authorizer_id      = aws_apigatewayv2_authorizer.jwt_authorizer.id
 }
 
+# Async job status polling
+resource "aws_apigatewayv2_route" "job_status" {
+  api_id             = aws_apigatewayv2_api.nda_api.id
+  route_key          = "GET /jobs/{job_id}"
+  target             = "integrations/${aws_apigatewayv2_integration.nda_lambda_integration.id}"
+  authorization_type = "JWT"
+  authorizer_id      = aws_apigatewayv2_authorizer.jwt_authorizer.id
+}
+
 # Lambda permission for API Gateway to invoke
 resource "aws_lambda_permission" "api_gateway_invoke" {
   statement_id  = "AllowAPIGatewayInvoke"